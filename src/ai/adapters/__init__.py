@@ -1,8 +1,44 @@
-from src.ai.adapters.base import AIAdapter
-from src.ai.adapters.gemini import GeminiAdapter
+import importlib
+
+from src.ai.adapters.base import AIAdapter, Context
+from src.ai.adapters.cached import CachedAdapter
+from src.ai.adapters.registry import (
+    LazyAdapter,
+    available_adapters,
+    create_adapter,
+    get_adapter_class,
+    register_adapter,
+)
 
 
 __all__ = [
     "AIAdapter",
+    "CachedAdapter",
+    "Context",
+    "FakeAdapter",
     "GeminiAdapter",
+    "HedgedAdapter",
+    "LazyAdapter",
+    "OpenAICompatibleAdapter",
+    "RoutingAdapter",
+    "available_adapters",
+    "create_adapter",
+    "get_adapter_class",
+    "register_adapter",
 ]
+
+
+_LAZY_EXPORTS = {
+    "FakeAdapter": "src.ai.adapters.fake",
+    "GeminiAdapter": "src.ai.adapters.gemini",
+    "HedgedAdapter": "src.ai.adapters.hedged",
+    "OpenAICompatibleAdapter": "src.ai.adapters.openai_compatible",
+    "RoutingAdapter": "src.ai.adapters.routing",
+}
+
+
+def __getattr__(name):
+    # Provider adapters pull in their SDKs, so they are imported on demand
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
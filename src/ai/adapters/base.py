@@ -1,10 +1,141 @@
+import asyncio
+import json
+import re
 from abc import ABC
+from typing import Any, Iterator, NamedTuple
+
+from src.utils.metrics import Metrics
+
+
+JSON_INSTRUCTIONS = """
+Responda apenas com um objeto JSON válido, sem texto adicional, seguindo
+este JSON Schema:
+{schema}
+"""
+
+JSON_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def parse_json_response(response: str) -> dict:
+    """
+    Parses a JSON object from a model response, tolerating markdown code
+    fences and text around the object.
+    """
+    fenced = JSON_FENCE.search(response)
+    if fenced:
+        response = fenced.group(1)
+
+    start, end = response.find("{"), response.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError("The model response does not contain a JSON object")
+    return json.loads(response[start:end + 1])
+
+
+class Context(NamedTuple):
+    """
+    Content shared by several prompts. ``handle`` is how the adapter refers
+    to its uploaded copy (e.g. a Gemini cached content); without one,
+    ``content`` is sent along with every prompt.
+    """
+
+    content: str
+    handle: Any = None
 
 
 class AIAdapter(ABC):
 
     _api_key = None
     _model = None
+    _model_name = None
+    _system_instruction = None
+    _generation_config = None
+    _metrics = None
+
+    @property
+    def metrics(self) -> Metrics:
+        if self._metrics is None:
+            self._metrics = Metrics()
+        return self._metrics
+
+    def attach_metrics(self, metrics: Metrics):
+        """
+        Makes the adapter record its timings and token usage in
+        ``metrics``. Wrapping adapters forward it to the wrapped ones.
+        """
+        self._metrics = metrics
+
+    def warm(self):
+        """
+        Builds clients and loads SDKs ahead of the first request, for long
+        running processes. Wrapping adapters forward it to the wrapped ones.
+        """
 
     def generate_content(self, message: str):
         raise NotImplementedError
+
+    async def agenerate_content(self, message: str):
+        """
+        Async counterpart of ``generate_content``. Adapters without a native
+        async client run the blocking call in a worker thread.
+        """
+        return await asyncio.to_thread(self.generate_content, message)
+
+    def stream_content(self, message: str) -> Iterator[str]:
+        """
+        Yields the response in chunks as the model produces them. Adapters
+        without streaming support yield the whole response at once.
+        """
+        yield self.generate_content(message)
+
+    def generate_structured(self, message: str, schema: dict) -> dict:
+        """
+        Generates a JSON object matching ``schema``. Adapters without a
+        native JSON mode describe the schema in the prompt and parse the
+        response.
+        """
+        return parse_json_response(self.generate_content(
+            message + JSON_INSTRUCTIONS.format(schema=json.dumps(schema))
+        ))
+
+    async def agenerate_structured(self, message: str, schema: dict) -> dict:
+        """
+        Async counterpart of ``generate_structured``.
+        """
+        return await asyncio.to_thread(
+            self.generate_structured, message, schema
+        )
+
+    def create_context(self, content: str) -> Context:
+        """
+        Uploads ``content`` once for several ``generate_with_context``
+        calls. Adapters without context caching keep it locally and send
+        it with every prompt.
+        """
+        return Context(content)
+
+    def generate_with_context(self, context: Context, message: str) -> str:
+        return self.generate_content(f"{context.content}\n\n{message}")
+
+    async def agenerate_with_context(
+        self, context: Context, message: str
+    ) -> str:
+        return await asyncio.to_thread(
+            self.generate_with_context, context, message
+        )
+
+    def delete_context(self, context: Context):
+        """
+        Releases an uploaded context before it expires on its own.
+        """
+
+    def fingerprint(self) -> dict:
+        """
+        Returns everything besides the prompt that influences the output.
+        Used to build cache keys, so it must never include secrets.
+        """
+        return {
+            "adapter": type(self).__name__,
+            "model": self._model_name,
+            "system_instruction": self._system_instruction,
+            "generation_config": self._generation_config,
+        }
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+from typing import Iterator, Optional
+
+from src.ai.adapters.base import AIAdapter, Context
+from src.utils.cache import DiskCache, make_key
+
+
+class DeferredContext:
+    """
+    A context of the wrapped adapter, only uploaded on the first cache
+    miss: when every prompt is answered from the cache nothing is sent.
+    """
+
+    __slots__ = ["_adapter", "_content", "_context", "_lock"]
+
+    def __init__(self, adapter: AIAdapter, content: str):
+        self._adapter = adapter
+        self._content = content
+        self._context: Optional[Context] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Context:
+        with self._lock:
+            if self._context is None:
+                self._context = self._adapter.create_context(self._content)
+            return self._context
+
+    def delete(self):
+        with self._lock:
+            context, self._context = self._context, None
+        if context is not None:
+            self._adapter.delete_context(context)
+
+
+class CachedAdapter(AIAdapter):
+    """
+    Wraps any adapter and stores its responses in a ``DiskCache``.
+
+    Responses are keyed on the wrapped adapter fingerprint (model, system
+    instruction and generation config) plus the prompt, so an unchanged
+    prompt is answered without calling the model again.
+    """
+
+    def __init__(self, adapter: AIAdapter, cache: DiskCache):
+        self._adapter = adapter
+        self._cache = cache
+
+    def fingerprint(self) -> dict:
+        return self._adapter.fingerprint()
+
+    def attach_metrics(self, metrics):
+        super().attach_metrics(metrics)
+        self._adapter.attach_metrics(metrics)
+
+    def warm(self):
+        self._adapter.warm()
+
+    def _get(self, key: str):
+        cached = self._cache.get(key)
+        self.metrics.add(
+            "cache_hits" if cached is not None else "cache_misses"
+        )
+        return cached
+
+    def _key(self, message: str) -> str:
+        return make_key(self._adapter.fingerprint(), message)
+
+    def generate_content(self, message: str) -> str:
+        key = self._key(message)
+
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+
+        response = self._adapter.generate_content(message)
+        self._cache.set(key, response)
+        return response
+
+    async def agenerate_content(self, message: str) -> str:
+        key = self._key(message)
+
+        cached = await asyncio.to_thread(self._get, key)
+        if cached is not None:
+            return cached
+
+        response = await self._adapter.agenerate_content(message)
+        await asyncio.to_thread(self._cache.set, key, response)
+        return response
+
+    def generate_structured(self, message: str, schema: dict) -> dict:
+        key = make_key(self._adapter.fingerprint(), schema, message)
+
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+
+        response = self._adapter.generate_structured(message, schema)
+        self._cache.set(key, response)
+        return response
+
+    async def agenerate_structured(self, message: str, schema: dict) -> dict:
+        key = make_key(self._adapter.fingerprint(), schema, message)
+
+        cached = await asyncio.to_thread(self._get, key)
+        if cached is not None:
+            return cached
+
+        response = await self._adapter.agenerate_structured(message, schema)
+        await asyncio.to_thread(self._cache.set, key, response)
+        return response
+
+    def create_context(self, content: str) -> Context:
+        return Context(content, DeferredContext(self._adapter, content))
+
+    def generate_with_context(self, context: Context, message: str) -> str:
+        key = make_key(self._adapter.fingerprint(), context.content, message)
+
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+
+        response = self._adapter.generate_with_context(
+            context.handle.get(), message
+        )
+        self._cache.set(key, response)
+        return response
+
+    def delete_context(self, context: Context):
+        context.handle.delete()
+
+    def stream_content(self, message: str) -> Iterator[str]:
+        """
+        Streams from the wrapped adapter on a miss and only stores the
+        response once the stream has been fully consumed.
+        """
+        key = self._key(message)
+
+        cached = self._get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self._adapter.stream_content(message):
+            chunks.append(chunk)
+            yield chunk
+
+        self._cache.set(key, "".join(chunks))
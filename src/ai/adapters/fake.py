@@ -0,0 +1,145 @@
+import asyncio
+import itertools
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+from src.ai.adapters.base import AIAdapter, Context
+from src.utils.tokens import estimate_tokens
+from src.config.settings import Config
+
+
+class FakeAdapter(AIAdapter):
+    """
+    Offline adapter that simulates a model: it waits ``latency`` seconds
+    before the first token and then produces ``tokens_per_second`` tokens.
+    Used by the benchmarks and for running the pipeline without an API key.
+    """
+
+    def __init__(
+        self,
+        system_instruction: Optional[str] = None,
+        model: str = "fake-model",
+        latency: float = 0.0,
+        tokens_per_second: Optional[float] = None,
+        response: Optional[str] = None,
+        response_tokens: int = 200,
+        chunk_tokens: int = 20,
+    ):
+        self._model_name = model
+        self._system_instruction = system_instruction
+        self._generation_config = {
+            "latency": latency,
+            "tokens_per_second": tokens_per_second,
+        }
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.response = response
+        self.response_tokens = response_tokens
+        self.chunk_tokens = chunk_tokens
+        self.calls = 0
+        self.prompt_chars = 0
+        self.contexts: Dict[str, str] = {}
+        self._context_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _respond(self, message: str) -> str:
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(message)
+
+        response = self.response
+        if response is None:
+            response = "resumo " * self.response_tokens
+
+        self.metrics.add("requests")
+        self.metrics.add("prompt_tokens", estimate_tokens(message))
+        self.metrics.add("response_tokens", estimate_tokens(response))
+        return response
+
+    def _generation_time(self, tokens: int) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        return tokens / self.tokens_per_second
+
+    def _chunks(self, response: str):
+        size = self.chunk_tokens * Config.CHARS_PER_TOKEN
+        for i in range(0, len(response), size):
+            chunk = response[i:i + size]
+            yield chunk, self._generation_time(
+                len(chunk) / Config.CHARS_PER_TOKEN
+            )
+
+    def generate_content(self, message: str) -> str:
+        response = self._respond(message)
+        time.sleep(self.latency + self._generation_time(
+            len(response) / Config.CHARS_PER_TOKEN
+        ))
+        return response
+
+    async def agenerate_content(self, message: str) -> str:
+        response = self._respond(message)
+        await asyncio.sleep(self.latency + self._generation_time(
+            len(response) / Config.CHARS_PER_TOKEN
+        ))
+        return response
+
+    def generate_structured(self, message: str, schema: dict) -> dict:
+        """
+        Fills every property of ``schema`` with the canned response.
+        """
+        return self._fill(schema, self.generate_content(message))
+
+    async def agenerate_structured(self, message: str, schema: dict) -> dict:
+        return self._fill(schema, await self.agenerate_content(message))
+
+    @classmethod
+    def _fill(cls, schema: dict, text: str):
+        if schema.get("type") == "object":
+            return {
+                name: cls._fill(prop, text)
+                for name, prop in schema.get("properties", {}).items()
+            }
+        if schema.get("type") == "array":
+            return [cls._fill(schema.get("items", {}), text)]
+        return text
+
+    def stream_content(self, message: str) -> Iterator[str]:
+        response = self._respond(message)
+        time.sleep(self.latency)
+        for chunk, delay in self._chunks(response):
+            time.sleep(delay)
+            yield chunk
+
+    def create_context(self, content: str) -> Context:
+        """
+        Keeps ``content`` as a cached context: its tokens are counted once,
+        here, and then only as ``cached_tokens``.
+        """
+        with self._lock:
+            name = f"cachedContents/fake-{next(self._context_ids)}"
+            self.contexts[name] = content
+
+        self.metrics.add("context_uploads")
+        self.metrics.add("prompt_tokens", estimate_tokens(content))
+        return Context(content, name)
+
+    def _use_context(self, context: Context):
+        with self._lock:
+            if context.handle not in self.contexts:
+                raise ValueError(f"Unknown context: {context.handle}")
+        self.metrics.add("cached_tokens", estimate_tokens(context.content))
+
+    def generate_with_context(self, context: Context, message: str) -> str:
+        self._use_context(context)
+        return self.generate_content(message)
+
+    async def agenerate_with_context(
+        self, context: Context, message: str
+    ) -> str:
+        self._use_context(context)
+        return await self.agenerate_content(message)
+
+    def delete_context(self, context: Context):
+        with self._lock:
+            self.contexts.pop(context.handle, None)
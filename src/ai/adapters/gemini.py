@@ -1,30 +1,390 @@
-from typing import Optional
+import asyncio
+import json
+import re
+import time
+from datetime import timedelta
+from typing import Any, Iterator, List, NamedTuple, Optional, Union
 import google.generativeai as genai
-from src.ai.adapters.base import AIAdapter
+from google.api_core import exceptions as google_exceptions
+from src.ai.adapters import gemini_sdk
+from src.ai.adapters.base import AIAdapter, Context
+from src.ai.adapters.keys import KeyPool, KeySlot, parse_keys
+from src.ai.adapters.resilience import (
+    CircuitBreaker,
+    RateLimiter,
+    Resilience,
+    RetryPolicy,
+)
 from src.config.settings import Config
+from src.utils.tokens import estimate_tokens
+
+
+RETRYABLE_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.InternalServerError,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.GatewayTimeout,
+)
+
+RETRY_IN = re.compile(r"retry in ([\d.]+)\s*s", re.IGNORECASE)
+
+
+def is_retryable(error: BaseException) -> bool:
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return isinstance(error, google_exceptions.TooManyRequests)
+
+
+def retry_hint(error: BaseException) -> Optional[float]:
+    """
+    Reads the server suggested delay from a ``RetryInfo`` detail, a
+    ``Retry-After`` header or the error message, in that order.
+    """
+    for detail in getattr(error, "details", None) or []:
+        delay = getattr(detail, "retry_delay", None)
+        if delay is None:
+            continue
+        if hasattr(delay, "total_seconds"):
+            return delay.total_seconds()
+        return delay.seconds + delay.nanos / 1e9
+
+    response = getattr(error, "response", None)
+    retry_after = (getattr(response, "headers", None) or {}).get(
+        "Retry-After"
+    )
+    if retry_after and retry_after.replace(".", "", 1).isdigit():
+        return float(retry_after)
+
+    match = RETRY_IN.search(str(error))
+    if match:
+        return float(match.group(1))
+
+    return None
+
+
+def default_resilience() -> Resilience:
+    """
+    Builds the retry, rate limiting and circuit breaker settings from
+    ``Config``.
+    """
+    return Resilience(
+        is_retryable,
+        retry_hint,
+        retry=RetryPolicy(
+            max_retries=Config.MAX_RETRIES,
+            base_delay=Config.RETRY_BASE_DELAY,
+            max_delay=Config.RETRY_MAX_DELAY,
+        ),
+        limiter=RateLimiter(Config.GEMINI_RPM, Config.GEMINI_TPM),
+        breaker=CircuitBreaker(
+            Config.CIRCUIT_BREAKER_THRESHOLD, Config.CIRCUIT_BREAKER_RESET
+        ),
+        is_rate_limited=is_rate_limited,
+    )
+
+
+class GeminiClient:
+    """
+    A ``GenerativeModel`` bound to a single API key. ``genai.configure``
+    sets process-wide clients, so each key gets a private client manager
+    instead and the model is pointed at its clients (see ``gemini_sdk``).
+    """
+
+    __slots__ = ["model", "_system_instruction", "_manager"]
+
+    def __init__(self, api_key, model, system_instruction, **options):
+        self._manager = gemini_sdk.client_manager(api_key, **options)
+        self._system_instruction = system_instruction
+        self.model = gemini_sdk.bind(
+            genai.GenerativeModel(
+                model, system_instruction=system_instruction
+            ),
+            self._manager,
+        )
+
+    def create_cache(self, content: str, ttl: float):
+        """
+        Uploads ``content`` and the system instruction as a cached content
+        and returns its name and a model that answers on top of it.
+        """
+        cached_content = {
+            "model": self.model.model_name,
+            "contents": [{"role": "user", "parts": [{"text": content}]}],
+            "ttl": timedelta(seconds=ttl),
+        }
+        if self._system_instruction:
+            cached_content["system_instruction"] = {
+                "parts": [{"text": self._system_instruction}]
+            }
+        cache = self._manager.get_default_client(
+            "cache"
+        ).create_cached_content(request={"cached_content": cached_content})
+
+        return cache.name, gemini_sdk.bind(
+            genai.GenerativeModel(self.model.model_name), self._manager,
+            cached_content=cache.name,
+        )
+
+    def delete_cache(self, name: str):
+        self._manager.get_default_client("cache").delete_cached_content(
+            name=name
+        )
+
+    @property
+    def async_model(self):
+        return gemini_sdk.bind_async(self.model, self._manager)
+
+
+class GeminiContext(NamedTuple):
+    """A Gemini cached content and the client of the key that owns it."""
+
+    name: str
+    client: GeminiClient
+    model: Any
+
+
+def resolve_keys(
+    api_key: Optional[str] = None,
+    keys: Union[str, List[str], None] = None,
+) -> List[str]:
+    """
+    The keys to shard requests across: ``keys``, else ``api_key``, else
+    ``GEMINI_API_KEYS``, else ``GEMINI_API_KEY``.
+    """
+    return (
+        parse_keys(keys)
+        or parse_keys([api_key])
+        or parse_keys(Config.GEMINI_API_KEYS)
+        or [Config.GEMINI_API_KEY]
+    )
 
 
 class GeminiAdapter(AIAdapter):
+    """
+    Adapter for the Gemini API. ``transport`` (``rest`` or ``grpc``) and
+    ``api_endpoint`` point the SDK to another server, e.g. the fake one
+    used by the load tests.
+
+    Each instance owns its clients, one per API key in ``api_keys``, and
+    shards its requests across them with a ``KeyPool``. Every key has its
+    own rate limiter and circuit breaker, copied from ``resilience``.
+
+    Contexts are uploaded as cached contents that live ``context_ttl``
+    seconds; content under ``context_min_tokens`` is too small for the API
+    to cache and is sent with every prompt instead.
+    """
 
     def __init__(
         self,
         system_instruction: Optional[str],
-        api_key: str = Config.GEMINI_API_KEY,
-        model: Optional[str] = Config.GEMINI_MODEL,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        resilience: Optional[Resilience] = None,
+        transport: Optional[str] = None,
+        api_endpoint: Optional[str] = None,
+        api_keys: Union[str, List[str], None] = None,
+        context_ttl: Optional[float] = None,
+        context_min_tokens: Optional[int] = None,
     ):
-        self._api_key = api_key
-        genai.configure(api_key=self._api_key)
+        keys = resolve_keys(api_key, api_keys)
+        self._api_key = keys[0]
+        model = model or Config.GEMINI_MODEL
+        self._transport = transport
 
-        self._model = genai.GenerativeModel(
-            model, system_instruction=system_instruction
+        options = {}
+        if transport:
+            options["transport"] = transport
+        if api_endpoint:
+            options["client_options"] = {"api_endpoint": api_endpoint}
+
+        self._model_name = model
+        self._system_instruction = system_instruction
+        self._generation_config = {"candidate_count": 1}
+        self._context_ttl = context_ttl or Config.GEMINI_CONTEXT_TTL
+        self._context_min_tokens = (
+            Config.GEMINI_CONTEXT_MIN_TOKENS
+            if context_min_tokens is None else context_min_tokens
         )
 
-    def generate_content(self, message: str) -> str:
-        response = self._model.generate_content(
-            message,
-            generation_config=genai.types.GenerationConfig(
-                candidate_count=1,
-            ),
+        resilience = resilience or default_resilience()
+        self._pool = KeyPool([
+            KeySlot(
+                key,
+                GeminiClient(key, model, system_instruction, **options),
+                resilience if index == 0 else resilience.clone(),
+            )
+            for index, key in enumerate(keys)
+        ])
+        self._pool.attach_metrics(self.metrics)
+
+    def attach_metrics(self, metrics):
+        super().attach_metrics(metrics)
+        self._pool.attach_metrics(metrics)
+
+    def key_stats(self) -> List[dict]:
+        return self._pool.stats()
+
+    def _tokens(self, message: str) -> int:
+        return estimate_tokens(message) + estimate_tokens(
+            self._system_instruction or ""
         )
 
+    def _generation_kwargs(self, schema: Optional[dict] = None) -> dict:
+        config = dict(self._generation_config)
+        if schema is not None:
+            config["response_mime_type"] = "application/json"
+            config["response_schema"] = schema
+
+        return {
+            "generation_config": genai.types.GenerationConfig(**config),
+        }
+
+    def generate_content(
+        self, message: str, schema: Optional[dict] = None
+    ) -> str:
+        return self._generate(message, schema)
+
+    def _generate(
+        self,
+        message: str,
+        schema: Optional[dict] = None,
+        context: Optional[GeminiContext] = None,
+    ) -> str:
+        def call(client):
+            model = client.model if context is None else context.model
+            return model.generate_content(
+                message, **self._generation_kwargs(schema)
+            )
+
+        with self.metrics.stage("model_call"):
+            response = self._pool.call(
+                call,
+                tokens=self._tokens(message),
+                client=context.client if context is not None else None,
+            )
+
+        self._record_usage(response)
         return response.text
+
+    async def agenerate_content(
+        self, message: str, schema: Optional[dict] = None
+    ) -> str:
+        def call(client):
+            kwargs = self._generation_kwargs(schema)
+            if self._transport == "rest":
+                # The SDK has no async REST client
+                return asyncio.to_thread(
+                    client.model.generate_content, message, **kwargs
+                )
+            return client.async_model.generate_content_async(
+                message, **kwargs
+            )
+
+        with self.metrics.stage("model_call"):
+            response = await self._pool.acall(
+                call, tokens=self._tokens(message)
+            )
+
+        self._record_usage(response)
+        return response.text
+
+    def generate_structured(self, message: str, schema: dict) -> dict:
+        """
+        Uses the Gemini JSON mode, constrained to ``schema``.
+        """
+        return json.loads(self.generate_content(message, schema))
+
+    async def agenerate_structured(self, message: str, schema: dict) -> dict:
+        return json.loads(await self.agenerate_content(message, schema))
+
+    def create_context(self, content: str) -> Context:
+        """
+        Uploads ``content`` as a Gemini cached content, so the prompts
+        using it only send their own tokens. Falls back to sending
+        ``content`` with every prompt when it is below the minimum size or
+        the model refuses to cache it.
+        """
+        tokens = estimate_tokens(content)
+        if tokens < self._context_min_tokens:
+            return super().create_context(content)
+
+        def create(client):
+            return (client, *client.create_cache(content, self._context_ttl))
+
+        try:
+            client, name, model = self._pool.call(create, tokens=tokens)
+        except google_exceptions.InvalidArgument:
+            self.metrics.add("context_fallbacks")
+            return super().create_context(content)
+
+        self.metrics.add("context_uploads")
+        return Context(content, GeminiContext(name, client, model))
+
+    def generate_with_context(self, context: Context, message: str) -> str:
+        if context.handle is None:
+            return super().generate_with_context(context, message)
+        return self._generate(message, context=context.handle)
+
+    def delete_context(self, context: Context):
+        handle = context.handle
+        if handle is not None:
+            self._pool.call(
+                lambda client: client.delete_cache(handle.name),
+                client=handle.client,
+            )
+
+    def stream_content(self, message: str) -> Iterator[str]:
+        """
+        Streams the response. Failures are only retried until the first
+        chunk arrives, since the caller may already have used the output.
+        """
+        def start(client):
+            response = client.model.generate_content(
+                message, stream=True, **self._generation_kwargs()
+            )
+            chunks = iter(response)
+            return response, chunks, next(chunks, None)
+
+        with self.metrics.stage("model_call"):
+            begin = time.perf_counter()
+            response, chunks, first = self._pool.call(
+                start, tokens=self._tokens(message)
+            )
+            self.metrics.record(
+                "model_first_token", time.perf_counter() - begin
+            )
+
+            if first is not None:
+                yield from self._chunk_texts([first])
+            yield from self._chunk_texts(chunks)
+
+        self._record_usage(response)
+
+    @staticmethod
+    def _chunk_texts(chunks) -> Iterator[str]:
+        for chunk in chunks:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. only finish metadata)
+                continue
+            if text:
+                yield text
+
+    def _record_usage(self, response):
+        """
+        Records the token counts reported in the response usage metadata.
+        """
+        self.metrics.add("requests")
+        usage = getattr(response, "usage_metadata", None)
+        for field, counter in (
+            ("prompt_token_count", "prompt_tokens"),
+            ("candidates_token_count", "response_tokens"),
+            ("cached_content_token_count", "cached_tokens"),
+        ):
+            value = getattr(usage, field, None)
+            if isinstance(value, int):
+                self.metrics.add(counter, value)
@@ -0,0 +1,100 @@
+"""
+The only place reaching into private google-generativeai APIs.
+
+The SDK can only be configured process-wide, so per-key clients are built
+from its private client manager and bound to the models by hand. Every
+private attribute used for that is checked once, on the first client, so
+an SDK release that changes them fails loudly here instead of silently
+sending requests with the wrong key.
+"""
+import functools
+import warnings
+from typing import Optional
+
+import google.generativeai as genai
+from google.generativeai import client as genai_client
+
+
+# The release line the private APIs below were checked against, pinned in
+# requirements.txt
+TESTED_VERSION = "0.8."
+
+MANAGER_ATTRIBUTES = ("configure", "get_default_client")
+MODEL_ATTRIBUTES = ("_client", "_async_client")
+
+
+class UnsupportedSDKError(RuntimeError):
+    """Raised when the installed SDK lacks the private APIs relied upon."""
+
+
+def missing_internals() -> list:
+    """
+    Names of the private SDK attributes the adapter relies on that the
+    installed google-generativeai does not have.
+    """
+    manager = getattr(genai_client, "_ClientManager", None)
+    if manager is None:
+        return ["client._ClientManager"]
+
+    missing = [
+        f"client._ClientManager.{name}"
+        for name in MANAGER_ATTRIBUTES if not hasattr(manager, name)
+    ]
+    model = genai.GenerativeModel("gemini-sdk-check")
+    missing.extend(
+        f"GenerativeModel.{name}"
+        for name in MODEL_ATTRIBUTES if not hasattr(model, name)
+    )
+    # Set by from_cached_content and read back through this property
+    if not isinstance(
+        getattr(genai.GenerativeModel, "cached_content", None), property
+    ):
+        missing.append("GenerativeModel.cached_content")
+    return missing
+
+
+@functools.lru_cache(maxsize=None)
+def check_sdk():
+    version = getattr(genai, "__version__", "unknown")
+    missing = missing_internals()
+    if missing:
+        raise UnsupportedSDKError(
+            f"google-generativeai {version} lacks {', '.join(missing)}; "
+            f"install the {TESTED_VERSION}x release from requirements.txt"
+        )
+    if not version.startswith(TESTED_VERSION):
+        warnings.warn(
+            f"google-generativeai {version} is untested, the adapter relies "
+            f"on private APIs checked against {TESTED_VERSION}x",
+            RuntimeWarning,
+        )
+
+
+def client_manager(api_key: str, **options):
+    """
+    A private client manager configured with ``api_key``, leaving the
+    process-wide one untouched.
+    """
+    check_sdk()
+    manager = genai_client._ClientManager()
+    manager.configure(api_key=api_key, **options)
+    return manager
+
+
+def bind(model, manager, cached_content: Optional[str] = None):
+    """
+    Points ``model`` at the clients of ``manager`` and, optionally, at a
+    cached content (what ``GenerativeModel.from_cached_content`` does,
+    without fetching the cache through the process-wide client).
+    """
+    model._client = manager.get_default_client("generative")
+    if cached_content is not None:
+        model._cached_content = cached_content
+    return model
+
+
+def bind_async(model, manager):
+    # Async clients are built on first use, inside the event loop
+    if model._async_client is None:
+        model._async_client = manager.get_default_client("generative_async")
+    return model
@@ -0,0 +1,227 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from src.ai.adapters.base import AIAdapter
+from src.ai.adapters.registry import LazyAdapter
+from src.config.settings import Config
+from src.utils.stats import RollingLatency
+
+
+T = TypeVar("T")
+
+
+class HedgedAdapter(AIAdapter):
+    """
+    Composite adapter that sends the request to the first backend and, if
+    it has not answered by its rolling p95 latency, also to the next one,
+    returning whichever answers first.
+
+    A backend that fails is replaced by the next one right away. Hedging
+    only kicks in for the slow tail, so the average cost stays close to a
+    single call. Threads cannot be interrupted, so on the sync path a
+    losing call is abandoned (its result discarded) rather than cancelled,
+    on a daemon thread so it never delays the exit of the process; on the
+    async path the losing task is cancelled.
+    """
+
+    def __init__(
+        self,
+        backends: List[AIAdapter],
+        percentile: float = 0.95,
+        default_delay: Optional[float] = None,
+        min_delay: float = 0.05,
+        min_samples: int = 10,
+    ):
+        if not backends:
+            raise ValueError("HedgedAdapter needs at least one backend")
+
+        self.backends = backends
+        self.percentile = percentile
+        self.default_delay = (
+            Config.HEDGE_DELAY if default_delay is None else default_delay
+        )
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.latencies = [RollingLatency() for _ in backends]
+
+    def fingerprint(self) -> dict:
+        return {
+            "adapter": "hedged",
+            "backends": [backend.fingerprint() for backend in self.backends],
+        }
+
+    def attach_metrics(self, metrics):
+        super().attach_metrics(metrics)
+        for backend in self.backends:
+            backend.attach_metrics(metrics)
+
+    def warm(self):
+        for backend in self.backends:
+            backend.warm()
+
+    def hedge_delay(self, index: int) -> float:
+        """
+        How long to wait for backend ``index`` before hedging, based on its
+        observed latency percentile.
+        """
+        latencies = self.latencies[index]
+        if len(latencies) < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, latencies.percentile(self.percentile))
+
+    def _deadline(self, launched: int) -> Optional[float]:
+        """
+        Seconds to wait for the last launched backend before hedging, or
+        None when there is no backend left to hedge to.
+        """
+        if launched >= len(self.backends):
+            return None
+        return self.hedge_delay(launched - 1)
+
+    def _timed(self, index: int, call: Callable[[AIAdapter], T]) -> T:
+        start = time.perf_counter()
+        result = call(self.backends[index])
+        self.latencies[index].add(time.perf_counter() - start)
+        return result
+
+    def _submit(self, index: int, call: Callable[[AIAdapter], T]) -> Future:
+        # Not a ThreadPoolExecutor: its workers are joined at exit, so an
+        # abandoned slow call would hold the process until it finishes
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(self._timed(index, call))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(
+            target=run, name=f"hedge-{index}", daemon=True
+        ).start()
+        return future
+
+    async def _atimed(
+        self, index: int, call: Callable[[AIAdapter], Awaitable[T]]
+    ) -> T:
+        start = time.perf_counter()
+        result = await call(self.backends[index])
+        self.latencies[index].add(time.perf_counter() - start)
+        return result
+
+    def generate_content(self, message: str) -> str:
+        return self._race(lambda backend: backend.generate_content(message))
+
+    async def agenerate_content(self, message: str) -> str:
+        return await self._arace(
+            lambda backend: backend.agenerate_content(message)
+        )
+
+    def generate_structured(self, message: str, schema: dict) -> dict:
+        return self._race(
+            lambda backend: backend.generate_structured(message, schema)
+        )
+
+    async def agenerate_structured(self, message: str, schema: dict) -> dict:
+        return await self._arace(
+            lambda backend: backend.agenerate_structured(message, schema)
+        )
+
+    def _race(self, call: Callable[[AIAdapter], T]) -> T:
+        pending = {}
+        errors = []
+        launched = 0
+        launch = True
+
+        while True:
+            if launch and launched < len(self.backends):
+                future = self._submit(launched, call)
+                pending[future] = launched
+                launched += 1
+
+            if not pending:
+                raise errors[-1]
+
+            done, _ = wait(
+                pending, self._deadline(launched), return_when=FIRST_COMPLETED
+            )
+            # Deadline passed without an answer: hedge to the next backend
+            launch = not done
+
+            for future in done:
+                index = pending.pop(future)
+                if future.exception() is None:
+                    self._finish(index, launched, pending)
+                    return future.result()
+                errors.append(future.exception())
+                launch = True
+
+    async def _arace(self, call: Callable[[AIAdapter], Awaitable[T]]) -> T:
+        pending = {}
+        errors = []
+        launched = 0
+        launch = True
+
+        try:
+            while True:
+                if launch and launched < len(self.backends):
+                    task = asyncio.ensure_future(
+                        self._atimed(launched, call)
+                    )
+                    pending[task] = launched
+                    launched += 1
+
+                if not pending:
+                    raise errors[-1]
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=self._deadline(launched),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                launch = not done
+
+                for task in done:
+                    index = pending.pop(task)
+                    if task.exception() is None:
+                        self._finish(index, launched, pending)
+                        return task.result()
+                    errors.append(task.exception())
+                    launch = True
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _finish(self, index: int, launched: int, pending: dict):
+        """
+        Records the outcome and cancels the requests that lost the race.
+        """
+        if launched > 1:
+            self.metrics.add("hedged_requests", launched - 1)
+        if index > 0:
+            self.metrics.add("hedge_wins")
+        for loser in pending:
+            loser.cancel()
+
+
+def hedged_adapter(
+    system_instruction: Optional[str] = None,
+    backends: Optional[str] = None,
+    hedge_delay: Optional[float] = None,
+) -> HedgedAdapter:
+    """
+    Builds a ``HedgedAdapter`` from a ``provider[:model]`` comma separated
+    list, e.g. ``gemini:gemini-1.5-flash,openai:llama3``. Defaults to
+    ``Config.HEDGE_BACKENDS``.
+    """
+    adapters = []
+    for spec in (backends or Config.HEDGE_BACKENDS).split(","):
+        name, _, model = spec.strip().partition(":")
+        adapters.append(LazyAdapter(
+            name, system_instruction=system_instruction, model=model or None
+        ))
+
+    return HedgedAdapter(adapters, default_delay=hedge_delay)
@@ -0,0 +1,237 @@
+import threading
+import time
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    List,
+    TypeVar,
+    Union,
+)
+
+from src.ai.adapters.resilience import CircuitOpenError, Resilience
+from src.utils.metrics import Metrics
+
+
+C = TypeVar("C")
+T = TypeVar("T")
+
+
+class _Throttled(Exception):
+    """A rate limit error to take to another key instead of retrying."""
+
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+def parse_keys(keys: Union[str, List[str], None]) -> List[str]:
+    """
+    Reads a comma separated list of API keys, dropping empty entries and
+    duplicates.
+    """
+    if isinstance(keys, str):
+        keys = keys.split(",")
+    return list(dict.fromkeys(key.strip() for key in keys or [] if key))
+
+
+def mask_key(key: str) -> str:
+    return f"...{key[-4:]}" if key and len(key) > 8 else "..."
+
+
+class KeySlot(Generic[C]):
+    """
+    An API key with its own client, rate limiter and circuit breaker, so
+    its quota and health are tracked apart from the other keys.
+    """
+
+    __slots__ = ["key", "client", "resilience", "in_flight", "requests",
+                 "errors", "throttled_until"]
+
+    def __init__(self, key: str, client: C, resilience: Resilience):
+        self.key = key
+        self.client = client
+        self.resilience = resilience
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.throttled_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.resilience.breaker.accepts_calls
+
+    @property
+    def throttled(self) -> bool:
+        return time.monotonic() < self.throttled_until
+
+    def throttle(self, error: Exception):
+        """
+        Keeps requests away from the key until the rate limit ``error``
+        suggests it recovered.
+        """
+        delay = self.resilience.retry_hint(error)
+        self.throttled_until = time.monotonic() + (
+            self.resilience.retry.base_delay if delay is None else delay
+        )
+
+
+class KeyPool(Generic[C]):
+    """
+    Shards requests across API keys. Each request goes to the healthy key
+    with the fewest requests in flight, in turns on ties; a key being
+    throttled keeps its requests waiting on its own rate limiter, so new
+    ones naturally go elsewhere. A request rate limited by the server moves
+    to a key it has not tried yet, and that key is avoided until the retry
+    hint passes; once every key was tried, retries stay on the last one. A
+    request rejected by a key's open circuit breaker fails over as well.
+    """
+
+    __slots__ = ["slots", "metrics", "_turn", "_lock"]
+
+    def __init__(self, slots: List[KeySlot[C]], metrics=None):
+        if not slots:
+            raise ValueError("KeyPool needs at least one API key")
+
+        self.slots = slots
+        self.metrics = metrics or Metrics()
+        self._turn = 0
+        self._lock = threading.Lock()
+
+    def attach_metrics(self, metrics: Metrics):
+        self.metrics = metrics
+        for slot in self.slots:
+            slot.resilience.metrics = metrics
+
+    def _acquire(self, tried: List[KeySlot[C]], client=None) -> KeySlot[C]:
+        with self._lock:
+            if client is not None:
+                slot = next(s for s in self.slots if s.client is client)
+                slot.in_flight += 1
+                slot.requests += 1
+                return slot
+
+            turn = self._turn % len(self.slots)
+            self._turn += 1
+            untried = [
+                slot for slot in self.slots[turn:] + self.slots[:turn]
+                if slot not in tried
+            ]
+            healthy = [slot for slot in untried if slot.healthy]
+            candidates = (
+                [slot for slot in healthy if not slot.throttled]
+                or healthy or untried
+            )
+            slot = min(candidates, key=lambda slot: slot.in_flight)
+            slot.in_flight += 1
+            slot.requests += 1
+            return slot
+
+    def _release(self, slot: KeySlot[C]):
+        with self._lock:
+            slot.in_flight -= 1
+
+    def _failed(self, slot: KeySlot[C], error: Exception, rotate: bool):
+        with self._lock:
+            slot.errors += 1
+            if not slot.resilience.is_rate_limited(error):
+                return
+            slot.throttle(error)
+        if rotate:
+            # Not retryable, so the key's retry loop hands it back at once
+            raise _Throttled(error) from error
+
+    def _attempt(self, slot: KeySlot[C], func: Callable[[C], T], rotate):
+        def attempt():
+            try:
+                return func(slot.client)
+            except Exception as error:
+                self._failed(slot, error, rotate)
+                raise
+        return attempt
+
+    def _aattempt(
+        self, slot: KeySlot[C], func: Callable[[C], Awaitable[T]], rotate
+    ):
+        async def attempt():
+            try:
+                return await func(slot.client)
+            except Exception as error:
+                self._failed(slot, error, rotate)
+                raise
+        return attempt
+
+    def _can_rotate(self, tried: List[KeySlot[C]], client: C) -> bool:
+        return client is None and len(tried) < len(self.slots)
+
+    def call(
+        self, func: Callable[[C], T], tokens: int = 0, client: C = None
+    ) -> T:
+        """
+        Runs ``func(client)`` with the client of the chosen key, behind
+        that key's resilience settings. Passing ``client`` pins the call to
+        its key, e.g. to use a resource created with that key, and
+        disables the failover.
+        """
+        tried = []
+        while True:
+            slot = self._acquire(tried, client)
+            tried.append(slot)
+            try:
+                return slot.resilience.call(
+                    self._attempt(
+                        slot, func, self._can_rotate(tried, client)
+                    ),
+                    tokens=tokens,
+                )
+            except _Throttled:
+                self.metrics.add("key_rotations")
+            except CircuitOpenError:
+                if client is not None or len(tried) == len(self.slots):
+                    raise
+                self.metrics.add("key_failovers")
+            finally:
+                self._release(slot)
+
+    async def acall(
+        self,
+        func: Callable[[C], Awaitable[T]],
+        tokens: int = 0,
+        client: C = None,
+    ) -> T:
+        tried = []
+        while True:
+            slot = self._acquire(tried, client)
+            tried.append(slot)
+            try:
+                return await slot.resilience.acall(
+                    self._aattempt(
+                        slot, func, self._can_rotate(tried, client)
+                    ),
+                    tokens=tokens,
+                )
+            except _Throttled:
+                self.metrics.add("key_rotations")
+            except CircuitOpenError:
+                if client is not None or len(tried) == len(self.slots):
+                    raise
+                self.metrics.add("key_failovers")
+            finally:
+                self._release(slot)
+
+    def stats(self) -> List[dict]:
+        """
+        Per-key counters, with the keys masked.
+        """
+        with self._lock:
+            return [
+                {
+                    "key": mask_key(slot.key),
+                    "requests": slot.requests,
+                    "errors": slot.errors,
+                    "in_flight": slot.in_flight,
+                    "healthy": slot.healthy,
+                    "throttled": slot.throttled,
+                }
+                for slot in self.slots
+            ]
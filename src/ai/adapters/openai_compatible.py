@@ -0,0 +1,106 @@
+import json
+from typing import Iterator, Optional
+
+import requests
+
+from src.ai.adapters.base import (
+    JSON_INSTRUCTIONS,
+    AIAdapter,
+    parse_json_response,
+)
+from src.config.settings import Config
+
+
+class OpenAICompatibleAdapter(AIAdapter):
+    """
+    Adapter for any server exposing the OpenAI ``/chat/completions`` API,
+    such as a local Ollama, vLLM or llama.cpp endpoint.
+    """
+
+    def __init__(
+        self,
+        system_instruction: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: float = 300,
+    ):
+        self._api_key = api_key or Config.OPENAI_API_KEY
+        self._model_name = model or Config.OPENAI_MODEL
+        self._system_instruction = system_instruction
+        self._generation_config = {"n": 1}
+        self._base_url = (base_url or Config.OPENAI_BASE_URL).rstrip("/")
+        self._timeout = timeout
+        self._session = requests.Session()
+
+    def fingerprint(self) -> dict:
+        return {**super().fingerprint(), "base_url": self._base_url}
+
+    def _payload(
+        self, message: str, stream: bool = False, **extra
+    ) -> dict:
+        messages = []
+        if self._system_instruction:
+            messages.append(
+                {"role": "system", "content": self._system_instruction}
+            )
+        messages.append({"role": "user", "content": message})
+
+        return {
+            "model": self._model_name,
+            "messages": messages,
+            "stream": stream,
+            **self._generation_config,
+            **extra,
+        }
+
+    def _post(self, message: str, stream: bool = False, **extra):
+        headers = {}
+        if self._api_key:
+            headers["Authorization"] = f"Bearer {self._api_key}"
+
+        response = self._session.post(
+            f"{self._base_url}/chat/completions",
+            json=self._payload(message, stream, **extra),
+            headers=headers,
+            timeout=self._timeout,
+            stream=stream,
+        )
+        response.raise_for_status()
+        return response
+
+    def generate_content(self, message: str, **extra) -> str:
+        with self.metrics.stage("model_call"):
+            data = self._post(message, **extra).json()
+
+        self.metrics.add("requests")
+        usage = data.get("usage") or {}
+        self.metrics.add("prompt_tokens", usage.get("prompt_tokens", 0))
+        self.metrics.add("response_tokens", usage.get("completion_tokens", 0))
+
+        return data["choices"][0]["message"]["content"]
+
+    def generate_structured(self, message: str, schema: dict) -> dict:
+        """
+        Uses the JSON mode of the server; the schema itself is described
+        in the prompt, which JSON mode also requires.
+        """
+        return parse_json_response(self.generate_content(
+            message + JSON_INSTRUCTIONS.format(schema=json.dumps(schema)),
+            response_format={"type": "json_object"},
+        ))
+
+    def stream_content(self, message: str) -> Iterator[str]:
+        with self.metrics.stage("model_call"):
+            response = self._post(message, stream=True)
+            self.metrics.add("requests")
+
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                delta = json.loads(data)["choices"][0].get("delta", {})
+                if delta.get("content"):
+                    yield delta["content"]
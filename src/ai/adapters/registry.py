@@ -0,0 +1,162 @@
+import importlib
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from src.ai.adapters.base import AIAdapter
+from src.config.settings import Config
+
+
+class AdapterSpec(NamedTuple):
+    """Where to find an adapter class and how to fill its defaults."""
+
+    path: str
+    defaults: Optional[Callable[[], dict]] = None
+
+
+_ADAPTERS: Dict[str, AdapterSpec] = {
+    "gemini": AdapterSpec(
+        "src.ai.adapters.gemini:GeminiAdapter",
+        lambda: {
+            "model": Config.GEMINI_MODEL,
+            "transport": Config.GEMINI_TRANSPORT,
+            "api_endpoint": Config.GEMINI_API_ENDPOINT,
+        },
+    ),
+    "fake": AdapterSpec("src.ai.adapters.fake:FakeAdapter"),
+    "openai": AdapterSpec(
+        "src.ai.adapters.openai_compatible:OpenAICompatibleAdapter",
+        lambda: {
+            "model": Config.OPENAI_MODEL,
+            "base_url": Config.OPENAI_BASE_URL,
+        },
+    ),
+    "hedged": AdapterSpec(
+        "src.ai.adapters.hedged:hedged_adapter",
+        lambda: {"backends": Config.HEDGE_BACKENDS},
+    ),
+    "routing": AdapterSpec(
+        "src.ai.adapters.routing:routing_adapter",
+        lambda: {
+            "tiers": Config.ROUTING_TIERS,
+            "latency_target": Config.LATENCY_TARGET,
+        },
+    ),
+}
+
+# Options that must never end up in a fingerprint (and thus a cache key)
+SECRET_OPTIONS = ("api_key", "api_keys")
+
+
+def register_adapter(
+    name: str, path: str, defaults: Optional[Callable[[], dict]] = None
+):
+    """
+    Registers an adapter class (or factory) under ``name``. ``path`` uses
+    the ``module:Class`` format and is only imported when the adapter is
+    used.
+    """
+    _ADAPTERS[name] = AdapterSpec(path, defaults)
+
+
+def available_adapters() -> List[str]:
+    return sorted(_ADAPTERS)
+
+
+def get_adapter_class(name: str) -> type:
+    try:
+        spec = _ADAPTERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown AI provider: {name}") from None
+
+    module_name, _, class_name = spec.path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def adapter_options(name: str, **options) -> dict:
+    """
+    Returns ``options`` completed with the provider defaults.
+    """
+    if name not in _ADAPTERS:
+        raise ValueError(f"Unknown AI provider: {name}")
+
+    defaults = _ADAPTERS[name].defaults
+    resolved = defaults() if defaults else {}
+    resolved.update(
+        {key: value for key, value in options.items() if value is not None}
+    )
+    return resolved
+
+
+def create_adapter(name: str, **options) -> AIAdapter:
+    """
+    Imports and instantiates the adapter registered under ``name``.
+    """
+    return get_adapter_class(name)(**adapter_options(name, **options))
+
+
+class LazyAdapter(AIAdapter):
+    """
+    Defers importing and building an adapter until a request actually
+    needs the model, so cache hits never load the provider SDK.
+    """
+
+    def __init__(self, name: str, **options):
+        self._name = name
+        self._options = adapter_options(name, **options)
+        self._adapter = None
+        self._lock = threading.Lock()
+
+    @property
+    def adapter(self) -> AIAdapter:
+        with self._lock:
+            if self._adapter is None:
+                self._adapter = get_adapter_class(self._name)(
+                    **self._options
+                )
+                if self._metrics is not None:
+                    self._adapter.attach_metrics(self._metrics)
+        return self._adapter
+
+    def attach_metrics(self, metrics):
+        super().attach_metrics(metrics)
+        if self._adapter is not None:
+            self._adapter.attach_metrics(metrics)
+
+    def warm(self):
+        self.adapter.warm()
+
+    def fingerprint(self) -> dict:
+        return {
+            "adapter": self._name,
+            **{
+                key: value for key, value in self._options.items()
+                if key not in SECRET_OPTIONS
+            },
+        }
+
+    def generate_content(self, message: str):
+        return self.adapter.generate_content(message)
+
+    async def agenerate_content(self, message: str):
+        return await self.adapter.agenerate_content(message)
+
+    def stream_content(self, message: str):
+        return self.adapter.stream_content(message)
+
+    def generate_structured(self, message: str, schema: dict):
+        return self.adapter.generate_structured(message, schema)
+
+    async def agenerate_structured(self, message: str, schema: dict):
+        return await self.adapter.agenerate_structured(message, schema)
+
+    def create_context(self, content: str):
+        return self.adapter.create_context(content)
+
+    def generate_with_context(self, context, message: str):
+        return self.adapter.generate_with_context(context, message)
+
+    async def agenerate_with_context(self, context, message: str):
+        return await self.adapter.agenerate_with_context(context, message)
+
+    def delete_context(self, context):
+        self.adapter.delete_context(context)
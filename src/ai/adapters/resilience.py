@@ -0,0 +1,323 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, Tuple, TypeVar
+
+from src.utils.metrics import Metrics
+
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the upstream is down."""
+
+
+class SlidingWindow:
+    """
+    Thread-safe limit of ``limit`` units in any ``window`` seconds, e.g.
+    requests per minute. Unlike a token bucket starting full, no window
+    ever goes over the quota, not even the first one.
+
+    ``reserve`` never blocks: it schedules the units at the earliest time
+    that keeps every window within the limit and returns how long the
+    caller must wait before using them. This keeps the limiter usable from
+    threads and event loops.
+    """
+
+    __slots__ = ["limit", "window", "_reservations", "_lock"]
+
+    def __init__(self, limit: float, window: float = 60):
+        self.limit = limit
+        self.window = window
+        self._reservations: Deque[Tuple[float, float]] = deque()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1) -> float:
+        # A request bigger than the limit would otherwise never fit
+        amount = min(amount, self.limit)
+
+        with self._lock:
+            now = time.monotonic()
+            reservations = self._reservations
+            while reservations and reservations[0][0] <= now - self.window:
+                reservations.popleft()
+
+            # Reservations are served in order, so the new one never goes
+            # before the last one
+            start = max(now, reservations[-1][0]) if reservations else now
+            used = sum(units for _, units in reservations)
+            for at, units in reservations:
+                if at > start - self.window:
+                    if used + amount <= self.limit:
+                        break
+                    start = at + self.window
+                used -= units
+
+            reservations.append((start, amount))
+            return start - now
+
+
+class RateLimiter:
+    """
+    Client-side limiter for requests and tokens per minute. A limit of 0
+    (or None) disables that window.
+    """
+
+    __slots__ = ["_requests", "_tokens"]
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ):
+        self._requests = (
+            SlidingWindow(requests_per_minute) if requests_per_minute
+            else None
+        )
+        self._tokens = (
+            SlidingWindow(tokens_per_minute) if tokens_per_minute else None
+        )
+
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Reserves one request and ``tokens`` tokens and returns the number of
+        seconds to wait before sending it.
+        """
+        wait = 0.0
+        if self._requests is not None:
+            wait = max(wait, self._requests.reserve(1))
+        if self._tokens is not None and tokens:
+            wait = max(wait, self._tokens.reserve(tokens))
+        return wait
+
+    def clone(self) -> "RateLimiter":
+        """
+        Returns an unused limiter with the same limits.
+        """
+        return RateLimiter(*(
+            window.limit if window is not None else None
+            for window in (self._requests, self._tokens)
+        ))
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures and rejects calls
+    for ``reset_timeout`` seconds, then lets a single trial call through.
+    """
+
+    __slots__ = [
+        "failure_threshold", "reset_timeout", "_failures", "_opened_at",
+        "_trial", "_lock",
+    ]
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    @property
+    def accepts_calls(self) -> bool:
+        """
+        False while open and still within the reset timeout.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            elapsed = time.monotonic() - self._opened_at
+            return elapsed >= self.reset_timeout and not self._trial
+
+    def clone(self) -> "CircuitBreaker":
+        return CircuitBreaker(self.failure_threshold, self.reset_timeout)
+
+    def before_call(self) -> bool:
+        """
+        Raises ``CircuitOpenError`` when the call must be rejected; returns
+        True when the call is the half-open trial.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed >= self.reset_timeout and not self._trial:
+                self._trial = True
+                return True
+            raise CircuitOpenError(
+                "Upstream unavailable, retry in "
+                f"{max(self.reset_timeout - elapsed, 0):.0f}s"
+            )
+
+    def release_trial(self):
+        """
+        Ends a trial call that neither succeeded nor failed, e.g. one that
+        was cancelled, so the next call can try again.
+        """
+        with self._lock:
+            self._trial = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter. A server retry hint, when
+    present, is used as the lower bound of the delay.
+    """
+
+    __slots__ = ["max_retries", "base_delay", "max_delay"]
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, hint: Optional[float] = None) -> float:
+        backoff = min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay = random.uniform(0, backoff)
+        if hint is not None:
+            delay = max(delay, hint)
+        return delay
+
+
+class Resilience:
+    """
+    Runs upstream calls behind a rate limiter, a circuit breaker and a
+    retry policy. ``is_retryable``, ``retry_hint`` and ``is_rate_limited``
+    tell it how to read the errors of a given provider; rate limit errors
+    are retried but do not count as failures for the circuit breaker, since
+    the upstream is up.
+    """
+
+    def __init__(
+        self,
+        is_retryable: Callable[[BaseException], bool],
+        retry_hint: Callable[[BaseException], Optional[float]] = None,
+        retry: Optional[RetryPolicy] = None,
+        limiter: Optional[RateLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        metrics: Optional[Metrics] = None,
+        is_rate_limited: Callable[[BaseException], bool] = None,
+    ):
+        self.is_retryable = is_retryable
+        self.is_rate_limited = is_rate_limited or (lambda error: False)
+        self.retry_hint = retry_hint or (lambda error: None)
+        self.retry = retry or RetryPolicy()
+        self.limiter = limiter or RateLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics or Metrics()
+
+    def clone(self) -> "Resilience":
+        """
+        Returns a copy with the same settings but its own rate limiter and
+        circuit breaker, e.g. for another API key with its own quota.
+        """
+        return Resilience(
+            self.is_retryable, self.retry_hint, self.retry,
+            self.limiter.clone(), self.breaker.clone(), self.metrics,
+            self.is_rate_limited,
+        )
+
+    def call(self, func: Callable[[], T], tokens: int = 0) -> T:
+        attempt = 0
+        while True:
+            trial = self.breaker.before_call()
+            try:
+                time.sleep(self._delay("rate_limit_wait", tokens=tokens))
+                result = func()
+            except Exception as error:
+                time.sleep(self._on_error(error, attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                # KeyboardInterrupt and friends must not hold the trial
+                if trial:
+                    self.breaker.release_trial()
+                raise
+
+            self.breaker.record_success()
+            return result
+
+    async def acall(
+        self, func: Callable[[], Awaitable[T]], tokens: int = 0
+    ) -> T:
+        attempt = 0
+        while True:
+            trial = self.breaker.before_call()
+            try:
+                await asyncio.sleep(
+                    self._delay("rate_limit_wait", tokens=tokens)
+                )
+                result = await func()
+            except Exception as error:
+                await asyncio.sleep(self._on_error(error, attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                # A cancelled trial, e.g. a hedging loser, must not keep
+                # the circuit open forever
+                if trial:
+                    self.breaker.release_trial()
+                raise
+
+            self.breaker.record_success()
+            return result
+
+    def _on_error(self, error: Exception, attempt: int) -> float:
+        """
+        Re-raises ``error`` when it must not be retried, otherwise returns
+        how long to wait before the next attempt.
+        """
+        if not self.is_retryable(error):
+            # The upstream answered, so it is not down
+            self.breaker.record_success()
+            raise error
+
+        if self.is_rate_limited(error):
+            self.breaker.release_trial()
+        else:
+            self.breaker.record_failure()
+        if attempt >= self.retry.max_retries:
+            raise error
+
+        self.metrics.add("retries")
+        return self._delay(
+            "retry_wait",
+            seconds=self.retry.delay(attempt, self.retry_hint(error)),
+        )
+
+    def _delay(self, stage: str, seconds: float = None, tokens: int = 0):
+        """
+        Returns how long to sleep before the next call, recording it under
+        ``stage``. Without ``seconds`` the rate limiter is consulted.
+        """
+        if seconds is None:
+            seconds = self.limiter.reserve(tokens)
+        if seconds > 0:
+            self.metrics.record(stage, seconds)
+        return seconds
@@ -0,0 +1,184 @@
+import time
+from typing import (
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
+
+from src.ai.adapters.base import AIAdapter
+from src.ai.adapters.registry import LazyAdapter
+from src.config.settings import Config
+from src.utils.stats import LatencyModel
+from src.utils.tokens import estimate_tokens
+
+
+T = TypeVar("T")
+
+
+class Tier(NamedTuple):
+    """A model and the largest prompt, in tokens, it should receive."""
+
+    name: str
+    adapter: AIAdapter
+    max_tokens: Optional[int] = None
+
+
+class RoutingAdapter(AIAdapter):
+    """
+    Composite adapter that picks a model tier for each request from the
+    estimated prompt size.
+
+    Tiers are ordered from the smallest (fastest, cheapest) model to the
+    largest one and a prompt goes to the first tier whose ``max_tokens``
+    fits it. With a ``latency_target`` the larger tiers are candidates too:
+    the first one whose latency, learnt from the calls it served, is
+    expected to meet the target is used. A tier is trusted until it has
+    ``min_samples`` calls, and when no tier meets the target the fastest
+    one is picked.
+    """
+
+    def __init__(
+        self,
+        tiers: List[Tier],
+        latency_target: Optional[float] = None,
+        min_samples: int = 5,
+    ):
+        if not tiers:
+            raise ValueError("RoutingAdapter needs at least one tier")
+
+        self.tiers = tiers
+        self.latency_target = latency_target
+        self.min_samples = min_samples
+        self.latencies = [LatencyModel() for _ in tiers]
+
+    def fingerprint(self) -> dict:
+        return {
+            "adapter": "routing",
+            "tiers": [
+                [tier.name, tier.max_tokens, tier.adapter.fingerprint()]
+                for tier in self.tiers
+            ],
+            "latency_target": self.latency_target,
+        }
+
+    def attach_metrics(self, metrics):
+        super().attach_metrics(metrics)
+        for tier in self.tiers:
+            tier.adapter.attach_metrics(metrics)
+
+    def warm(self):
+        for tier in self.tiers:
+            tier.adapter.warm()
+
+    def route(self, tokens: int) -> int:
+        """
+        Index of the tier a prompt of ``tokens`` tokens is sent to.
+        """
+        candidates = [
+            index for index, tier in enumerate(self.tiers)
+            if tier.max_tokens is None or tokens <= tier.max_tokens
+        ] or [len(self.tiers) - 1]
+
+        if self.latency_target is None:
+            return candidates[0]
+
+        predictions = {}
+        for index in candidates:
+            if len(self.latencies[index]) < self.min_samples:
+                return index
+            predictions[index] = self.latencies[index].predict(tokens)
+            if predictions[index] <= self.latency_target:
+                return index
+
+        return min(predictions, key=predictions.get)
+
+    def _select(self, message: str):
+        tokens = estimate_tokens(message)
+        index = self.route(tokens)
+        self.metrics.add("routed_requests", tier=self.tiers[index].name)
+        return index, tokens, time.perf_counter()
+
+    def _observe(self, index: int, tokens: int, start: float):
+        self.latencies[index].add(tokens, time.perf_counter() - start)
+
+    def _call(self, message: str, call: Callable[[AIAdapter], T]) -> T:
+        index, tokens, start = self._select(message)
+        result = call(self.tiers[index].adapter)
+        self._observe(index, tokens, start)
+        return result
+
+    async def _acall(
+        self, message: str, call: Callable[[AIAdapter], Awaitable[T]]
+    ) -> T:
+        index, tokens, start = self._select(message)
+        result = await call(self.tiers[index].adapter)
+        self._observe(index, tokens, start)
+        return result
+
+    def generate_content(self, message: str) -> str:
+        return self._call(
+            message, lambda adapter: adapter.generate_content(message)
+        )
+
+    async def agenerate_content(self, message: str) -> str:
+        return await self._acall(
+            message, lambda adapter: adapter.agenerate_content(message)
+        )
+
+    def generate_structured(self, message: str, schema: dict) -> dict:
+        return self._call(
+            message,
+            lambda adapter: adapter.generate_structured(message, schema),
+        )
+
+    async def agenerate_structured(self, message: str, schema: dict) -> dict:
+        return await self._acall(
+            message,
+            lambda adapter: adapter.agenerate_structured(message, schema),
+        )
+
+    def stream_content(self, message: str) -> Iterator[str]:
+        index, tokens, start = self._select(message)
+        yield from self.tiers[index].adapter.stream_content(message)
+        self._observe(index, tokens, start)
+
+
+def parse_tiers(
+    spec: str, system_instruction: Optional[str] = None
+) -> List[Tier]:
+    """
+    Builds the tiers from a ``provider[:model][@max_tokens]`` comma
+    separated list, e.g. ``gemini:gemini-1.5-flash-8b@4000,gemini``.
+    """
+    tiers = []
+    for entry in spec.split(","):
+        backend, _, max_tokens = entry.strip().partition("@")
+        name, _, model = backend.partition(":")
+        tiers.append(Tier(
+            model or name,
+            LazyAdapter(
+                name, system_instruction=system_instruction,
+                model=model or None,
+            ),
+            int(max_tokens) if max_tokens else None,
+        ))
+    return tiers
+
+
+def routing_adapter(
+    system_instruction: Optional[str] = None,
+    tiers: Optional[str] = None,
+    latency_target: Optional[float] = None,
+) -> RoutingAdapter:
+    """
+    Builds a ``RoutingAdapter`` from ``Config.ROUTING_TIERS`` (see
+    ``parse_tiers``) unless ``tiers`` is given.
+    """
+    return RoutingAdapter(
+        parse_tiers(tiers or Config.ROUTING_TIERS, system_instruction),
+        latency_target=latency_target,
+    )
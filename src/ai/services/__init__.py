@@ -1,6 +1,27 @@
-from src.ai.services.summarizer import WeeklySummarizer
+from src.ai.services.batch import BatchResult, BatchSummarizer
+from src.ai.services.digests import DigestStore
+from src.ai.services.rollup import RollupNode, RollupSummarizer
+from src.ai.services.summarizer import (
+    VARIANTS,
+    Variant,
+    VariantSummaries,
+    WeeklySummarizer,
+)
+from src.ai.services.team import TeamSummarizer, TeamSummary
+from src.ai.services.watch import WeekRefresher
 
 
 __all__ = [
+    "BatchResult",
+    "BatchSummarizer",
+    "DigestStore",
+    "RollupNode",
+    "RollupSummarizer",
+    "TeamSummarizer",
+    "TeamSummary",
+    "VARIANTS",
+    "Variant",
+    "VariantSummaries",
+    "WeekRefresher",
     "WeeklySummarizer",
 ]
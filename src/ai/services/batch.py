@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from src.ai.services.summarizer import WeeklySummarizer
+from src.utils.dates import DateRange
+
+
+class BatchResult(NamedTuple):
+    """Outcome of summarizing a single date range."""
+
+    start_date: datetime
+    end_date: datetime
+    summary: Optional[str] = None
+    error: Optional[Exception] = None
+
+
+class BatchSummarizer:
+    """
+    Summarizes many date ranges with a bounded thread pool.
+
+    Every worker shares the same ``WeeklySummarizer`` and therefore the same
+    AI adapter, so the client is configured once per process.
+    """
+
+    __slots__ = ["_summarizer", "concurrency"]
+
+    def __init__(self, summarizer: WeeklySummarizer, concurrency: int = 4):
+        self._summarizer = summarizer
+        self.concurrency = concurrency
+
+    def run(self, ranges: Iterable[DateRange]) -> Iterator[BatchResult]:
+        """
+        Yields a ``BatchResult`` for every range as soon as it finishes.
+        A failing range is reported through ``error`` and does not stop the
+        others.
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {
+                executor.submit(
+                    self._summarizer.generate_weekly_summary,
+                    start_date, end_date,
+                ): (start_date, end_date)
+                for start_date, end_date in ranges
+            }
+
+            for future in as_completed(futures):
+                start_date, end_date = futures[future]
+                try:
+                    yield BatchResult(start_date, end_date, future.result())
+                except Exception as e:
+                    yield BatchResult(start_date, end_date, error=e)
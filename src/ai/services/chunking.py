@@ -0,0 +1,71 @@
+import re
+from typing import Iterable, List
+
+from src.config.settings import Config
+from src.utils.tokens import estimate_tokens
+
+
+SECTION_BOUNDARY = re.compile(r"\n(?=#)")
+
+__all__ = ["chunk_reports", "estimate_tokens"]
+
+
+def chunk_reports(reports: Iterable[str], max_tokens: int) -> List[str]:
+    """
+    Packs the reports into chunks of at most ``max_tokens`` tokens.
+
+    Reports are kept whole whenever possible. A report that does not fit on
+    its own is split at markdown section boundaries, then at line
+    boundaries and, as a last resort, at a fixed number of characters.
+    """
+    pieces = [
+        piece for report in reports for piece in _split(report, max_tokens)
+    ]
+    return _pack(pieces, max_tokens, "\n\n")
+
+
+def _pack(pieces: List[str], max_tokens: int, separator: str) -> List[str]:
+    """
+    Greedily joins consecutive pieces while they fit in ``max_tokens``.
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for piece in pieces:
+        tokens = estimate_tokens(piece + separator)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(separator.join(current))
+            current = []
+            current_tokens = 0
+        current.append(piece)
+        current_tokens += tokens
+
+    if current:
+        chunks.append(separator.join(current))
+
+    return chunks
+
+
+def _split(text: str, max_tokens: int, level: int = 0) -> List[str]:
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    if level == 0:
+        parts = SECTION_BOUNDARY.split(text)
+    elif level == 1:
+        parts = text.split("\n")
+    else:
+        size = max_tokens * Config.CHARS_PER_TOKEN
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    # Both boundaries drop a newline, which is restored when re-packing
+    return _pack(
+        [
+            piece
+            for part in parts
+            for piece in _split(part, max_tokens, level + 1)
+        ],
+        max_tokens,
+        "\n",
+    )
@@ -0,0 +1,216 @@
+import random
+import re
+import zlib
+from typing import Dict, Iterable, List, NamedTuple, Set
+from urllib.parse import urlsplit
+
+from src.utils.tokens import estimate_tokens
+
+
+HEADING = re.compile(r"^(#{1,6})\s")
+LIST_MARKER = re.compile(r"^(\s*)[*+](?=\s)")
+MARKDOWN_LINK = re.compile(r"\[([^\]]+)\]\(\S+?\)")
+BARE_URL = re.compile(r"https?://[^\s)>\]]+")
+INNER_SPACE = re.compile(r"(?<=\S)[ \t]{2,}")
+NON_WORD = re.compile(r"[\W_]+")
+
+# Bullets left in the template with nothing meaningful in them
+PLACEHOLDERS = {"", "na", "n a", "none", "nenhum", "nenhuma", "tbd", "todo"}
+
+MAX_URL_CHARS = 40
+
+
+class CompactionResult(NamedTuple):
+    """Compacted reports and the prompt size before and after."""
+
+    reports: List[str]
+    tokens_before: int
+    tokens_after: int
+
+
+class NearDuplicateIndex:
+    """
+    Finds lines similar to one already seen. Candidates come from a MinHash
+    LSH index over word shingles and are confirmed with their exact
+    Jaccard similarity, so the index never drops a line below
+    ``threshold``.
+    """
+
+    __slots__ = [
+        "threshold", "shingle_size", "rows", "_masks", "_buckets", "_lines",
+    ]
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        shingle_size: int = 2,
+        bands: int = 8,
+        rows: int = 4,
+        seed: int = 1,
+    ):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.rows = rows
+        rng = random.Random(seed)
+        self._masks = [rng.getrandbits(32) for _ in range(bands * rows)]
+        self._buckets: Dict[tuple, List[int]] = {}
+        self._lines: List[Set[int]] = []
+
+    def _shingles(self, text: str) -> Set[int]:
+        words = text.split()
+        size = self.shingle_size
+        return {
+            zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+            for i in range(max(len(words) - size + 1, 1))
+        }
+
+    def _bands(self, shingles: Set[int]) -> List[tuple]:
+        signature = [
+            min(map(mask.__xor__, shingles)) for mask in self._masks
+        ]
+        return [
+            (band, tuple(signature[band:band + self.rows]))
+            for band in range(0, len(signature), self.rows)
+        ]
+
+    def add(self, text: str) -> bool:
+        """
+        Indexes ``text`` and returns True, or returns False without
+        indexing it when a near-duplicate was already seen.
+        """
+        shingles = self._shingles(text)
+        bands = self._bands(shingles)
+
+        candidates = {
+            line for band in bands for line in self._buckets.get(band, ())
+        }
+        for line in candidates:
+            other = self._lines[line]
+            if len(shingles & other) >= self.threshold * len(shingles | other):
+                return False
+
+        for band in bands:
+            self._buckets.setdefault(band, []).append(len(self._lines))
+        self._lines.append(shingles)
+        return True
+
+
+def compact_reports(
+    reports: Iterable[str],
+    similarity: float = 0.8,
+    min_near_chars: int = 20,
+) -> CompactionResult:
+    """
+    Shrinks the reports of a period before they go into the prompt.
+
+    Markdown is normalized (bullets, spacing, links shortened to their
+    text) and a header repeated at the top of every report is kept only
+    once. Lines repeated across the period, exactly or with a similarity of
+    at least ``similarity``, are kept only where they first appear.
+    Finally, template sections left empty are dropped. The first line of
+    each report (its file name) is always kept.
+    """
+    reports = list(reports)
+    seen = set()
+    headers = set()
+    index = NearDuplicateIndex(similarity)
+
+    compacted = []
+    for report in reports:
+        title, _, body = report.partition("\n")
+        lines = _drop_repeated_header(normalize(body).split("\n"), headers)
+        lines = [
+            line for line in lines
+            if _is_new(line, seen, index, min_near_chars)
+        ]
+        body = _collapse_blank_lines(drop_empty_sections(lines))
+        compacted.append(f"{title}\n{body}" if body else title)
+
+    return CompactionResult(
+        compacted,
+        estimate_tokens("\n\n".join(reports)),
+        estimate_tokens("\n\n".join(compacted)),
+    )
+
+
+def normalize(text: str) -> str:
+    lines = []
+    for line in text.split("\n"):
+        line = LIST_MARKER.sub(r"\1-", line.rstrip())
+        line = MARKDOWN_LINK.sub(r"\1", line)
+        line = BARE_URL.sub(_shorten_url, line)
+        lines.append(INNER_SPACE.sub(" ", line))
+
+    return _collapse_blank_lines(lines)
+
+
+def drop_empty_sections(lines: List[str]) -> List[str]:
+    """
+    Removes headings with no content (nor non-empty subsections) before
+    the next heading of the same or a higher level.
+    """
+    kept = []
+    # Content below the current line is owned by headings of a level lower
+    # than ``covered``
+    covered = 0
+    for line in reversed(lines):
+        heading = HEADING.match(line)
+        if heading is None:
+            if line.strip():
+                covered = 7
+            kept.append(line)
+            continue
+
+        level = len(heading.group(1))
+        if covered > level:
+            kept.append(line)
+            covered = level
+
+    return kept[::-1]
+
+
+def _drop_repeated_header(lines: List[str], headers: Set[str]) -> List[str]:
+    """
+    Drops the heading opening the report when an earlier report opened
+    with the same one (e.g. a template title such as "# Daily Report").
+    """
+    if lines and HEADING.match(lines[0]):
+        if lines[0] in headers:
+            return lines[1:]
+        headers.add(lines[0])
+    return lines
+
+
+def _is_new(line, seen, index, min_near_chars) -> bool:
+    """
+    Tells whether ``line`` should be kept, recording it as seen.
+    """
+    if not line.strip() or HEADING.match(line):
+        return True
+
+    key = NON_WORD.sub(" ", line.lower()).strip()
+    if key in PLACEHOLDERS or key in seen:
+        return False
+    seen.add(key)
+
+    return len(key) < min_near_chars or index.add(key)
+
+
+def _shorten_url(match) -> str:
+    url = match.group(0)
+    if len(url) <= MAX_URL_CHARS:
+        return url
+
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if not segments:
+        return parts.netloc
+    return f"{parts.netloc}/.../{segments[-1]}"
+
+
+def _collapse_blank_lines(lines: List[str]) -> str:
+    collapsed = []
+    for line in lines:
+        if line or (collapsed and collapsed[-1]):
+            collapsed.append(line)
+    return "\n".join(collapsed).strip()
@@ -0,0 +1,103 @@
+import asyncio
+import hashlib
+import os
+from typing import Awaitable, Callable, Optional, Tuple
+
+from src.utils.cache import DiskCache, make_key
+from src.utils.ingest import IngestLimits, read_report
+
+
+class DigestStore:
+    """
+    Stores the short digest generated for each daily report.
+
+    A file is first looked up by path, mtime and size to find its content
+    hash without reading it; the digest itself is keyed on the content hash,
+    so a touched but unchanged file, or the same day seen from overlapping
+    ranges, never needs to be summarized again.
+
+    Reports are read within the per-file cap of ``limits``.
+    """
+
+    __slots__ = ["_cache", "_limits"]
+
+    def __init__(
+        self,
+        cache: Optional[DiskCache] = None,
+        limits: Optional[IngestLimits] = None,
+    ):
+        self._cache = cache
+        self._limits = limits or IngestLimits()
+
+    def get_or_create(
+        self,
+        report_path: str,
+        fingerprint: dict,
+        summarize: Callable[[str], str],
+    ) -> str:
+        """
+        Returns the digest of ``report_path``, calling ``summarize`` with the
+        report content only when no digest is stored for it yet.
+        """
+        digest_key, digest, content = self._lookup(report_path, fingerprint)
+        if digest is None:
+            digest = summarize(content)
+            self._store(digest_key, digest)
+
+        return digest
+
+    async def aget_or_create(
+        self,
+        report_path: str,
+        fingerprint: dict,
+        asummarize: Callable[[str], Awaitable[str]],
+    ) -> str:
+        """
+        Async counterpart of ``get_or_create``; disk access runs in a worker
+        thread and ``asummarize`` is awaited on the event loop.
+        """
+        digest_key, digest, content = await asyncio.to_thread(
+            self._lookup, report_path, fingerprint
+        )
+        if digest is None:
+            digest = await asummarize(content)
+            await asyncio.to_thread(self._store, digest_key, digest)
+
+        return digest
+
+    def _lookup(
+        self, report_path: str, fingerprint: dict
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Returns ``(digest_key, digest, content)``. ``digest`` is None on a
+        miss, in which case ``content`` holds the report text.
+        """
+        if self._cache is None:
+            return None, None, self._read(report_path)
+
+        stat = os.stat(report_path)
+        stat_key = make_key(
+            "stat", os.path.abspath(report_path), stat.st_mtime_ns,
+            stat.st_size, self._limits.max_file_bytes, self._limits.policy,
+        )
+
+        content = None
+        content_hash = self._cache.get(stat_key)
+        if content_hash is None:
+            content = self._read(report_path)
+            content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            self._cache.set(stat_key, content_hash)
+
+        digest_key = make_key("digest", fingerprint, content_hash)
+        digest = self._cache.get(digest_key)
+        if digest is None and content is None:
+            content = self._read(report_path)
+
+        return digest_key, digest, content
+
+    def _store(self, digest_key: Optional[str], digest: str):
+        if self._cache is not None:
+            self._cache.set(digest_key, digest)
+
+    def _read(self, report_path: str) -> str:
+        return read_report(report_path, self._limits)
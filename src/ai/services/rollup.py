@@ -0,0 +1,218 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional
+
+from src.ai.adapters.base import AIAdapter
+from src.ai.services.summarizer import WeeklySummarizer
+from src.utils.cache import DiskCache, make_key
+from src.utils.dates import (
+    SUBPERIODS,
+    period_of,
+    previous_period,
+    split_period,
+)
+from src.utils.metrics import Metrics
+from src.utils.render import SUMMARY_SCHEMA, Summary
+
+
+ROLLUP_PROMPT = """
+Abaixo estão os resumos {children} do período de {start} a {end}. Gere um
+resumo {adjective}, pequeno e simplificado:
+1. Principais entregas
+2. Resolução de bugs
+3. Features em andamento
+
+Junte os itens que se repetem entre os resumos e não adicione introduções
+nem conclusões.
+
+Resumos:
+{summaries}
+"""
+
+CHILDREN = {
+    "week": "semanais", "month": "mensais", "quarter": "trimestrais",
+}
+ADJECTIVES = {"month": "mensal", "quarter": "trimestral", "year": "anual"}
+
+
+class RollupNode:
+    """
+    A period of the rollup tree. ``key`` changes whenever a report below
+    the node, or a setting that influences its summary, changes.
+    """
+
+    __slots__ = ["period", "start_date", "end_date", "children", "key",
+                 "summary"]
+
+    def __init__(
+        self,
+        period: str,
+        start_date: datetime,
+        end_date: datetime,
+        children: List["RollupNode"],
+        key: str,
+    ):
+        self.period = period
+        self.start_date = start_date
+        self.end_date = end_date
+        self.children = children
+        self.key = key
+        self.summary: Optional[str] = None
+
+
+class RollupSummarizer:
+    """
+    Builds month, quarter and year summaries as a tree: weeks feed months,
+    months feed quarters and quarters feed the year.
+
+    Every node is persisted in ``cache`` under a key derived from its
+    children, so only the nodes above a changed report are generated
+    again. A yearly summary over cached nodes costs a single model call.
+    """
+
+    __slots__ = ["_summarizer", "_ai", "_cache", "concurrency", "metrics"]
+
+    def __init__(
+        self,
+        summarizer: WeeklySummarizer,
+        ai: AIAdapter,
+        cache: Optional[DiskCache] = None,
+        concurrency: int = 4,
+        metrics: Optional[Metrics] = None,
+    ):
+        self._summarizer = summarizer
+        self._ai = ai
+        self._cache = cache
+        self.concurrency = concurrency
+        self.metrics = metrics or Metrics()
+
+    def generate_rollup(
+        self, period: str, date: Optional[datetime] = None
+    ) -> RollupNode:
+        """
+        Summarizes the month, quarter or year containing ``date`` (the last
+        complete one by default). The summary is in ``summary`` of the
+        returned node, None when the period has no reports.
+        """
+        if date is None:
+            start_date, _ = previous_period(period, datetime.now())
+        else:
+            start_date, _ = period_of(period, date)
+
+        with self.metrics.stage("rollup"):
+            root = self.build_tree(period, start_date)
+            levels = self._pending(root)
+            for nodes in reversed(levels):
+                with ThreadPoolExecutor(
+                    max_workers=self.concurrency
+                ) as executor:
+                    list(executor.map(self._generate, nodes))
+
+        return root
+
+    def build_tree(self, period: str, start_date: datetime) -> RollupNode:
+        """
+        Builds the tree of the period starting at ``start_date``, keying
+        every node from file metadata only.
+        """
+        ranges = split_period(period, start_date)
+        subperiod = SUBPERIODS[period]
+
+        if subperiod == "week":
+            children = [
+                RollupNode(
+                    "week", start, end, [],
+                    self._summarizer.fingerprint(start, end)
+                    if self._summarizer.has_reports(start, end) else "",
+                )
+                for start, end in ranges
+            ]
+        else:
+            children = [
+                self.build_tree(subperiod, start) for start, _ in ranges
+            ]
+
+        key = make_key(
+            "rollup", period, ROLLUP_PROMPT, SUMMARY_SCHEMA,
+            self._ai.fingerprint(),
+            [child.key for child in children],
+        )
+        return RollupNode(
+            period, ranges[0][0], ranges[-1][1], children, key
+        )
+
+    def _pending(self, root: RollupNode) -> List[List[RollupNode]]:
+        """
+        Loads the stored nodes top-down and returns, level by level, the
+        ones that must be generated. Below a stored node nothing is loaded
+        or generated.
+        """
+        levels: List[List[RollupNode]] = []
+        nodes = [root]
+        while nodes:
+            pending = []
+            for node in nodes:
+                if not node.key:
+                    continue
+                stored = self._cache.get(node.key) if self._cache else None
+                if stored is None:
+                    pending.append(node)
+                else:
+                    node.summary = _load(stored)
+                    self.metrics.add("rollup_nodes_reused")
+            if pending:
+                levels.append(pending)
+            nodes = [child for node in pending for child in node.children]
+        return levels
+
+    def _generate(self, node: RollupNode):
+        if node.period == "week":
+            summary = self._summarizer.generate_weekly_summary(
+                node.start_date, node.end_date
+            ) or None
+        else:
+            summary = self._merge(node)
+
+        node.summary = summary
+        if summary:
+            self.metrics.add("rollup_nodes_generated")
+        if self._cache is not None:
+            # Empty periods are stored too, so they are not checked again
+            self._cache.set(node.key, _dump(summary))
+
+    def _merge(self, node: RollupNode) -> Optional[Summary]:
+        children = [child for child in node.children if child.summary]
+        if not children:
+            return None
+
+        prompt = ROLLUP_PROMPT.format(
+            children=CHILDREN[node.children[0].period],
+            start=node.start_date.strftime("%Y-%m-%d"),
+            end=node.end_date.strftime("%Y-%m-%d"),
+            adjective=ADJECTIVES[node.period],
+            summaries="\n\n".join(
+                f"## {_label(child)}\n{child.summary}" for child in children
+            ),
+        )
+        return Summary(self._ai.generate_structured(prompt, SUMMARY_SCHEMA))
+
+
+def _dump(summary: Optional[str]):
+    # Sections are stored as they are, so a reused node still renders to
+    # any output format
+    if summary is None:
+        return ""
+    return getattr(summary, "sections", None) or str(summary)
+
+
+def _load(stored) -> Optional[str]:
+    if isinstance(stored, dict):
+        return Summary(stored)
+    return stored or None
+
+
+def _label(node: RollupNode) -> str:
+    return (
+        f'{node.start_date.strftime("%Y-%m-%d")} a '
+        f'{node.end_date.strftime("%Y-%m-%d")}'
+    )
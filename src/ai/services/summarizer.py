@@ -1,57 +1,292 @@
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Sequence, Union
 
 from src.ai.adapters.base import AIAdapter
+from src.ai.services.chunking import chunk_reports, estimate_tokens
+from src.ai.services.compaction import compact_reports
+from src.ai.services.digests import DigestStore
 from src.config.settings import Config
+from src.utils.cache import make_key
+from src.utils.ingest import IngestLimits, Report, iter_reports
+from src.utils.metrics import Metrics
+from src.utils.render import SUMMARY_SCHEMA, Summary
+from src.utils.report_index import ReportIndex
+from src.utils.search import SearchIndex
+
+
+DIGEST_PROMPT = """
+Resuma o relatório diário abaixo em poucos tópicos curtos, mantendo
+apenas atividades, bugs resolvidos e features em andamento.
+Não adicione introduções nem conclusões.
+
+Relatório:
+{report}
+"""
+
+PARTIAL_PROMPT = """
+Os relatórios diários abaixo são parte de um período maior. Resuma-os em
+tópicos curtos separando atividades, bugs resolvidos e features em
+andamento. Não adicione introduções nem conclusões.
+
+Relatórios:
+{reports}
+"""
+
+
+TOPIC_PROMPT = """
+Os trechos abaixo foram extraídos dos relatórios diários por serem os mais
+relevantes para o tema "{topic}". Gere um resumo pequeno e simplificado
+do que foi feito sobre esse tema:
+1. Atividades
+2. Resolução de bugs
+3. Trabalhando em features
+
+Ignore o que não for sobre o tema. Não adicione introduções nem
+conclusões.
+
+Trechos:
+{reports}
+"""
+
+VARIANT_CONTEXT = """
+Relatórios diários do período, usados pelas instruções a seguir:
+
+{reports}
+"""
+
+
+class Variant(NamedTuple):
+    """An output generated from the reports of a range."""
+
+    name: str
+    prompt: str
+
+
+VARIANTS = {variant.name: variant for variant in (
+    Variant("resumo", """
+Com base nos relatórios acima, gere um resumo pequeno e simplificado:
+1. Atividades na semana
+2. Resolução de bugs
+3. Trabalhando em features
+
+Seja claro e direto, utilize pontos para destacar as principais
+informações importantes. Replique o formato de como eu falo nos
+relatórios.
+"""),
+    Variant("management", """
+Based on the reports above, write a short summary in English for
+management: main deliveries, bugs fixed, risks or blockers and next steps.
+Answer in English even though the reports are in Portuguese, avoid
+technical jargon and do not add an introduction or a conclusion.
+"""),
+    Variant("bugs", """
+Com base nos relatórios acima, liste apenas os bugs resolvidos ou
+investigados no período, um por linha, com a data do relatório entre
+parênteses. Não inclua outras atividades nem adicione introduções ou
+conclusões.
+"""),
+)}
+
+
+class VariantSummaries(NamedTuple):
+    """The outputs of each variant for a range, and the failed ones."""
+
+    start_date: datetime
+    end_date: datetime
+    summaries: Dict[str, str]
+    errors: Dict[str, Exception]
 
 
 class WeeklySummarizer:
 
-    __slots__ = ["reports_directory", "_ai"]
+    __slots__ = [
+        "reports_directory", "max_prompt_tokens", "compact", "limits",
+        "structured", "metrics", "_ai", "_digests", "_index", "_search",
+    ]
 
-    def __init__(self, reports_directory, ai: AIAdapter = None):
+    def __init__(
+        self,
+        reports_directory,
+        ai: AIAdapter = None,
+        digests: DigestStore = None,
+        max_prompt_tokens: int = None,
+        index: ReportIndex = None,
+        metrics: Metrics = None,
+        compact: bool = False,
+        limits: IngestLimits = None,
+        structured: bool = False,
+        search: SearchIndex = None,
+    ):
         self.reports_directory = reports_directory
+        self.compact = compact
+        self.limits = limits or IngestLimits()
+        self.structured = structured
+        self.metrics = metrics or Metrics()
+        self._index = index or ReportIndex(reports_directory)
+        self._search = search or SearchIndex(
+            self._index, limits=self.limits, metrics=self.metrics
+        )
+        self.max_prompt_tokens = max_prompt_tokens
         self._ai = ai
+        self._digests = digests
+
+    def _get_report_paths(self, start_date, end_date):
+        """
+        Lista os relatórios existentes no intervalo como pares
+        (nome do arquivo, caminho).
+        """
+        return self._index.lookup(start_date, end_date)
+
+    def has_reports(self, start_date, end_date):
+        return bool(self._get_report_paths(start_date, end_date))
+
+    def fingerprint(self, start_date, end_date):
+        """
+        Key of the summary of a range: it changes whenever a report of the
+        range is added, modified or removed, or a setting that influences
+        the output changes. Computed from file metadata only.
+        """
+        reports = []
+        for filename, path in self._get_report_paths(start_date, end_date):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            reports.append((filename, stat.st_mtime_ns, stat.st_size))
+
+        return make_key(
+            self._ai.fingerprint(), self._build_prompt(""),
+            self._digests is not None, self.max_prompt_tokens, self.compact,
+            self.limits, self.structured, reports,
+        )
 
     def _get_weekly_reports(self, start_date, end_date):
         """
         Coleta todos os relatórios de uma semana específica.
-        Formato dos arquivos: YYYY-MM-DD.md em uma única pasta.
+        Formato dos arquivos: YYYY-MM-DD.md, na pasta ou em subpastas
+        (ex.: YYYY/MM/YYYY-MM-DD.md).
         """
-        weekly_reports = []
+        return "\n\n".join(self._collect_reports(start_date, end_date))
 
-        date_range = [
-            start_date + timedelta(days=x)
-            for x in range((end_date - start_date).days + 1)
-        ]
+    def _iter_reports(self, start_date, end_date):
+        """
+        Yields the reports of the range as ``Report(date, path, chunks)``,
+        read lazily within the size caps in ``limits``.
+        """
+        return iter_reports(
+            self._get_report_paths(start_date, end_date),
+            self.limits, self.metrics,
+        )
+
+    def _collect_reports(self, start_date, end_date):
+        with self.metrics.stage("collect_reports"):
+            weekly_reports = [
+                self._read_report(report)
+                for report in self._iter_reports(start_date, end_date)
+            ]
+
+        return [r for r in weekly_reports if r is not None]
+
+    async def _acollect_reports(self, start_date, end_date):
+        """
+        Async counterpart of ``_collect_reports``; the files are read
+        concurrently in worker threads.
+        """
+        with self.metrics.stage("collect_reports"):
+            reports = await asyncio.to_thread(
+                lambda: list(self._iter_reports(start_date, end_date))
+            )
+            weekly_reports = await asyncio.gather(*(
+                asyncio.to_thread(self._read_report, report)
+                for report in reports
+            ))
+
+        return [r for r in weekly_reports if r is not None]
+
+    def _read_report(self, report: Report):
+        try:
+            content = "".join(report.chunks)
+        except Exception as e:
+            self.metrics.add("report_errors")
+            print(f"Erro ao ler {report.path}: {e}")
+            return None
 
-        for date in date_range:
-            report_filename = f"{date.strftime('%Y-%m-%d')}.md"
-            report_path = os.path.join(self.reports_directory, report_filename)
+        self.metrics.add("reports_read")
+        return f'{os.path.basename(report.path)}\n{content}'
 
+    def _collect_digests(self, start_date, end_date):
+        """
+        Map stage: returns the digest of every report in the range,
+        summarizing in parallel only the days without a stored digest.
+        """
+        report_paths = self._get_report_paths(start_date, end_date)
+        fingerprint = self._digest_fingerprint()
+
+        def digest(report):
+            report_filename, report_path = report
             try:
-                if os.path.exists(report_path):
-                    with open(report_path, "r", encoding="utf-8") as file:
-                        weekly_reports.append(
-                            f'{report_filename}\n{file.read()}'
-                        )
+                return f'{report_filename}\n' + self._digests.get_or_create(
+                    report_path, fingerprint, self._summarize_report
+                )
             except Exception as e:
-                print(f"Erro ao ler {report_path}: {e}")
+                print(f"Erro ao resumir {report_path}: {e}")
+                return None
 
-        return "\n\n".join(weekly_reports)
+        with self.metrics.stage("map_digests"), ThreadPoolExecutor(
+            max_workers=Config.MAP_WORKERS
+        ) as executor:
+            digests = list(executor.map(digest, report_paths))
 
-    def generate_weekly_summary(self, start_date=None, end_date=None):
+        return [d for d in digests if d]
+
+    async def _acollect_digests(self, start_date, end_date):
         """
-        Generates a summary of a week of reports.
+        Async counterpart of ``_collect_digests``, with at most
+        ``Config.MAP_WORKERS`` digests generated at a time.
         """
-        if not start_date:
-            start_date = self._get_last_week_start()
-        if not end_date:
-            end_date = self._get_last_week_end()
+        report_paths = await asyncio.to_thread(
+            self._get_report_paths, start_date, end_date
+        )
+        fingerprint = self._digest_fingerprint()
+        semaphore = asyncio.Semaphore(Config.MAP_WORKERS)
+
+        async def digest(report_filename, report_path):
+            async with semaphore:
+                try:
+                    return f'{report_filename}\n' + (
+                        await self._digests.aget_or_create(
+                            report_path, fingerprint,
+                            self._asummarize_report,
+                        )
+                    )
+                except Exception as e:
+                    print(f"Erro ao resumir {report_path}: {e}")
+                    return None
+
+        with self.metrics.stage("map_digests"):
+            digests = await asyncio.gather(*(
+                digest(report_filename, report_path)
+                for report_filename, report_path in report_paths
+            ))
+
+        return [d for d in digests if d]
+
+    def _digest_fingerprint(self):
+        return {"ai": self._ai.fingerprint(), "prompt": DIGEST_PROMPT}
 
-        weekly_content = self._get_weekly_reports(start_date, end_date)
+    def _summarize_report(self, report):
+        return self._ai.generate_content(DIGEST_PROMPT.format(report=report))
 
-        prompt = f"""
+    async def _asummarize_report(self, report):
+        return await self._ai.agenerate_content(
+            DIGEST_PROMPT.format(report=report)
+        )
+
+    def _build_prompt(self, weekly_content):
+        return f"""
         Analise os seguintes relatórios diários e gere um resumo
         pequeno e simplificado:
         1. Atividades na semana
@@ -66,10 +301,274 @@ class WeeklySummarizer:
         {weekly_content}
         """
 
+    def generate_weekly_summary(self, start_date=None, end_date=None):
+        """
+        Generates a summary of a week of reports.
+
+        When a ``DigestStore`` is configured the reports are first reduced
+        to per-day digests and the weekly summary is built from those.
+
+        With ``structured`` the model answers with JSON sections and a
+        ``Summary`` is returned, which renders to any output format.
+        """
+        return self._generate(self._prepare_prompt(start_date, end_date))
+
+    def generate_topic_summary(
+        self, topic, start_date=None, end_date=None, top_k=20
+    ):
+        """
+        Summarizes what the reports say about ``topic``. Only the ``top_k``
+        passages the search index ranks as most relevant go into the
+        prompt, so the cost does not grow with the range, which is
+        unbounded when no date is given. Returns None when no passage
+        matches.
+        """
+        with self.metrics.stage("search"):
+            passages = self._search.search(topic, top_k, start_date, end_date)
+        if not passages:
+            return None
+
+        # Chronological order, one block per report
+        days = {}
+        for passage in sorted(passages, key=lambda p: p.date):
+            days.setdefault(passage.date, []).append(passage.text)
+        contents = [
+            f"{date}\n" + "\n\n".join(texts) for date, texts in days.items()
+        ]
+
+        return self._generate(self._finish_prompt(
+            self._fit_to_budget(self._compact(contents)), topic
+        ))
+
+    def _generate(self, prompt):
+        with self.metrics.stage("generate"):
+            if self.structured:
+                return Summary(
+                    self._ai.generate_structured(prompt, SUMMARY_SCHEMA)
+                )
+            return self._ai.generate_content(prompt)
+
+    def stream_weekly_summary(self, start_date=None, end_date=None):
+        """
+        Same as ``generate_weekly_summary`` but yields the summary in chunks
+        as the model produces them.
+        """
+        prompt = self._prepare_prompt(start_date, end_date)
+        with self.metrics.stage("generate"):
+            yield from self._ai.stream_content(prompt)
+
+    def _prepare_prompt(self, start_date=None, end_date=None):
+        start_date, end_date = self._resolve_range(start_date, end_date)
+        return self._finish_prompt(
+            self._prepare_content(start_date, end_date)
+        )
+
+    def _prepare_content(self, start_date, end_date):
+        if self._digests is not None:
+            contents = self._collect_digests(start_date, end_date)
+        else:
+            contents = self._collect_reports(start_date, end_date)
+
+        return self._fit_to_budget(self._compact(contents))
+
+    def generate_variants(
+        self,
+        variants: Sequence[Union[str, Variant]],
+        start_date=None,
+        end_date=None,
+        concurrency: int = 4,
+    ) -> VariantSummaries:
+        """
+        Generates several outputs from the same range, e.g. the summary, a
+        version for management and a list of bugs. The reports are
+        collected and uploaded to the model once, as a cached context, and
+        every variant only sends its own prompt, ``concurrency`` at a time.
+        A variant that fails is reported through ``errors``.
+        """
+        start_date, end_date = self._resolve_range(start_date, end_date)
+        variants = [
+            VARIANTS[variant] if isinstance(variant, str) else variant
+            for variant in variants
+        ]
+
+        content = self._prepare_content(start_date, end_date)
+        if not content:
+            return VariantSummaries(start_date, end_date, {}, {})
+
+        with self.metrics.stage("context_upload"):
+            context = self._ai.create_context(
+                VARIANT_CONTEXT.format(reports=content)
+            )
+        try:
+            summaries, errors = self._generate_variants(
+                context, variants, concurrency
+            )
+        finally:
+            self._delete_context(context)
+
+        return VariantSummaries(start_date, end_date, summaries, errors)
+
+    def _generate_variants(self, context, variants: List[Variant],
+                           concurrency):
+        summaries = {}
+        errors = {}
+
+        with self.metrics.stage("generate"), ThreadPoolExecutor(
+            max_workers=concurrency
+        ) as executor:
+            futures = {
+                executor.submit(
+                    self._ai.generate_with_context, context, variant.prompt
+                ): variant.name
+                for variant in variants
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    summaries[name] = future.result()
+                except Exception as e:
+                    errors[name] = e
+
+        self.metrics.add("variants_generated", len(summaries))
+        return summaries, errors
+
+    def _delete_context(self, context):
+        # The context expires on its own, so a failure here is not fatal
+        try:
+            self._ai.delete_context(context)
+        except Exception as e:
+            print(f"Erro ao remover o contexto: {e}")
+
+    async def agenerate_weekly_summary(self, start_date=None, end_date=None):
+        """
+        Async counterpart of ``generate_weekly_summary``.
+        """
+        start_date, end_date = self._resolve_range(start_date, end_date)
+
+        if self._digests is not None:
+            contents = await self._acollect_digests(start_date, end_date)
+        else:
+            contents = await self._acollect_reports(start_date, end_date)
+
+        prompt = self._finish_prompt(
+            await self._afit_to_budget(self._compact(contents))
+        )
+        with self.metrics.stage("generate"):
+            if self.structured:
+                return Summary(await self._ai.agenerate_structured(
+                    prompt, SUMMARY_SCHEMA
+                ))
+            return await self._ai.agenerate_content(prompt)
+
+    def _resolve_range(self, start_date, end_date):
+        if not start_date:
+            start_date = self._get_last_week_start()
+        if not end_date:
+            end_date = self._get_last_week_end()
+        return start_date, end_date
+
+    def _finish_prompt(self, weekly_content, topic=None):
+        with self.metrics.stage("build_prompt"):
+            if topic is None:
+                prompt = self._build_prompt(weekly_content)
+            else:
+                prompt = TOPIC_PROMPT.format(
+                    topic=topic, reports=weekly_content
+                )
+        self.metrics.add("prompt_tokens_estimate", estimate_tokens(prompt))
+
         if Config.DEBUG:
             print("[DEBUG] PROMPT:\n\n" + prompt)
 
-        return self._ai.generate_content(prompt)
+        return prompt
+
+    def _compact(self, contents):
+        """
+        Strips boilerplate and lines repeated across the period when
+        ``compact`` is enabled, recording the token counts before and after.
+        """
+        if not self.compact:
+            return contents
+
+        with self.metrics.stage("compact"):
+            result = compact_reports(contents)
+
+        self.metrics.add("compaction_tokens_before", result.tokens_before)
+        self.metrics.add("compaction_tokens_after", result.tokens_after)
+        return result.reports
+
+    def _fit_to_budget(self, contents):
+        """
+        Hierarchical reduce: while the content exceeds
+        ``max_prompt_tokens``, it is split into chunks at day/section
+        boundaries, the chunks are summarized in parallel and the partial
+        summaries replace the content.
+        """
+        content = "\n\n".join(contents)
+
+        while self._over_budget(content):
+            chunks = self._chunk(contents)
+            with self.metrics.stage("reduce_chunks"), ThreadPoolExecutor(
+                max_workers=Config.MAP_WORKERS
+            ) as executor:
+                partials = list(executor.map(self._summarize_chunk, chunks))
+
+            contents, content = self._merge_partials(content, partials)
+            if len(chunks) == 1:
+                break
+
+        return content
+
+    async def _afit_to_budget(self, contents):
+        """
+        Async counterpart of ``_fit_to_budget``.
+        """
+        content = "\n\n".join(contents)
+        semaphore = asyncio.Semaphore(Config.MAP_WORKERS)
+
+        async def summarize(chunk):
+            async with semaphore:
+                return await self._ai.agenerate_content(
+                    PARTIAL_PROMPT.format(reports=chunk)
+                )
+
+        while self._over_budget(content):
+            chunks = self._chunk(contents)
+            with self.metrics.stage("reduce_chunks"):
+                partials = await asyncio.gather(*map(summarize, chunks))
+
+            contents, content = self._merge_partials(content, partials)
+            if len(chunks) == 1:
+                break
+
+        return content
+
+    def _over_budget(self, content):
+        return bool(self.max_prompt_tokens) and (
+            estimate_tokens(content) > self.max_prompt_tokens
+        )
+
+    def _chunk(self, contents):
+        budget = self.max_prompt_tokens - estimate_tokens(PARTIAL_PROMPT)
+        return chunk_reports(contents, max(budget, 1))
+
+    def _merge_partials(self, content, partials):
+        contents = [
+            f"Parte {i}\n{partial}"
+            for i, partial in enumerate(partials, start=1)
+        ]
+        merged = "\n\n".join(contents)
+
+        if len(merged) >= len(content):
+            raise ValueError(
+                "Partial summaries did not reduce the content size; "
+                "increase max_prompt_tokens"
+            )
+
+        return contents, merged
+
+    def _summarize_chunk(self, chunk):
+        return self._ai.generate_content(PARTIAL_PROMPT.format(reports=chunk))
 
     def _get_last_week_start(self):
         """
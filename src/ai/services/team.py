@@ -0,0 +1,174 @@
+import os
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from src.ai.adapters.base import AIAdapter
+from src.utils.dates import week_of
+from src.utils.metrics import Metrics
+from src.utils.render import SUMMARY_SCHEMA, Summary
+
+
+TEAM_PROMPT = """
+Abaixo estão os resumos semanais de cada pessoa da equipe. Gere um resumo
+da equipe, pequeno e simplificado:
+1. Principais entregas
+2. Resolução de bugs
+3. Features em andamento
+
+Indique entre parênteses quem trabalhou em cada item. Não adicione
+introduções nem conclusões.
+
+Resumos:
+{summaries}
+"""
+
+SummarizeAuthor = Callable[[str, datetime, datetime], Optional[str]]
+
+
+class TeamSummary(NamedTuple):
+    """Per-author summaries and the team summary built from them."""
+
+    start_date: datetime
+    end_date: datetime
+    authors: Dict[str, str]
+    summary: Optional[Summary]
+    errors: Dict[str, Exception]
+
+
+class TeamSummarizer:
+    """
+    Summarizes one report directory per author in parallel and then merges
+    the per-author summaries into a team summary.
+
+    ``summarize_author(reports_dir, start_date, end_date)`` produces a
+    single author summary. With the ``process`` executor it runs in worker
+    processes and must therefore be picklable (a module-level function or
+    a ``functools.partial`` of one), as must ``initializer``, called once in
+    each worker process.
+    """
+
+    __slots__ = ["_summarize_author", "_ai", "workers", "executor", "metrics",
+                 "_initializer"]
+
+    def __init__(
+        self,
+        summarize_author: SummarizeAuthor,
+        ai: AIAdapter,
+        workers: int = 4,
+        executor: str = "thread",
+        metrics: Optional[Metrics] = None,
+        initializer: Optional[Callable[[], None]] = None,
+    ):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}")
+
+        self._summarize_author = summarize_author
+        self._ai = ai
+        self.workers = workers
+        self.executor = executor
+        self.metrics = metrics or Metrics()
+        self._initializer = initializer
+
+    @staticmethod
+    def author_names(reports_dirs: List[str]) -> Dict[str, str]:
+        """
+        Names every directory after the shortest trailing part of its path
+        that no other directory shares, e.g. ``teamA_joao`` and
+        ``teamB_joao`` for two ``joao`` directories and just ``maria``
+        otherwise.
+        """
+        parts = {
+            reports_dir: os.path.abspath(reports_dir).strip(os.sep).split(
+                os.sep
+            )
+            for reports_dir in reports_dirs
+        }
+        names = {}
+        for reports_dir, path in parts.items():
+            others = [
+                other for key, other in parts.items() if key != reports_dir
+            ]
+            depth = 1
+            while depth < len(path) and any(
+                other[-depth:] == path[-depth:] for other in others
+            ):
+                depth += 1
+            names[reports_dir] = "_".join(path[-depth:])
+        return names
+
+    def _pool(self) -> Executor:
+        if self.executor == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.workers, initializer=self._initializer
+            )
+        return ThreadPoolExecutor(max_workers=self.workers)
+
+    def generate_team_summary(
+        self,
+        reports_dirs: List[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> TeamSummary:
+        """
+        Summarizes every author of ``reports_dirs`` between the two dates
+        (last week by default) and builds the team summary, a ``Summary``
+        that renders to any output format. An author that fails is
+        reported through ``errors`` and left out of the team summary.
+        """
+        if not start_date or not end_date:
+            last_week = week_of(datetime.now() - timedelta(days=7))
+            start_date = start_date or last_week[0]
+            end_date = end_date or last_week[1]
+
+        names = self.author_names(reports_dirs)
+        authors, errors = self._summarize_authors(
+            names, start_date, end_date
+        )
+
+        summary = None
+        if authors:
+            with self.metrics.stage("team_summary"):
+                summary = Summary(self._ai.generate_structured(
+                    self._build_prompt(names, authors), SUMMARY_SCHEMA
+                ))
+
+        return TeamSummary(start_date, end_date, authors, summary, errors)
+
+    def _summarize_authors(self, names, start_date, end_date):
+        authors = {}
+        errors = {}
+
+        with self.metrics.stage("author_summaries"), self._pool() as pool:
+            futures = {
+                pool.submit(
+                    self._summarize_author, reports_dir, start_date, end_date
+                ): author
+                for reports_dir, author in names.items()
+            }
+            for future in as_completed(futures):
+                author = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    errors[author] = e
+                    continue
+                if summary:
+                    authors[author] = summary
+
+        self.metrics.add("authors_summarized", len(authors))
+        return authors, errors
+
+    def _build_prompt(self, names, authors: Dict[str, str]) -> str:
+        # Keep the command line order, whatever order the authors finished
+        sections = [
+            f"## {author}\n{authors[author]}"
+            for author in names.values()
+            if author in authors
+        ]
+        return TEAM_PROMPT.format(summaries="\n\n".join(sections))
@@ -0,0 +1,65 @@
+import os
+from datetime import datetime
+from typing import Callable, Iterable, List
+
+from src.ai.services.batch import BatchResult, BatchSummarizer
+from src.ai.services.summarizer import WeeklySummarizer
+from src.utils.dates import DateRange, week_of
+from src.utils.watcher import wait_for_changes
+
+
+class WeekRefresher:
+    """
+    Regenerates the summary of every week touched by a report change.
+
+    Changes are debounced, so a burst of saves triggers a single refresh,
+    and only the affected weeks are summarized again. With a
+    ``DigestStore`` configured, unchanged days reuse their stored digest.
+    """
+
+    __slots__ = ["_batch", "_watcher", "_on_result", "debounce"]
+
+    def __init__(
+        self,
+        summarizer: WeeklySummarizer,
+        watcher,
+        on_result: Callable[[BatchResult], None],
+        debounce: float = 2.0,
+        concurrency: int = 4,
+    ):
+        self._batch = BatchSummarizer(summarizer, concurrency)
+        self._watcher = watcher
+        self._on_result = on_result
+        self.debounce = debounce
+
+    @staticmethod
+    def affected_weeks(paths: Iterable[str]) -> List[DateRange]:
+        weeks = {
+            week_of(datetime.strptime(os.path.basename(path)[:10], "%Y-%m-%d"))
+            for path in paths
+        }
+        return sorted(weeks)
+
+    def refresh(self, weeks: Iterable[DateRange]):
+        for result in self._batch.run(weeks):
+            self._on_result(result)
+
+    def run_once(self) -> List[DateRange]:
+        """
+        Waits for the next burst of changes and refreshes the weeks it
+        touched, returning them.
+        """
+        weeks = self.affected_weeks(
+            wait_for_changes(self._watcher, self.debounce)
+        )
+        self.refresh(weeks)
+        return weeks
+
+    def run(self, weeks: Iterable[DateRange] = ()):
+        """
+        Refreshes ``weeks`` and then every week that changes, until
+        interrupted.
+        """
+        self.refresh(weeks)
+        while True:
+            self.run_once()
@@ -1,10 +1,101 @@
 import os
-from dotenv import load_dotenv
+import threading
 
-load_dotenv()
 
+def _env(name, default=None, cast=None):
+    def resolve():
+        value = os.environ.get(name, default)
+        if cast is not None and value is not None:
+            return cast(value)
+        return value
+    return resolve
 
-class Config:
-    DEBUG: str = os.environ.get('DEBUG', False)
-    GEMINI_API_KEY: str = os.environ.get('GEMINI_API_KEY', None)
-    GEMINI_MODEL: str = os.environ.get('GEMINI_MODEL', 'gemini-1.5-flash')
+
+_SETTINGS = {
+    'DEBUG': _env('DEBUG', False),
+    'AI_PROVIDER': _env('AI_PROVIDER', 'gemini'),
+    'GEMINI_API_KEY': _env('GEMINI_API_KEY'),
+    'GEMINI_API_KEYS': _env('GEMINI_API_KEYS'),
+    'GEMINI_MODEL': _env('GEMINI_MODEL', 'gemini-1.5-flash'),
+    'GEMINI_TRANSPORT': _env('GEMINI_TRANSPORT'),
+    'GEMINI_API_ENDPOINT': _env('GEMINI_API_ENDPOINT'),
+    'GEMINI_CONTEXT_TTL': _env('GEMINI_CONTEXT_TTL', 600.0, float),
+    'GEMINI_CONTEXT_MIN_TOKENS': _env('GEMINI_CONTEXT_MIN_TOKENS', 32768, int),
+    'CACHE_DIR': _env(
+        'CACHE_DIR',
+        os.path.join(
+            os.path.expanduser('~'), '.cache', 'weekly-reports-summarizer'
+        ),
+    ),
+    'CACHE_MAX_MB': _env('CACHE_MAX_MB', 100, float),
+    'CACHE_MAX_AGE_DAYS': _env('CACHE_MAX_AGE_DAYS', 30, float),
+    'MAP_WORKERS': _env('MAP_WORKERS', 4, int),
+    'CHARS_PER_TOKEN': _env('CHARS_PER_TOKEN', 4, int),
+    'MAX_PROMPT_TOKENS': _env('MAX_PROMPT_TOKENS', 30000, int),
+    'MAX_REPORT_KB': _env('MAX_REPORT_KB', 512, int),
+    'MAX_RANGE_KB': _env('MAX_RANGE_KB', 4096, int),
+    'TRUNCATE_POLICY': _env('TRUNCATE_POLICY', 'head_tail'),
+    'SEARCH_TOP_K': _env('SEARCH_TOP_K', 20, int),
+    'JOB_MAX_ATTEMPTS': _env('JOB_MAX_ATTEMPTS', 5, int),
+    'JOB_RETRY_DELAY': _env('JOB_RETRY_DELAY', 60.0, float),
+    'JOB_LEASE': _env('JOB_LEASE', 900.0, float),
+    'WATCH_DEBOUNCE': _env('WATCH_DEBOUNCE', 2.0, float),
+    'WATCH_INTERVAL': _env('WATCH_INTERVAL', 1.0, float),
+    'GEMINI_RPM': _env('GEMINI_RPM', 15, float),
+    'GEMINI_TPM': _env('GEMINI_TPM', 1000000, float),
+    'MAX_RETRIES': _env('MAX_RETRIES', 5, int),
+    'RETRY_BASE_DELAY': _env('RETRY_BASE_DELAY', 1.0, float),
+    'RETRY_MAX_DELAY': _env('RETRY_MAX_DELAY', 60.0, float),
+    'CIRCUIT_BREAKER_THRESHOLD': _env('CIRCUIT_BREAKER_THRESHOLD', 5, int),
+    'CIRCUIT_BREAKER_RESET': _env('CIRCUIT_BREAKER_RESET', 30.0, float),
+    'OPENAI_API_KEY': _env('OPENAI_API_KEY'),
+    'OPENAI_BASE_URL': _env('OPENAI_BASE_URL', 'http://localhost:11434/v1'),
+    'OPENAI_MODEL': _env('OPENAI_MODEL', 'llama3'),
+    'HEDGE_BACKENDS': _env(
+        'HEDGE_BACKENDS', 'gemini:gemini-1.5-flash,gemini:gemini-1.5-flash-8b'
+    ),
+    'HEDGE_DELAY': _env('HEDGE_DELAY', 5.0, float),
+    'ROUTING_TIERS': _env(
+        'ROUTING_TIERS',
+        'gemini:gemini-1.5-flash-8b@8000,gemini:gemini-1.5-flash',
+    ),
+    'LATENCY_TARGET': _env('LATENCY_TARGET', None, float),
+}
+
+_env_lock = threading.Lock()
+_env_loaded = False
+
+
+def _load_env():
+    global _env_loaded
+    with _env_lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
+
+class _LazyConfig(type):
+    """
+    Resolves each setting from the environment (and ``.env``) on first
+    access and keeps it on the class, so importing the config is free.
+    """
+
+    def __getattr__(cls, name):
+        if name not in _SETTINGS:
+            raise AttributeError(f"Config has no setting {name!r}")
+
+        _load_env()
+        value = _SETTINGS[name]()
+        setattr(cls, name, value)
+        return value
+
+    def __dir__(cls):
+        return sorted(set(super().__dir__()) | set(_SETTINGS))
+
+
+class Config(metaclass=_LazyConfig):
+    """
+    Application settings. See ``_SETTINGS`` for the environment variables
+    and their defaults.
+    """
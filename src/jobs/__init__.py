@@ -0,0 +1,12 @@
+from src.jobs.queue import Job, JobQueue, JobSpec, JobStats
+from src.jobs.worker import run_workers, work
+
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "JobSpec",
+    "JobStats",
+    "run_workers",
+    "work",
+]
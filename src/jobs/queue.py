@@ -0,0 +1,307 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    reports_dir TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    formats TEXT NOT NULL,
+    output_dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    claimed_by TEXT,
+    claimed_at REAL,
+    started_at REAL,
+    finished_at REAL,
+    seconds REAL,
+    outputs TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    UNIQUE (reports_dir, start_date, end_date, formats, output_dir, name)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, not_before);
+"""
+
+STATUSES = ("pending", "running", "done", "failed")
+
+
+class JobSpec(NamedTuple):
+    """What to summarize and where to write it."""
+
+    reports_dir: str
+    start_date: str
+    end_date: str
+    formats: str
+    output_dir: str
+    name: str
+
+
+class Job(NamedTuple):
+    """A claimed job and the worker holding its lease."""
+
+    id: int
+    spec: JobSpec
+    attempts: int
+    worker: str
+
+
+class JobStats(NamedTuple):
+    """Progress of the queue."""
+
+    counts: Dict[str, int]
+    throughput: Optional[float]
+    average_seconds: Optional[float]
+    eta_seconds: Optional[float]
+    next_retry: Optional[float]
+    errors: List[str]
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+class JobQueue:
+    """
+    SQLite backed queue of summary jobs, shared by worker processes.
+
+    A job is claimed with a lease, renewed by its worker while it runs: if
+    the worker dies, the job can be claimed again once ``lease`` seconds
+    have passed without a renewal. Only the worker holding the lease can
+    complete or fail the job. Failed jobs go back to the queue with an
+    exponential delay until ``max_attempts`` is reached. Enqueuing is
+    idempotent, so re-running a backfill only adds the jobs that are
+    missing.
+    """
+
+    __slots__ = ["path", "lease", "max_attempts", "retry_delay"]
+
+    def __init__(
+        self,
+        path: str,
+        lease: float = 900.0,
+        max_attempts: int = 5,
+        retry_delay: float = 60.0,
+    ):
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        # With WAL, a crash may lose the last commits but never corrupts
+        # the queue, and commits skip the fsync
+        db.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, so two workers can never
+        # claim the same job
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def enqueue(self, specs: Iterable[JobSpec]) -> int:
+        """
+        Adds the jobs not queued yet and returns how many were added.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO jobs (reports_dir, start_date, "
+                "end_date, formats, output_dir, name, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [tuple(spec) + (now,) for spec in specs],
+            )
+            return db.total_changes - before
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """
+        Claims the oldest job ready to run, or one whose lease expired. A
+        job whose worker died on its last attempt is marked as failed
+        instead, so a job killing its workers is not retried forever.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, "
+                "finished_at = ? WHERE status = 'running' AND "
+                "claimed_at < ? AND attempts >= ?",
+                (
+                    "LeaseExpired: the worker stopped during the last "
+                    "attempt", now, now - self.lease, self.max_attempts,
+                ),
+            )
+            row = db.execute(
+                "SELECT id FROM jobs WHERE (status = 'pending' AND "
+                "not_before <= ?) OR (status = 'running' AND claimed_at < ?) "
+                "ORDER BY id LIMIT 1",
+                (now, now - self.lease),
+            ).fetchone()
+            if row is None:
+                return None
+
+            db.execute(
+                "UPDATE jobs SET status = 'running', claimed_by = ?, "
+                "claimed_at = ?, started_at = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (worker, now, now, row[0]),
+            )
+            job = db.execute(
+                "SELECT id, reports_dir, start_date, end_date, formats, "
+                "output_dir, name, attempts FROM jobs WHERE id = ?",
+                (row[0],),
+            ).fetchone()
+
+        return Job(job[0], JobSpec(*job[1:7]), job[7], worker)
+
+    def _update_owned(self, job: Job, assignments: str, params=()) -> bool:
+        """
+        Updates a job only while ``job.worker`` still holds its lease, and
+        returns whether it did.
+        """
+        with self._transaction() as db:
+            return db.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND "
+                "status = 'running' AND claimed_by = ?",
+                (*params, job.id, job.worker),
+            ).rowcount == 1
+
+    def renew(self, job: Job) -> bool:
+        """
+        Extends the lease of a running job; False when it was lost.
+        """
+        return self._update_owned(job, "claimed_at = ?", (time.time(),))
+
+    def complete(self, job: Job, outputs: List[str]) -> bool:
+        """
+        Checkpoints a finished job with the files it wrote. Returns False,
+        changing nothing, when the lease was lost to another worker.
+        """
+        now = time.time()
+        return self._update_owned(
+            job,
+            "status = 'done', finished_at = ?, seconds = ? - started_at, "
+            "outputs = ?, error = NULL",
+            (now, now, "\n".join(outputs)),
+        )
+
+    def fail(self, job: Job, error: BaseException) -> bool:
+        """
+        Schedules a retry after an exponential delay, or marks the job as
+        failed once it ran out of attempts. Returns False, changing
+        nothing, when the lease was lost to another worker.
+        """
+        now = time.time()
+        retry = job.attempts < self.max_attempts
+        return self._update_owned(
+            job,
+            "status = ?, not_before = ?, error = ?, finished_at = ?",
+            (
+                "pending" if retry else "failed",
+                now + self.retry_delay * 2 ** (job.attempts - 1),
+                f"{type(error).__name__}: {error}", now,
+            ),
+        )
+
+    def release(self, job: Job) -> bool:
+        """
+        Puts an interrupted job back in the queue without counting the
+        attempt.
+        """
+        return self._update_owned(
+            job,
+            "status = 'pending', claimed_by = NULL, attempts = attempts - 1",
+        )
+
+    def retry_failed(self) -> int:
+        """
+        Gives the failed jobs a new round of attempts.
+        """
+        with self._transaction() as db:
+            return db.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, "
+                "not_before = 0 WHERE status = 'failed'"
+            ).rowcount
+
+    def next_retry(self) -> Optional[float]:
+        """
+        Seconds until the next delayed job is ready, 0 if one is ready
+        now, or None when nothing is left to run.
+        """
+        now = time.time()
+        with self._connect() as db:
+            pending = db.execute(
+                "SELECT MIN(not_before) FROM jobs WHERE status = 'pending'"
+            ).fetchone()[0]
+            running = db.execute(
+                "SELECT MIN(claimed_at) FROM jobs WHERE status = 'running'"
+            ).fetchone()[0]
+
+        ready = [
+            max(0.0, at - now) for at in (
+                pending, None if running is None else running + self.lease
+            )
+            if at is not None
+        ]
+        return min(ready) if ready else None
+
+    def stats(self, window: float = 3600.0) -> JobStats:
+        """
+        Job counts by status, throughput (jobs per minute over the last
+        ``window`` seconds) and the estimated time to finish.
+        """
+        now = time.time()
+        with self._connect() as db:
+            counts = dict.fromkeys(STATUSES, 0)
+            counts.update(db.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall())
+            done, first, average = db.execute(
+                "SELECT COUNT(*), MIN(started_at), AVG(seconds) FROM jobs "
+                "WHERE status = 'done' AND finished_at >= ?",
+                (now - window,),
+            ).fetchone()
+            next_retry = db.execute(
+                "SELECT MIN(not_before) FROM jobs WHERE status = 'pending' "
+                "AND not_before > ?", (now,)
+            ).fetchone()[0]
+            errors = [row[0] for row in db.execute(
+                "SELECT name || ': ' || error FROM jobs WHERE error IS NOT "
+                "NULL AND status != 'done' ORDER BY id LIMIT 5"
+            )]
+
+        throughput = None
+        eta = None
+        if done and now > first:
+            throughput = done / (now - first) * 60
+            eta = (counts["pending"] + counts["running"]) / throughput * 60
+
+        return JobStats(
+            counts, throughput, average, eta,
+            None if next_retry is None else next_retry - now, errors,
+        )
@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import Process
+from typing import Callable, List
+
+from src.jobs.queue import Job, JobQueue, JobSpec
+
+
+Runner = Callable[[JobSpec], List[str]]
+
+
+@contextmanager
+def heartbeat(queue: JobQueue, job: Job):
+    """
+    Renews the lease of ``job`` a few times per lease period while the
+    block runs, so a long job is not claimed by another worker.
+    """
+    stop = threading.Event()
+
+    def renew():
+        while not stop.wait(queue.lease / 3):
+            if not queue.renew(job):
+                return
+
+    thread = threading.Thread(target=renew, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def work(
+    queue: JobQueue,
+    make_runner: Callable[[], Runner],
+    worker: str,
+    poll: float = 5.0,
+) -> int:
+    """
+    Claims and runs jobs until none is left, checkpointing each one, and
+    returns how many were completed. ``make_runner`` is called once, in
+    the worker process, to build what runs a job (and its AI client).
+
+    While other workers still hold jobs or retries are scheduled, the
+    worker keeps polling, so jobs whose worker died are picked up again.
+    """
+    run = make_runner()
+    completed = 0
+
+    while True:
+        job = queue.claim(worker)
+        if job is None:
+            wait = queue.next_retry()
+            if wait is None:
+                return completed
+            time.sleep(min(max(wait, 0.1), poll))
+            continue
+
+        try:
+            with heartbeat(queue, job):
+                outputs = run(job.spec)
+        except KeyboardInterrupt:
+            queue.release(job)
+            raise
+        except Exception as e:
+            if not queue.fail(job, e):
+                print(f"[i] {job.spec.name}: job assumido por outro worker")
+            else:
+                print(f"[-] {job.spec.name} ({job.attempts}ª tentativa): {e}")
+            continue
+
+        if not queue.complete(job, outputs):
+            print(f"[i] {job.spec.name}: job assumido por outro worker")
+            continue
+        completed += 1
+        print(f"[+] {job.spec.name}: {', '.join(outputs) or 'sem relatórios'}")
+
+
+def run_workers(
+    queue: JobQueue,
+    make_runner: Callable[[], Runner],
+    workers: int = 1,
+    poll: float = 5.0,
+):
+    """
+    Runs ``workers`` worker processes (or the worker inline when there is
+    only one) until the queue is drained. Each process builds its own
+    runner, so nothing but the queue file is shared.
+    """
+    if workers == 1:
+        work(queue, make_runner, f"{os.getpid()}-0", poll)
+        return
+
+    processes = [
+        Process(
+            target=work,
+            args=(queue, make_runner, f"{os.getpid()}-{index}", poll),
+        )
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Children got the signal too and release their jobs
+        for process in processes:
+            process.join()
+        raise
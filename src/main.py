@@ -1,40 +1,645 @@
+import cProfile
+import functools
 import os
+import pstats
+import sys
 from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
 
-from src.ai.adapters import GeminiAdapter
-from src.ai.services import WeeklySummarizer
-from src.utils.args_handler import ArgumentParser
+from src.ai.adapters import AIAdapter, CachedAdapter, LazyAdapter
+from src.ai.services import (
+    BatchResult,
+    BatchSummarizer,
+    DigestStore,
+    RollupSummarizer,
+    TeamSummarizer,
+    WeekRefresher,
+    WeeklySummarizer,
+)
+from src.config.settings import Config
+from src.jobs import JobQueue, JobSpec, JobStats, run_workers
+from src.utils.args_handler import Args, ArgumentParser
+from src.utils.cache import DiskCache, make_key
+from src.utils.dates import week_of
+from src.utils.files import atomic_open, atomic_write
+from src.utils.ingest import IngestLimits
+from src.utils.metrics import Metrics
+from src.utils.render import render
+from src.utils.report_index import ReportIndex
+from src.utils.search import SearchIndex, tokenize
+from src.utils.watcher import create_watcher
 
 
-def main():
-    args_parser = ArgumentParser()
-    args = args_parser.parse()
+def build_cache(args: Args, name: str) -> DiskCache:
+    """
+    Creates the on-disk cache ``name`` under the configured cache directory.
+    """
+    cache_max_mb = args.cache_max_mb or Config.CACHE_MAX_MB
+    return DiskCache(
+        os.path.join(args.cache_dir or Config.CACHE_DIR, name),
+        max_bytes=int(cache_max_mb * 1024 * 1024),
+        max_age=Config.CACHE_MAX_AGE_DAYS * 24 * 60 * 60,
+    )
+
 
-    ai = GeminiAdapter(
+def build_ai(args: Args) -> AIAdapter:
+    """
+    Creates the AI adapter, wrapped with the response cache unless
+    disabled through ``--no-cache``.
+    """
+    options = {}
+    if args.latency_target is not None:
+        options["latency_target"] = args.latency_target
+
+    ai = LazyAdapter(
+        args.provider or Config.AI_PROVIDER,
         system_instruction=(
             "You are a helpful assistant that summarizes weekly reports "
             "in Portuguese."
+        ),
+        **options,
+    )
+
+    if not args.cache:
+        return ai
+
+    return CachedAdapter(ai, build_cache(args, "responses"))
+
+
+def build_limits(args: Args) -> IngestLimits:
+    """
+    Size caps for reading reports, from the command line or ``Config``.
+    """
+    def kilobytes(value, default):
+        return (default if value is None else value) * 1024
+
+    return IngestLimits(
+        max_file_bytes=kilobytes(args.max_report_kb, Config.MAX_REPORT_KB),
+        max_range_bytes=kilobytes(args.max_range_kb, Config.MAX_RANGE_KB),
+        policy=args.truncate or Config.TRUNCATE_POLICY,
+    )
+
+
+def build_summarizer(
+    args: Args, ai: AIAdapter, metrics: Optional[Metrics] = None
+) -> WeeklySummarizer:
+    limits = build_limits(args)
+    digests = None
+    if args.map_reduce:
+        digests = DigestStore(
+            build_cache(args, "digests") if args.cache else None,
+            limits=limits,
+        )
+
+    max_prompt_tokens = args.max_prompt_tokens
+    if max_prompt_tokens is None:
+        max_prompt_tokens = Config.MAX_PROMPT_TOKENS
+
+    index = None
+    search = None
+    if args.cache:
+        cache_dir = args.cache_dir or Config.CACHE_DIR
+        cache_name = f"{make_key(os.path.abspath(args.reports_dir))}.json"
+        index = ReportIndex(
+            args.reports_dir,
+            cache_path=os.path.join(cache_dir, "index", cache_name),
+        )
+        search = SearchIndex(
+            index,
+            cache_path=os.path.join(cache_dir, "search", cache_name),
+            limits=limits,
+            metrics=metrics,
+        )
+
+    return WeeklySummarizer(
+        args.reports_dir, ai,
+        digests=digests,
+        max_prompt_tokens=max_prompt_tokens,
+        index=index,
+        metrics=metrics,
+        compact=args.compact,
+        limits=limits,
+        structured=not args.stream,
+        search=search,
+    )
+
+
+def output_path(args: Args, name: str, format: str = None) -> str:
+    return os.path.join(
+        args.output_dir, f'resumo_semanal_{name}.{format or args.format}'
+    )
+
+
+def write_summary(args: Args, summary: str, name: str) -> List[str]:
+    """
+    Renders ``summary`` to every requested format, atomically writing each
+    one to ``resumo_semanal_<name>`` in the output directory, and returns
+    the file paths.
+    """
+    output_files = []
+    for format in args.formats or [args.format]:
+        output_file = output_path(args, name, format)
+        atomic_write(
+            output_file, render(summary, format, f"Resumo semanal {name}")
         )
+        output_files.append(output_file)
+
+    return output_files
+
+
+def stream_summary(args: Args, chunks: Iterable[str], name: str) -> str:
+    """
+    Writes each chunk to stdout as soon as it arrives and returns the file
+    path. The file only replaces the previous summary once the stream is
+    complete, so an interrupted stream never leaves a truncated summary.
+    """
+    output_file = output_path(args, name)
+    with atomic_open(output_file) as f:
+        for chunk in chunks:
+            f.write(chunk)
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+
+    sys.stdout.write("\n")
+    return output_file
+
+
+def run_batch(args: Args, summarizer: WeeklySummarizer):
+    """
+    Summarizes every range in ``args.ranges`` concurrently, writing one
+    output file per range.
+    """
+    batch = BatchSummarizer(summarizer, concurrency=args.concurrency)
+
+    for result in batch.run(args.ranges):
+        write_result(args, result)
+
+
+def write_result(args: Args, result: BatchResult):
+    """
+    Writes the summary of a range to ``resumo_semanal_<start>_<end>``, or
+    reports its error.
+    """
+    name = (
+        f'{result.start_date.strftime("%Y-%m-%d")}_'
+        f'{result.end_date.strftime("%Y-%m-%d")}'
+    )
+    if result.error:
+        print(f"[-] Erro ao gerar resumo {name}: {result.error}")
+    elif result.summary:
+        output_files = write_summary(args, result.summary, name)
+        print(f"[+] Resumo semanal gerado em {', '.join(output_files)}")
+
+
+def watch(args: Args, summarizer: WeeklySummarizer):
+    """
+    Generates the current week summary and then keeps the summary of every
+    week whose reports change up to date, until interrupted.
+    """
+    watcher = create_watcher(args.reports_dir, Config.WATCH_INTERVAL)
+    refresher = WeekRefresher(
+        summarizer, watcher,
+        lambda result: write_result(args, result),
+        debounce=Config.WATCH_DEBOUNCE,
+        concurrency=args.concurrency,
+    )
+
+    print(
+        f"[i] Observando {args.reports_dir} "
+        f"({type(watcher).__name__}), Ctrl+C para sair"
+    )
+    try:
+        refresher.run([week_of(datetime.now())])
+    except KeyboardInterrupt:
+        print("[i] Observação encerrada.")
+    finally:
+        watcher.close()
+
+
+def share_rate_limits(workers: int):
+    """
+    Splits the client-side rate limits between ``workers`` processes. Each
+    process has its own limiter, so together they would otherwise send
+    ``workers`` times the configured requests and tokens per minute.
+    """
+    Config.GEMINI_RPM = Config.GEMINI_RPM / workers
+    Config.GEMINI_TPM = Config.GEMINI_TPM / workers
+
+
+# The adapter of a process executor worker, built by init_author_process
+_process_ai: Optional[AIAdapter] = None
+
+
+def init_author_process(args: Args):
+    """
+    Runs once in each process of the process executor: takes its share of
+    the rate limits and builds the adapter every author it runs reuses.
+    """
+    global _process_ai
+    share_rate_limits(args.workers)
+    _process_ai = build_ai(args)
+
+
+def summarize_author(
+    args: Args, reports_dir: str, start_date: datetime, end_date: datetime
+) -> Optional[str]:
+    """
+    Summarizes a single author with the adapter of the worker process; used
+    by the process executor, where nothing can be shared with the parent
+    process.
+    """
+    summarizer = build_summarizer(
+        args._replace(reports_dir=reports_dir), _process_ai
     )
-    summarizer = WeeklySummarizer(args.reports_dir, ai)
+    return summarizer.generate_weekly_summary(start_date, end_date)
+
+
+def run_team(args: Args, ai: AIAdapter, metrics: Metrics):
+    """
+    Summarizes every directory in ``args.reports_dirs`` in parallel and
+    writes one summary per author plus the team summary.
+    """
+    initializer = None
+    if args.executor == "process":
+        summarize_one = functools.partial(summarize_author, args)
+        initializer = functools.partial(init_author_process, args)
+    else:
+        def summarize_one(reports_dir, start_date, end_date):
+            summarizer = build_summarizer(
+                args._replace(reports_dir=reports_dir), ai, metrics
+            )
+            return summarizer.generate_weekly_summary(start_date, end_date)
 
-    weekly_summary = summarizer.generate_weekly_summary(
-        args.start_date, args.end_date
+    team = TeamSummarizer(
+        summarize_one, ai,
+        workers=args.workers,
+        executor=args.executor,
+        metrics=metrics,
+        initializer=initializer,
     )
+    result = team.generate_team_summary(
+        args.reports_dirs, args.start_date, args.end_date
+    )
+
+    date = datetime.now().strftime("%Y-%m-%d")
+    for author, error in sorted(result.errors.items()):
+        print(f"[-] Erro ao gerar resumo de {author}: {error}")
+    with metrics.stage("write_output"):
+        for author, summary in sorted(result.authors.items()):
+            write_summary(args, summary, f"{author}_{date}")
+        if result.summary:
+            output_files = write_summary(
+                args, result.summary, f"equipe_{date}"
+            )
+            print(f"[+] Resumo da equipe gerado em {', '.join(output_files)}")
+
 
-    if weekly_summary:
-        file_extension = args.format
+def summarize_topic(args: Args, summarizer: WeeklySummarizer):
+    """
+    Summarizes the passages most relevant to ``args.topic`` and writes
+    them to ``resumo_semanal_tema_<topic>_<date>``.
+    """
+    summary = summarizer.generate_topic_summary(
+        args.topic, args.start_date, args.end_date,
+        top_k=args.top_k or Config.SEARCH_TOP_K,
+    )
+    if not summary:
+        print(f"[-] Nenhum relatório menciona o tema {args.topic!r}")
+        return
 
-        output_file = os.path.join(
-            args.output_dir,
-            'resumo_semanal_'
-            f'{datetime.now().strftime("%Y-%m-%d")}'
-            f'.{file_extension}'
+    slug = "-".join(tokenize(args.topic)) or "tema"
+    with summarizer.metrics.stage("write_output"):
+        output_files = write_summary(
+            args, summary,
+            f"tema_{slug}_{datetime.now().strftime('%Y-%m-%d')}",
         )
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(weekly_summary)
+    print(f"[+] Resumo do tema gerado em {', '.join(output_files)}")
+
+
+def summarize_variants(args: Args, summarizer: WeeklySummarizer):
+    """
+    Generates every variant in ``args.variants`` from a single upload of
+    the reports and writes ``resumo_semanal_<variant>_<date>`` for each.
+    """
+    result = summarizer.generate_variants(
+        args.variants, args.start_date, args.end_date,
+        concurrency=args.concurrency,
+    )
+    if not result.summaries and not result.errors:
+        print("[-] Nenhum relatório encontrado para o período")
+        return
+
+    date = datetime.now().strftime("%Y-%m-%d")
+    for variant, error in sorted(result.errors.items()):
+        print(f"[-] Erro ao gerar a variante {variant}: {error}")
+    with summarizer.metrics.stage("write_output"):
+        for variant in args.variants:
+            summary = result.summaries.get(variant)
+            if summary:
+                output_files = write_summary(
+                    args, summary, f"{variant}_{date}"
+                )
+                print(
+                    f"[+] Variante {variant} gerada em "
+                    f"{', '.join(output_files)}"
+                )
+
+
+def run_rollup(args: Args, ai: AIAdapter, metrics: Metrics):
+    """
+    Summarizes the month, quarter or year in ``args.period`` from its
+    stored sub period summaries and writes
+    ``resumo_semanal_<period>_<start>_<end>``.
+
+    The nodes are the history the next rollups are built from, so they are
+    kept in their own store, without the cache size and age limits and
+    even with ``--no-cache``.
+    """
+    rollup = RollupSummarizer(
+        build_summarizer(args, ai, metrics), ai,
+        cache=DiskCache(
+            os.path.join(args.cache_dir or Config.CACHE_DIR, "rollups")
+        ),
+        concurrency=args.concurrency,
+        metrics=metrics,
+    )
+    root = rollup.generate_rollup(args.period, args.end_date)
+
+    counters = metrics.snapshot()["counters"]
+    print(
+        f"[i] Períodos reaproveitados: "
+        f"{counters.get('rollup_nodes_reused', 0):.0f}, "
+        f"gerados: {counters.get('rollup_nodes_generated', 0):.0f}"
+    )
+
+    name = (
+        f'{args.period}_{root.start_date.strftime("%Y-%m-%d")}_'
+        f'{root.end_date.strftime("%Y-%m-%d")}'
+    )
+    if not root.summary:
+        print(f"[-] Nenhum relatório encontrado para {name}")
+        return
+
+    with metrics.stage("write_output"):
+        output_files = write_summary(args, root.summary, name)
+    print(f"[+] Resumo do período gerado em {', '.join(output_files)}")
+
 
+def summarize(args: Args, summarizer: WeeklySummarizer):
+    """
+    Generates the summary (or every summary, in batch mode) and writes the
+    output files.
+    """
+    metrics = summarizer.metrics
+
+    if args.watch:
+        watch(args, summarizer)
+    elif args.topic is not None:
+        summarize_topic(args, summarizer)
+    elif args.variants is not None:
+        summarize_variants(args, summarizer)
+    elif args.ranges is not None:
+        run_batch(args, summarizer)
+    elif args.stream:
+        with metrics.stage("write_output"):
+            output_file = stream_summary(
+                args,
+                summarizer.stream_weekly_summary(
+                    args.start_date, args.end_date
+                ),
+                datetime.now().strftime("%Y-%m-%d"),
+            )
         print(f"[+] Resumo semanal gerado em {output_file}")
+    else:
+        weekly_summary = summarizer.generate_weekly_summary(
+            args.start_date, args.end_date
+        )
+
+        if weekly_summary:
+            with metrics.stage("write_output"):
+                output_files = write_summary(
+                    args, weekly_summary, datetime.now().strftime("%Y-%m-%d")
+                )
+            print(f"[+] Resumo semanal gerado em {', '.join(output_files)}")
+
+
+def report(args: Args, metrics: Metrics, profiler=None):
+    """
+    Emits the run metrics and the profiling report, when requested.
+    """
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"[i] Perfil salvo em {args.profile}")
+        if args.verbose:
+            stats = pstats.Stats(profiler)
+            stats.sort_stats("cumulative").print_stats(20)
+
+    if args.metrics_file:
+        metrics.write(args.metrics_file)
+        print(f"[i] Métricas salvas em {args.metrics_file}")
+
+    if args.verbose:
+        snapshot = metrics.snapshot()
+        for name, stage in sorted(snapshot["stages"].items()):
+            print(f"[i] {name}: {stage['seconds']:.3f}s ({stage['calls']}x)")
+
+        counters = snapshot["counters"]
+        if "compaction_tokens_before" in counters:
+            print(
+                "[i] Compactação: "
+                f"{counters['compaction_tokens_before']:.0f} -> "
+                f"{counters['compaction_tokens_after']:.0f} tokens"
+            )
+
+
+def build_queue(args: Args) -> JobQueue:
+    return JobQueue(
+        args.queue or os.path.join(
+            args.cache_dir or Config.CACHE_DIR, "jobs.sqlite3"
+        ),
+        lease=Config.JOB_LEASE,
+        max_attempts=Config.JOB_MAX_ATTEMPTS,
+        retry_delay=Config.JOB_RETRY_DELAY,
+    )
+
+
+def job_specs(args: Args) -> List[JobSpec]:
+    """
+    One job per report directory and range. With several directories the
+    author is part of the output name, as they share the output directory.
+    """
+    team = len(args.reports_dirs) > 1
+    names = TeamSummarizer.author_names(args.reports_dirs)
+    specs = []
+    for reports_dir, author in names.items():
+        for start_date, end_date in args.ranges:
+            name = (
+                f'{start_date.strftime("%Y-%m-%d")}_'
+                f'{end_date.strftime("%Y-%m-%d")}'
+            )
+            specs.append(JobSpec(
+                os.path.abspath(reports_dir),
+                start_date.strftime("%Y-%m-%d"),
+                end_date.strftime("%Y-%m-%d"),
+                ",".join(args.formats or [args.format]),
+                os.path.abspath(args.output_dir or reports_dir),
+                f"{author}_{name}" if team else name,
+            ))
+    return specs
+
+
+def job_runner(args: Args) -> Callable[[JobSpec], List[str]]:
+    """
+    Builds, inside a worker process, the function running a backfill job.
+    The adapter and one summarizer per reports directory are reused by
+    every job of the process, which takes its share of the rate limits.
+    """
+    share_rate_limits(args.workers)
+    ai = build_ai(args)
+    summarizers: Dict[str, WeeklySummarizer] = {}
+
+    def run(spec: JobSpec) -> List[str]:
+        summarizer = summarizers.get(spec.reports_dir)
+        if summarizer is None:
+            summarizer = build_summarizer(
+                args._replace(reports_dir=spec.reports_dir), ai
+            )
+            summarizers[spec.reports_dir] = summarizer
+
+        summary = summarizer.generate_weekly_summary(
+            datetime.strptime(spec.start_date, "%Y-%m-%d"),
+            datetime.strptime(spec.end_date, "%Y-%m-%d"),
+        )
+        if not summary:
+            return []
+
+        formats = spec.formats.split(",")
+        return write_summary(
+            args._replace(
+                output_dir=spec.output_dir, format=formats[0],
+                formats=formats,
+            ),
+            summary, spec.name,
+        )
+
+    return run
+
+
+def backfill(args: Args):
+    """
+    Queues one job per report directory and range and runs them in
+    ``--workers`` processes. Interrupting and running the same command
+    again resumes where it stopped: finished jobs are not queued again and
+    the response cache spares the model call of a job interrupted after
+    it.
+    """
+    queue = build_queue(args)
+    added = queue.enqueue(job_specs(args))
+    print(f"[i] {added} jobs adicionados à fila {queue.path}")
+
+    try:
+        run_workers(
+            queue, functools.partial(job_runner, args), workers=args.workers
+        )
+    except KeyboardInterrupt:
+        print("[i] Backfill interrompido; execute novamente para retomar.")
+    print_status(queue.stats())
+
+
+def print_status(stats: JobStats):
+    counts = stats.counts
+    print(
+        f"[i] Jobs: {counts['done']} concluídos, {counts['running']} em "
+        f"execução, {counts['pending']} pendentes, {counts['failed']} "
+        f"falhos (total {stats.total})"
+    )
+    if stats.throughput:
+        print(
+            f"[i] Vazão: {stats.throughput:.1f} jobs/min, "
+            f"{stats.average_seconds:.1f}s por job, término estimado em "
+            f"{stats.eta_seconds / 60:.0f} min"
+        )
+    if stats.next_retry is not None:
+        print(f"[i] Próxima nova tentativa em {stats.next_retry:.0f}s")
+    for error in stats.errors:
+        print(f"[-] {error}")
+
+
+def status(args: Args):
+    """
+    Shows the progress of the backfill queue.
+    """
+    queue = build_queue(args)
+    if args.retry_failed:
+        print(f"[i] {queue.retry_failed()} jobs falhos voltaram à fila")
+    print_status(queue.stats())
+
+
+def serve(args: Args):
+    """
+    Runs the HTTP server, keeping the adapter and one summarizer per
+    reports directory warm between requests.
+    """
+    from src.server import SummaryServer, SummaryService
+
+    metrics = Metrics()
+    ai = build_ai(args)
+    ai.attach_metrics(metrics)
+    ai.warm()
+
+    service = SummaryService(
+        lambda reports_dir: build_summarizer(
+            args._replace(reports_dir=reports_dir), ai, metrics
+        ),
+        max_concurrency=args.concurrency,
+        metrics=metrics,
+    )
+    server = SummaryServer(
+        (args.host, args.port), service,
+        reports_root=args.reports_dir,
+        verbose=args.verbose,
+    )
+
+    print(f"[+] Servidor ouvindo em http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[i] Servidor encerrado.")
+    finally:
+        server.server_close()
+        if args.metrics_file:
+            metrics.write(args.metrics_file)
+
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    commands = {"serve": serve, "backfill": backfill, "status": status}
+    if argv[:1] and argv[0] in commands:
+        commands[argv[0]](ArgumentParser(argv[0]).parse(argv[1:]))
+        return
+
+    args_parser = ArgumentParser()
+    args = args_parser.parse(argv)
+
+    profiler = None
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    metrics = Metrics()
+    try:
+        with metrics.stage("total"):
+            ai = build_ai(args)
+            ai.attach_metrics(metrics)
+            if len(args.reports_dirs or []) > 1:
+                run_team(args, ai, metrics)
+            elif args.period is not None:
+                run_rollup(args, ai, metrics)
+            else:
+                summarize(args, build_summarizer(args, ai, metrics))
+    finally:
+        report(args, metrics, profiler)
 
     if args.verbose:
         print("[i] Processamento concluído com sucesso.")
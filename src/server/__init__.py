@@ -0,0 +1,10 @@
+from src.server.http_server import SummaryRequestHandler, SummaryServer
+from src.server.service import SummaryResult, SummaryService
+
+
+__all__ = [
+    "SummaryRequestHandler",
+    "SummaryResult",
+    "SummaryServer",
+    "SummaryService",
+]
@@ -0,0 +1,141 @@
+import json
+import os
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from src.server.service import SummaryService
+
+
+class RequestError(ValueError):
+    """Raised for malformed requests; answered with HTTP 400."""
+
+
+class SummaryRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+
+    - ``POST /summaries`` with ``{"reports_dir", "start_date",
+      "end_date"}`` (dates as YYYY-MM-DD, all optional when the server has
+      a default reports directory);
+    - ``GET /stats`` with queue depth, in-flight counts and metrics;
+    - ``GET /metrics`` with the same metrics in the Prometheus format;
+    - ``GET /health``.
+    """
+
+    server: "SummaryServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send_json(200, service.stats())
+        elif self.path == "/metrics":
+            self._send(
+                200, service.metrics.to_prometheus().encode("utf-8"),
+                "text/plain; version=0.0.4",
+            )
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path != "/summaries":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            reports_dir, start_date, end_date = self._parse_request()
+        except RequestError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            result = self.server.service.summarize(
+                reports_dir, start_date, end_date
+            )
+        except Exception as e:
+            self.server.service.metrics.add("server_errors")
+            self._send_json(502, {"error": str(e)})
+            return
+
+        self._send_json(200, result._asdict())
+
+    def _parse_request(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise RequestError("Body must be a JSON object") from None
+        if not isinstance(body, dict):
+            raise RequestError("Body must be a JSON object")
+
+        return (
+            self.server.resolve_reports_dir(body.get("reports_dir")),
+            _parse_date(body.get("start_date"), "start_date"),
+            _parse_date(body.get("end_date"), "end_date"),
+        )
+
+    def _send_json(self, status: int, payload: dict):
+        self._send(
+            status,
+            json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+            "application/json; charset=utf-8",
+        )
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class SummaryServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server in front of a ``SummaryService``. When
+    ``reports_root`` is set, requests can only read directories inside it.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        service: SummaryService,
+        reports_root: Optional[str] = None,
+        verbose: bool = False,
+    ):
+        super().__init__(address, SummaryRequestHandler)
+        self.service = service
+        self.reports_root = reports_root and os.path.realpath(reports_root)
+        self.verbose = verbose
+
+    def resolve_reports_dir(self, reports_dir: Optional[str]) -> str:
+        if self.reports_root is None:
+            if not reports_dir:
+                raise RequestError("reports_dir is required")
+            return reports_dir
+
+        path = os.path.realpath(
+            os.path.join(self.reports_root, reports_dir or "")
+        )
+        if os.path.commonpath([path, self.reports_root]) != self.reports_root:
+            raise RequestError("reports_dir is outside the reports root")
+        return path
+
+
+def _parse_date(value: Optional[str], name: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        raise RequestError(
+            f"{name} must be in the format YYYY-MM-DD"
+        ) from None
@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, NamedTuple, Optional
+
+from src.ai.services import WeeklySummarizer
+from src.utils.metrics import Metrics
+from src.utils.singleflight import SingleFlight
+
+
+class SummaryResult(NamedTuple):
+    """Summary returned by the service and how it was produced."""
+
+    summary: str
+    shared: bool
+    seconds: float
+    queued_seconds: float
+
+
+class SummaryService:
+    """
+    Keeps one summarizer per reports directory (and the adapter behind
+    them) alive between requests. Identical concurrent requests are
+    coalesced into a single generation and at most ``max_concurrency``
+    generations run at a time; the others wait in the queue.
+    """
+
+    __slots__ = [
+        "metrics", "_build_summarizer", "_summarizers", "_flights",
+        "_slots", "_lock", "_queued", "_in_flight",
+    ]
+
+    def __init__(
+        self,
+        build_summarizer: Callable[[str], WeeklySummarizer],
+        max_concurrency: int = 4,
+        metrics: Optional[Metrics] = None,
+    ):
+        self.metrics = metrics or Metrics()
+        self._build_summarizer = build_summarizer
+        self._summarizers: Dict[str, WeeklySummarizer] = {}
+        self._flights = SingleFlight()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+
+    def summarizer(self, reports_dir: str) -> WeeklySummarizer:
+        reports_dir = os.path.abspath(reports_dir)
+        with self._lock:
+            summarizer = self._summarizers.get(reports_dir)
+            if summarizer is None:
+                summarizer = self._build_summarizer(reports_dir)
+                self._summarizers[reports_dir] = summarizer
+        return summarizer
+
+    def summarize(
+        self,
+        reports_dir: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> SummaryResult:
+        """
+        Generates the summary of ``reports_dir`` between the given dates,
+        sharing the result with identical requests already in flight.
+        """
+        self.metrics.add("server_requests")
+        key = (
+            os.path.abspath(reports_dir),
+            start_date.date() if start_date else None,
+            end_date.date() if end_date else None,
+        )
+
+        (summary, seconds, queued_seconds), shared = self._flights.do(
+            key, lambda: self._generate(reports_dir, start_date, end_date)
+        )
+        if shared:
+            self.metrics.add("server_coalesced")
+
+        return SummaryResult(summary, shared, seconds, queued_seconds)
+
+    def _generate(self, reports_dir, start_date, end_date):
+        summarizer = self.summarizer(reports_dir)
+
+        queued_at = time.perf_counter()
+        with self._gauge("_queued"):
+            self._slots.acquire()
+
+        try:
+            started_at = time.perf_counter()
+            with self._gauge("_in_flight"):
+                summary = summarizer.generate_weekly_summary(
+                    start_date, end_date
+                )
+            seconds = time.perf_counter() - started_at
+        finally:
+            self._slots.release()
+
+        self.metrics.record("server_generate", seconds)
+        return summary, seconds, started_at - queued_at
+
+    @contextmanager
+    def _gauge(self, name: str):
+        """
+        Increments the gauge attribute ``name`` inside the ``with`` block.
+        """
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+        try:
+            yield
+        finally:
+            with self._lock:
+                setattr(self, name, getattr(self, name) - 1)
+
+    def stats(self) -> dict:
+        """
+        Current queue depth and in-flight counts plus the run metrics.
+        """
+        with self._lock:
+            queued, in_flight = self._queued, self._in_flight
+            summarizers = len(self._summarizers)
+
+        return {
+            "queue_depth": queued,
+            "in_flight": in_flight,
+            "coalescing": len(self._flights),
+            "summarizers": summarizers,
+            **self.metrics.snapshot(),
+        }
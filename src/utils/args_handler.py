@@ -1,6 +1,14 @@
 import argparse
+import glob
+import os
 from datetime import datetime
-from typing import NamedTuple, Optional
+from typing import List, NamedTuple, Optional
+
+from src.ai.adapters.registry import available_adapters
+from src.ai.services.summarizer import VARIANTS
+from src.utils.dates import PERIODS, DateRange, week_ranges
+from src.utils.ingest import POLICIES
+from src.utils.render import FORMATS
 
 
 class Args(NamedTuple):
@@ -12,20 +20,67 @@ class Args(NamedTuple):
     end_date: datetime = None
     format: str = "txt"
     verbose: bool = False
+    cache: bool = True
+    cache_dir: Optional[str] = None
+    cache_max_mb: Optional[float] = None
+    map_reduce: bool = False
+    ranges: Optional[List[DateRange]] = None
+    concurrency: int = 4
+    stream: bool = False
+    max_prompt_tokens: Optional[int] = None
+    provider: Optional[str] = None
+    metrics_file: Optional[str] = None
+    profile: Optional[str] = None
+    compact: bool = False
+    max_report_kb: Optional[int] = None
+    max_range_kb: Optional[int] = None
+    truncate: Optional[str] = None
+    watch: bool = False
+    reports_dirs: Optional[List[str]] = None
+    workers: int = 4
+    executor: str = "thread"
+    formats: Optional[List[str]] = None
+    topic: Optional[str] = None
+    top_k: Optional[int] = None
+    period: Optional[str] = None
+    latency_target: Optional[float] = None
+    queue: Optional[str] = None
+    variants: Optional[List[str]] = None
+    retry_failed: bool = False
+    command: Optional[str] = None
+    host: str = "127.0.0.1"
+    port: int = 8080
 
 
 class ArgumentParser:
     """Class to handle command line argument parsing for Weekly Summarizer."""
 
-    def __init__(self):
-        """Initialize the argument parser with appropriate configuration."""
+    def __init__(self, command: Optional[str] = None):
+        """Initialize the argument parser with appropriate configuration.
+
+        Args:
+            command: ``"serve"`` to parse the server mode options, where the
+                reports directory is optional and batch options do not apply;
+                ``"backfill"`` to queue batch jobs and run them in worker
+                processes; ``"status"`` to show the progress of the queue
+        """
+        self.command = command
         self.parser = argparse.ArgumentParser(
+            prog=f"python -m src {command}" if command else None,
             description=(
                 "Weekly Reports Summarizer - "
                 "Transform daily reports into concise weekly summaries"
             )
         )
+        if command == "status":
+            self._configure_status_arguments()
+            return
+
         self._configure_arguments()
+        if command == "serve":
+            self._configure_server_arguments()
+        if command == "backfill":
+            self._configure_queue_argument()
 
     def _configure_arguments(self):
         """Define the available command line arguments."""
@@ -34,10 +89,14 @@ class ArgumentParser:
             "--reports-dir",
             help=(
                 "Directory containing daily report files "
-                "(format: YYYY-MM-DD.md)"
+                "(format: YYYY-MM-DD.md). Several directories or a glob "
+                "(e.g. 'team/*') produce one summary per author plus a team "
+                "summary. In server mode, the directory requests are "
+                "resolved against and restricted to"
             ),
             type=str,
-            required=True,
+            nargs="+",
+            required=self.command != "serve",
         )
 
         self.parser.add_argument(
@@ -76,9 +135,12 @@ class ArgumentParser:
         self.parser.add_argument(
             "-f",
             "--format",
-            help="Output format for the summary (txt or md)",
+            help=(
+                "Output formats for the summary, comma separated "
+                f"({', '.join(FORMATS)}); the summary is generated once and "
+                "rendered to each of them"
+            ),
             type=str,
-            choices=["txt", "md"],
             default="txt",
             required=False,
         )
@@ -90,28 +152,546 @@ class ArgumentParser:
             action="store_true",
         )
 
-    def parse(self) -> Args:
+        self.parser.add_argument(
+            "--no-cache",
+            help="Always call the AI model, ignoring cached responses",
+            dest="cache",
+            action="store_false",
+        )
+
+        self.parser.add_argument(
+            "--cache-dir",
+            help=(
+                "Directory for cached AI responses "
+                "(defaults to CACHE_DIR or ~/.cache/weekly-reports-summarizer)"
+            ),
+            type=str,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--cache-max-mb",
+            help=(
+                "Maximum size of the response cache in megabytes; least "
+                "recently used entries are evicted (defaults to CACHE_MAX_MB)"
+            ),
+            type=float,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--map-reduce",
+            help=(
+                "Summarize each daily report into a cached digest first and "
+                "build the weekly summary from the digests"
+            ),
+            action="store_true",
+        )
+
+        self.parser.add_argument(
+            "--compact",
+            help=(
+                "Normalize the reports, drop empty template sections and "
+                "collapse lines repeated across the period before building "
+                "the prompt"
+            ),
+            action="store_true",
+        )
+
+        self.parser.add_argument(
+            "--max-report-kb",
+            help=(
+                "Read at most this many kilobytes of each report "
+                "(defaults to MAX_REPORT_KB, 0 disables the cap)"
+            ),
+            type=int,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--max-range-kb",
+            help=(
+                "Read at most this many kilobytes for a whole range, shared "
+                "between its reports (defaults to MAX_RANGE_KB, 0 disables "
+                "the cap)"
+            ),
+            type=int,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--truncate",
+            help=(
+                "Part of a report over its cap that is kept: the start, the "
+                "end or both (defaults to TRUNCATE_POLICY or head_tail)"
+            ),
+            type=str,
+            choices=POLICIES,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--workers",
+            help=(
+                "Number of authors summarized in parallel when several "
+                "report directories are given"
+            ),
+            type=int,
+            default=4,
+        )
+
+        self.parser.add_argument(
+            "--executor",
+            help=(
+                "Run the authors in threads (shared AI client) or in "
+                "separate processes (one client per process)"
+            ),
+            type=str,
+            choices=["thread", "process"],
+            default="thread",
+        )
+
+        self.parser.add_argument(
+            "--topic",
+            help=(
+                "Summarize what the reports say about a topic: only the "
+                "most relevant passages, found through a local full-text "
+                "index, are sent to the model. Searches every report unless "
+                "--start-date/--end-date are given"
+            ),
+            type=str,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--top-k",
+            help=(
+                "Number of passages sent to the model in --topic mode "
+                "(defaults to SEARCH_TOP_K)"
+            ),
+            type=int,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--period",
+            help=(
+                "Rollup mode: summarize the month, quarter or year containing "
+                "--end-date (defaults to the last complete one) from stored "
+                "weekly, monthly and quarterly summaries"
+            ),
+            type=str,
+            choices=PERIODS,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--variants",
+            help=(
+                "Generate several outputs for the same range, comma "
+                f"separated ({', '.join(VARIANTS)}); the reports are uploaded "
+                "to the model once and every variant only sends its own "
+                "instructions"
+            ),
+            type=str,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--weeks",
+            help=(
+                "Batch mode: summarize every week between two dates "
+                "(format: YYYY-MM-DD:YYYY-MM-DD), one output file per week"
+            ),
+            type=str,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--ranges-file",
+            help=(
+                "Batch mode: file with one date range per line "
+                "(format: YYYY-MM-DD:YYYY-MM-DD), one output file per range"
+            ),
+            type=str,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--concurrency",
+            help=(
+                "Number of ranges summarized in parallel in batch mode, or "
+                "of concurrent generations in server mode"
+            ),
+            type=int,
+            default=4,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--stream",
+            help=(
+                "Print the summary to stdout as it is generated; the output "
+                "file is replaced once the summary is complete"
+            ),
+            action="store_true",
+        )
+
+        self.parser.add_argument(
+            "--watch",
+            help=(
+                "Keep running and regenerate the summary of a week whenever "
+                "one of its reports is created or modified (implies "
+                "--map-reduce, so unchanged days are not summarized again)"
+            ),
+            action="store_true",
+        )
+
+        self.parser.add_argument(
+            "--max-prompt-tokens",
+            help=(
+                "Token budget for a single prompt; larger ranges are split "
+                "into chunks summarized in parallel and then merged "
+                "(defaults to MAX_PROMPT_TOKENS, 0 disables chunking)"
+            ),
+            type=int,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--provider",
+            help=(
+                "AI provider used to generate the summary "
+                "(defaults to AI_PROVIDER or gemini)"
+            ),
+            type=str,
+            choices=available_adapters(),
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--latency-target",
+            help=(
+                "Seconds a summary should take: route each prompt to the "
+                "first model tier expected to answer within it, learning "
+                "from the observed latencies (implies --provider routing; "
+                "tiers come from ROUTING_TIERS)"
+            ),
+            type=float,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--metrics-file",
+            help=(
+                "Write per-stage timings, bytes read, token counts and "
+                "retries to this file: a Prometheus textfile if it ends with "
+                ".prom, otherwise a JSON line is appended"
+            ),
+            type=str,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--profile",
+            help="Dump a cProfile report of the run to this file",
+            type=str,
+            required=False,
+        )
+
+    def _configure_server_arguments(self):
+        """Define the options specific to the server mode."""
+        self.parser.add_argument(
+            "--host",
+            help="Address the server listens on",
+            type=str,
+            default="127.0.0.1",
+        )
+
+        self.parser.add_argument(
+            "--port",
+            help="Port the server listens on",
+            type=int,
+            default=8080,
+        )
+
+    def _configure_queue_argument(self):
+        self.parser.add_argument(
+            "--queue",
+            help=(
+                "SQLite file holding the backfill jobs "
+                "(defaults to jobs.sqlite3 in the cache directory)"
+            ),
+            type=str,
+            required=False,
+        )
+
+    def _configure_status_arguments(self):
+        """Define the options of the queue status command."""
+        self._configure_queue_argument()
+
+        self.parser.add_argument(
+            "--cache-dir",
+            help="Cache directory holding the default queue file",
+            type=str,
+            required=False,
+        )
+
+        self.parser.add_argument(
+            "--retry-failed",
+            help="Give the jobs that ran out of attempts a new round",
+            action="store_true",
+        )
+
+    def parse(self, argv: Optional[List[str]] = None) -> Args:
         """Parse command line arguments.
 
         Returns:
             Args: A named tuple containing the parsed arguments
         """
-        args = self.parser.parse_args()
+        args = self.parser.parse_args(argv)
+        if self.command == "status":
+            return Args(
+                reports_dir=None,
+                cache_dir=args.cache_dir,
+                command=self.command,
+                queue=args.queue,
+                retry_failed=args.retry_failed,
+            )
 
         start_date = self._parse_date(args.start_date, "start date")
         end_date = self._parse_date(args.end_date, "end date")
 
-        output_dir = args.output_dir if args.output_dir else args.reports_dir
+        reports_dirs = self._expand_reports_dirs(args.reports_dir)
+        reports_dir = reports_dirs[0] if reports_dirs else None
+
+        output_dir = args.output_dir
+        if not output_dir and reports_dirs:
+            output_dir = (
+                os.path.commonpath([os.path.abspath(d) for d in reports_dirs])
+                if len(reports_dirs) > 1 else reports_dir
+            )
+
+        formats = self._parse_formats(args.format)
+        if args.stream and (len(formats) > 1 or formats[0] == "json"
+                            or formats[0] == "html"):
+            self.parser.error(
+                "--stream only supports a single txt or md format"
+            )
+
+        ranges = self._parse_ranges(args)
+        self._check_conflicts(
+            args, ranges, bool(start_date or end_date), len(reports_dirs) > 1
+        )
+        variants = self._parse_variants(args, ranges, len(reports_dirs) > 1)
 
         return Args(
-            reports_dir=args.reports_dir,
+            reports_dir=reports_dir,
             output_dir=output_dir,
             start_date=start_date,
             end_date=end_date,
-            format=args.format,
+            format=formats[0],
             verbose=args.verbose,
+            cache=args.cache,
+            cache_dir=args.cache_dir,
+            cache_max_mb=args.cache_max_mb,
+            map_reduce=args.map_reduce or args.watch,
+            ranges=ranges,
+            concurrency=args.concurrency,
+            stream=args.stream,
+            max_prompt_tokens=args.max_prompt_tokens,
+            provider=self._provider(args),
+            metrics_file=args.metrics_file,
+            profile=args.profile,
+            compact=args.compact,
+            max_report_kb=args.max_report_kb,
+            max_range_kb=args.max_range_kb,
+            truncate=args.truncate,
+            watch=args.watch,
+            command=self.command,
+            host=getattr(args, "host", "127.0.0.1"),
+            port=getattr(args, "port", 8080),
+            reports_dirs=reports_dirs,
+            workers=args.workers,
+            executor=args.executor,
+            formats=formats,
+            topic=args.topic,
+            top_k=args.top_k,
+            period=args.period,
+            latency_target=args.latency_target,
+            queue=getattr(args, "queue", None),
+            variants=variants,
         )
 
+    def _provider(self, args) -> Optional[str]:
+        if args.latency_target is None:
+            return args.provider
+        if args.latency_target <= 0:
+            self.parser.error("--latency-target must be positive")
+        if args.provider not in (None, "routing"):
+            self.parser.error(
+                "--latency-target requires the routing provider")
+        return "routing"
+
+    def _parse_formats(self, value: str) -> List[str]:
+        formats = []
+        for format in value.split(","):
+            format = format.strip().lower()
+            if format not in FORMATS:
+                self.parser.error(
+                    f"Invalid format {format!r}, choose from "
+                    f"{', '.join(FORMATS)}")
+            if format not in formats:
+                formats.append(format)
+        return formats
+
+    def _parse_variants(self, args, ranges, team: bool):
+        if args.variants is None:
+            return None
+        if (ranges is not None or args.stream or args.watch or team
+                or args.topic is not None or args.period is not None
+                or self.command is not None):
+            self.parser.error(
+                "--variants cannot be combined with --weeks/--ranges-file, "
+                "--stream, --watch, --topic, --period, several report "
+                "directories or a subcommand")
+
+        variants = []
+        for variant in args.variants.split(","):
+            variant = variant.strip().lower()
+            if variant not in VARIANTS:
+                self.parser.error(
+                    f"Invalid variant {variant!r}, choose from "
+                    f"{', '.join(VARIANTS)}")
+            if variant not in variants:
+                variants.append(variant)
+        return variants
+
+    def _expand_reports_dirs(self, values: Optional[List[str]]) -> List[str]:
+        """
+        Expands globs in the ``--reports-dir`` values, keeping the order and
+        dropping duplicates (also when spelled differently, e.g. ``a`` and
+        ``./a/``).
+        """
+        reports_dirs = []
+        seen = set()
+        for value in values or []:
+            if not glob.has_magic(value):
+                matches = [value]
+            else:
+                matches = sorted(
+                    path for path in glob.glob(value) if os.path.isdir(path)
+                )
+                if not matches:
+                    self.parser.error(f"No directory matches {value}")
+            for path in matches:
+                if os.path.abspath(path) not in seen:
+                    seen.add(os.path.abspath(path))
+                    reports_dirs.append(path)
+        return reports_dirs
+
+    def _check_conflicts(self, args, ranges, has_dates: bool, team: bool):
+        """
+        Rejects option combinations that do not make sense together.
+        """
+        if ranges is not None and has_dates:
+            self.parser.error(
+                "--weeks/--ranges-file cannot be combined with "
+                "--start-date/--end-date"
+            )
+        if ranges is not None and args.stream:
+            self.parser.error(
+                "--stream cannot be combined with --weeks/--ranges-file")
+        if args.concurrency < 1 or args.workers < 1:
+            self.parser.error("Concurrency and workers must be at least 1")
+        if args.watch and (ranges is not None or args.stream or has_dates):
+            self.parser.error(
+                "--watch cannot be combined with --weeks/--ranges-file, "
+                "--stream or --start-date/--end-date")
+        if team and self.command != "backfill" and (
+            ranges is not None or args.stream or args.watch
+        ):
+            self.parser.error(
+                "Several report directories cannot be combined with "
+                "--weeks/--ranges-file, --stream or --watch")
+        if args.topic is not None and (
+            ranges is not None or args.stream or args.watch or team
+        ):
+            self.parser.error(
+                "--topic cannot be combined with --weeks/--ranges-file, "
+                "--stream, --watch or several report directories")
+        if args.period is not None and (
+            ranges is not None or args.stream or args.watch or team
+            or args.topic is not None or args.start_date
+        ):
+            self.parser.error(
+                "--period cannot be combined with --weeks/--ranges-file, "
+                "--stream, --watch, --topic, --start-date or several report "
+                "directories")
+        if args.top_k is not None and args.top_k < 1:
+            self.parser.error("--top-k must be at least 1")
+        self._check_command(args, ranges, team)
+
+    def _check_command(self, args, ranges, team: bool):
+        """
+        Rejects the options that do not apply to the subcommand.
+        """
+        if self.command == "serve" and (
+            ranges is not None or args.stream or team
+        ):
+            self.parser.error(
+                "--weeks/--ranges-file, --stream and several report "
+                "directories do not apply to serve")
+        if self.command == "backfill" and ranges is None:
+            self.parser.error("backfill requires --weeks or --ranges-file")
+        if self.command == "backfill" and (
+            args.watch or args.topic is not None or args.period is not None
+        ):
+            self.parser.error(
+                "--watch, --topic and --period do not apply to backfill")
+
+    def _parse_ranges(self, args) -> Optional[List[DateRange]]:
+        """
+        Builds the list of date ranges for batch mode, or None when running
+        a single range.
+        """
+        if args.weeks and args.ranges_file:
+            self.parser.error(
+                "--weeks and --ranges-file cannot be used together")
+
+        if args.weeks:
+            return week_ranges(*self._parse_range(args.weeks, "weeks"))
+
+        if not args.ranges_file:
+            return None
+
+        try:
+            with open(args.ranges_file, "r", encoding="utf-8") as file:
+                lines = [line.strip() for line in file]
+        except OSError as e:
+            self.parser.error(f"Could not read ranges file: {e}")
+
+        return [
+            self._parse_range(line, "ranges file line")
+            for line in lines
+            if line and not line.startswith("#")
+        ]
+
+    def _parse_range(self, range_str: str, arg_name: str) -> DateRange:
+        """
+        Parse a range string in the format YYYY-MM-DD:YYYY-MM-DD.
+        """
+        start_str, _, end_str = range_str.partition(":")
+        start_date = self._parse_date(start_str, arg_name)
+        end_date = self._parse_date(end_str, arg_name)
+
+        if not start_date or not end_date or start_date > end_date:
+            self.parser.error(
+                f'{arg_name.capitalize()} must be in the format '
+                'YYYY-MM-DD:YYYY-MM-DD with start before end')
+
+        return start_date, end_date
+
     def _parse_date(
         self,
         date_str: Optional[str],
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from src.utils.files import atomic_write
+
+
+def make_key(*parts) -> str:
+    """
+    Builds a content-addressed key from any JSON serializable parts.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Persistent key/value store with LRU eviction.
+
+    Each entry is a small JSON file named after its key. Reads refresh the
+    file mtime, which is the "last used" timestamp for both expiry and
+    eviction: entries unused for more than ``max_age`` seconds are treated
+    as misses and removed, and the least recently used ones go first when
+    the cache grows past ``max_bytes``.
+
+    Writes keep a running total of the cache size instead of scanning the
+    directory; the directory is only scanned on the first write, when the
+    total goes over ``max_bytes`` and every ``sweep_every`` writes, which
+    also catches entries written by other processes.
+    """
+
+    __slots__ = ["directory", "max_bytes", "max_age", "sweep_every",
+                 "_size", "_writes", "_lock"]
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        sweep_every: int = 100,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.sweep_every = sweep_every
+        self._size: Optional[int] = None
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _expired(self, mtime: float, now: float) -> bool:
+        return bool(self.max_age) and now - mtime > self.max_age
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                mtime = os.fstat(file.fileno()).st_mtime
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if self._expired(mtime, time.time()):
+            self._discard(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return entry["value"]
+
+    def set(self, key: str, value: str):
+        path = self._path(key)
+        data = json.dumps({"value": value})
+        try:
+            previous = os.stat(path).st_size
+        except OSError:
+            previous = 0
+        atomic_write(path, data)
+
+        with self._lock:
+            self._writes += 1
+            if self._size is not None:
+                self._size += len(data.encode("utf-8")) - previous
+            sweep = (
+                self._size is None
+                or (bool(self.max_bytes) and self._size > self.max_bytes)
+                or self._writes % self.sweep_every == 0
+            )
+        if sweep:
+            self.evict()
+
+    def evict(self):
+        """
+        Removes expired entries and, if the cache is still over its size
+        limit, the least recently used ones.
+        """
+        with self._lock:
+            entries = []
+            now = time.time()
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if self._expired(stat.st_mtime, now):
+                    self._remove(entry.path)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            if self.max_bytes:
+                for _, size, path in sorted(entries):
+                    if total <= self.max_bytes:
+                        break
+                    self._remove(path)
+                    total -= size
+            self._size = total
+
+    def clear(self):
+        with self._lock:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json"):
+                    self._remove(entry.path)
+            self._size = 0
+
+    def _discard(self, path: str):
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            return
+        self._remove(path)
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
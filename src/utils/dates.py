@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+
+DateRange = Tuple[datetime, datetime]
+
+
+def week_ranges(start_date: datetime, end_date: datetime) -> List[DateRange]:
+    """
+    Splits ``start_date``..``end_date`` into consecutive 7 day ranges.
+    The last range is cut at ``end_date``.
+    """
+    ranges = []
+    week_start = start_date
+    while week_start <= end_date:
+        week_end = min(week_start + timedelta(days=6), end_date)
+        ranges.append((week_start, week_end))
+        week_start += timedelta(days=7)
+    return ranges
+
+
+def week_of(date: datetime) -> DateRange:
+    """
+    Returns the Sunday to Saturday week containing ``date``.
+    """
+    start = datetime(date.year, date.month, date.day) - timedelta(
+        days=(date.weekday() + 1) % 7
+    )
+    return start, start + timedelta(days=6)
+
+
+PERIODS = ("month", "quarter", "year")
+
+# Rollup tree: each period is made of the periods below it, down to weeks
+SUBPERIODS = {"year": "quarter", "quarter": "month", "month": "week"}
+
+MONTHS_IN = {"month": 1, "quarter": 3, "year": 12}
+
+
+def period_of(period: str, date: datetime) -> DateRange:
+    """
+    Returns the month, quarter or year containing ``date``.
+    """
+    months = MONTHS_IN[period]
+    first_month = (date.month - 1) // months * months + 1
+    start = datetime(date.year, first_month, 1)
+    return start, _add_months(start, months) - timedelta(days=1)
+
+
+def previous_period(period: str, date: datetime) -> DateRange:
+    """
+    Returns the last complete month, quarter or year before ``date``.
+    """
+    start, _ = period_of(period, date)
+    return period_of(period, start - timedelta(days=1))
+
+
+def split_period(period: str, start_date: datetime) -> List[DateRange]:
+    """
+    Splits the period starting at ``start_date`` into the ranges of its
+    sub periods. Months are split into Sunday to Saturday weeks clipped to
+    the month, so every day belongs to exactly one week.
+    """
+    _, end_date = period_of(period, start_date)
+    subperiod = SUBPERIODS[period]
+    if subperiod == "week":
+        return [
+            (max(start, start_date), min(end, end_date))
+            for start, end in _weeks_between(start_date, end_date)
+        ]
+
+    ranges = []
+    start = start_date
+    while start <= end_date:
+        ranges.append(period_of(subperiod, start))
+        start = ranges[-1][1] + timedelta(days=1)
+    return ranges
+
+
+def _weeks_between(start_date: datetime, end_date: datetime):
+    week = week_of(start_date)
+    while week[0] <= end_date:
+        yield week
+        week = (week[0] + timedelta(days=7), week[1] + timedelta(days=7))
+
+
+def _add_months(date: datetime, months: int) -> datetime:
+    month = date.month - 1 + months
+    return datetime(date.year + month // 12, month % 12 + 1, 1)
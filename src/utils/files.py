@@ -0,0 +1,36 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+
+@contextmanager
+def atomic_open(path: str, encoding: str = "utf-8") -> Iterator[IO[str]]:
+    """
+    Opens a temporary file in the directory of ``path`` for writing and
+    moves it over ``path`` when the block exits cleanly, so readers never
+    see a partial file. If the block raises, ``path`` is left untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as file:
+            yield file
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write(path: str, data: str, encoding: str = "utf-8"):
+    """
+    Writes ``data`` to ``path`` atomically.
+
+    The content is written to a temporary file in the same directory and
+    then moved over the destination, so readers never see a partial file.
+    """
+    with atomic_open(path, encoding) as file:
+        file.write(data)
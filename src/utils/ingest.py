@@ -0,0 +1,208 @@
+import codecs
+import mmap
+import os
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.utils.metrics import Metrics
+
+
+# Files from this size on are memory-mapped instead of read through a buffer
+MMAP_THRESHOLD = 1 << 20
+CHUNK_SIZE = 1 << 16
+
+POLICIES = ("head", "tail", "head_tail")
+
+TRUNCATION_MARKER = "\n[... {bytes} bytes omitidos ...]\n"
+
+
+class IngestLimits(NamedTuple):
+    """
+    Size caps for a range of reports. ``max_file_bytes`` caps each report
+    and ``max_range_bytes`` the whole range, shared fairly between its
+    reports; None or 0 disables a cap. ``policy`` tells which part of a
+    report over its cap is kept: the start, the end or both.
+    """
+
+    max_file_bytes: Optional[int] = None
+    max_range_bytes: Optional[int] = None
+    policy: str = "head_tail"
+
+
+class Report(NamedTuple):
+    """A report whose content is produced lazily by ``chunks``."""
+
+    date: str
+    path: str
+    chunks: Iterator[str]
+
+
+def iter_reports(
+    reports: Iterable[Tuple[str, str]],
+    limits: Optional[IngestLimits] = None,
+    metrics: Optional[Metrics] = None,
+) -> Iterator[Report]:
+    """
+    Yields a ``Report`` for each ``(filename, path)`` pair. Nothing is read
+    until its chunks are consumed, and at most the capped number of bytes
+    of each file is ever read, so memory stays bounded by the caps rather
+    than by the size of the reports.
+    """
+    limits = limits or IngestLimits()
+    metrics = metrics or Metrics()
+    reports = list(reports)
+
+    budgets = [limits.max_file_bytes or None] * len(reports)
+    if limits.max_range_bytes:
+        sizes = [_size(path) for _, path in reports]
+        if limits.max_file_bytes:
+            sizes = [min(size, limits.max_file_bytes) for size in sizes]
+        budgets = fair_shares(sizes, limits.max_range_bytes)
+
+    for (filename, path), budget in zip(reports, budgets):
+        yield Report(
+            filename[:10], path,
+            iter_file_chunks(path, budget, limits.policy, metrics=metrics),
+        )
+
+
+def read_report(
+    path: str,
+    limits: Optional[IngestLimits] = None,
+    metrics: Optional[Metrics] = None,
+) -> str:
+    """
+    Reads a single report, applying only the per-file cap.
+    """
+    limits = limits or IngestLimits()
+    return "".join(iter_file_chunks(
+        path, limits.max_file_bytes or None, limits.policy, metrics=metrics
+    ))
+
+
+def fair_shares(sizes: List[int], budget: int) -> List[int]:
+    """
+    Splits ``budget`` bytes between files of the given sizes: small files
+    are kept whole and what they leave unused goes to the larger ones.
+    """
+    shares = [0] * len(sizes)
+    remaining = budget
+    order = sorted(range(len(sizes)), key=sizes.__getitem__)
+
+    for position, i in enumerate(order):
+        shares[i] = min(sizes[i], remaining // (len(sizes) - position))
+        remaining -= shares[i]
+
+    return shares
+
+
+def iter_file_chunks(
+    path: str,
+    max_bytes: Optional[int] = None,
+    policy: str = "head_tail",
+    chunk_size: int = CHUNK_SIZE,
+    metrics: Optional[Metrics] = None,
+) -> Iterator[str]:
+    """
+    Decodes ``path`` as UTF-8 in chunks of ``chunk_size`` bytes. Files over
+    ``max_bytes`` are truncated according to ``policy`` and a marker with
+    the number of omitted bytes takes the place of the removed part.
+
+    Invalid bytes are replaced rather than failing the whole report and
+    counted in the ``decode_errors`` metric.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown truncation policy: {policy}")
+    metrics = metrics or Metrics()
+
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        view = None
+        if size >= MMAP_THRESHOLD:
+            view = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        def read(offset, length):
+            if view is not None:
+                return view[offset:offset + length]
+            file.seek(offset)
+            return file.read(length)
+
+        try:
+            yield from _decode_segments(
+                read, size, _segments(read, size, max_bytes, policy),
+                chunk_size, metrics, path,
+            )
+        finally:
+            if view is not None:
+                view.close()
+
+
+def _decode_segments(read, size, segments, chunk_size, metrics, path):
+    position = 0
+    errors = 0
+
+    for start, end in segments:
+        if start > position:
+            yield TRUNCATION_MARKER.format(bytes=start - position)
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for offset in range(start, end, chunk_size):
+            data = read(offset, min(chunk_size, end - offset))
+            metrics.add("bytes_read", len(data))
+            text = decoder.decode(data)
+            errors += text.count("\ufffd")
+            yield text
+
+        text = decoder.decode(b"", final=True)
+        errors += text.count("\ufffd")
+        yield text
+        position = end
+
+    if size > position:
+        yield TRUNCATION_MARKER.format(bytes=size - position)
+
+    if size > sum(end - start for start, end in segments):
+        metrics.add("reports_truncated")
+    if errors:
+        metrics.add("decode_errors", errors)
+        print(f"[-] {path}: {errors} caracteres inválidos substituídos")
+
+
+def _segments(read, size, max_bytes, policy) -> List[Tuple[int, int]]:
+    """
+    Byte ranges of the file to keep, aligned to UTF-8 character starts.
+    """
+    if max_bytes is None or size <= max_bytes:
+        return [(0, size)]
+    if max_bytes <= 0:
+        return []
+
+    if policy == "head":
+        segments = [(0, max_bytes)]
+    elif policy == "tail":
+        segments = [(size - max_bytes, size)]
+    else:
+        head = max_bytes // 2
+        segments = [(0, head), (size - (max_bytes - head), size)]
+
+    return [
+        (_char_start(read, start, size), _char_start(read, end, size))
+        for start, end in segments
+    ]
+
+
+def _char_start(read, offset: int, size: int) -> int:
+    """
+    Moves ``offset`` forward past UTF-8 continuation bytes (at most 3).
+    """
+    for byte in read(offset, 3):
+        if byte & 0xC0 != 0x80:
+            break
+        offset += 1
+    return min(offset, size)
+
+
+def _size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
@@ -0,0 +1,130 @@
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from src.utils.files import atomic_write
+
+
+INVALID_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def labeled(name: str, **labels: str) -> str:
+    """
+    Name of the counter ``name`` for the given labels, e.g.
+    ``routed_requests{tier="small"}``, as stored in ``Metrics.counters``.
+    """
+    if not labels:
+        return name
+    pairs = ",".join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace("\\", "\\\\").replace('"', '\\"'),
+        )
+        for key, value in sorted(labels.items())
+    )
+    return f"{name}{{{pairs}}}"
+
+
+class Metrics:
+    """
+    Thread-safe collector of per-stage wall time and counters (bytes read,
+    tokens, retries, ...) for a run.
+    """
+
+    __slots__ = ["stages", "counters", "_lock"]
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Adds the wall time spent inside the ``with`` block to ``name``.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        """
+        Adds ``seconds`` of wall time to the stage ``name``.
+        """
+        with self._lock:
+            stage = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+            stage["seconds"] += seconds
+            stage["calls"] += 1
+
+    def add(self, name: str, value: float = 1, **labels: str):
+        """
+        Adds ``value`` to the counter ``name``; ``labels`` split it by
+        values that are not valid in metric names, such as model names.
+        """
+        name = labeled(name, **labels)
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {
+                    name: dict(stage) for name, stage in self.stages.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+    def to_json_line(self) -> str:
+        return json.dumps(
+            {"timestamp": time.time(), **self.snapshot()}, sort_keys=True
+        )
+
+    def to_prometheus(self, prefix: str = "weekly_summarizer") -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f"# TYPE {prefix}_stage_seconds gauge",
+            *(
+                f'{prefix}_stage_seconds{{stage="{name}"}} '
+                f'{stage["seconds"]:.6f}'
+                for name, stage in sorted(snapshot["stages"].items())
+            ),
+            f"# TYPE {prefix}_stage_calls gauge",
+            *(
+                f'{prefix}_stage_calls{{stage="{name}"}} {stage["calls"]}'
+                for name, stage in sorted(snapshot["stages"].items())
+            ),
+        ]
+        # Samples of a metric must follow its TYPE line, labels or not
+        counters = sorted(
+            (*key.partition("{"), value)
+            for key, value in snapshot["counters"].items()
+        )
+        previous = None
+        for name, brace, labels, value in counters:
+            name = INVALID_NAME.sub("_", f"{prefix}_{name}")
+            if name != previous:
+                lines.append(f"# TYPE {name} gauge")
+                previous = name
+            lines.append(f"{name}{brace}{labels} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """
+        Writes a Prometheus textfile when ``path`` ends with ``.prom``,
+        otherwise appends a JSON line to ``path``.
+        """
+        if path.endswith(".prom"):
+            atomic_write(path, self.to_prometheus())
+            return
+
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(self.to_json_line() + "\n")
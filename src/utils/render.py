@@ -0,0 +1,107 @@
+import html
+import json
+from typing import Dict, List, Optional
+
+
+# Section key and title, in the order they are rendered
+SECTIONS = (
+    ("activities", "Atividades na semana"),
+    ("bug_fixes", "Resolução de bugs"),
+    ("features", "Trabalhando em features"),
+)
+
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        key: {"type": "array", "items": {"type": "string"}}
+        for key, _ in SECTIONS
+    },
+    "required": [key for key, _ in SECTIONS],
+}
+
+FORMATS = ("txt", "md", "json", "html")
+
+
+class Summary(str):
+    """
+    A summary generated as structured output. It behaves as its plain text
+    rendering and keeps the ``sections`` so any other format can be
+    rendered without calling the model again.
+    """
+
+    sections: Dict[str, List[str]]
+
+    def __new__(cls, sections: Dict[str, List[str]]):
+        summary = super().__new__(cls, render_txt(sections))
+        summary.sections = sections
+        return summary
+
+    def __reduce__(self):
+        return Summary, (self.sections,)
+
+
+def render(summary: str, format: str, title: Optional[str] = None) -> str:
+    """
+    Renders ``summary`` as ``format``. Plain strings (e.g. streamed
+    summaries) have no sections and are embedded as they are.
+    """
+    sections = getattr(summary, "sections", None)
+    if format == "json":
+        payload = {"title": title, "sections": sections}
+        if sections is None:
+            payload = {"title": title, "summary": str(summary)}
+        return json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
+    if format == "html":
+        return render_html(sections, summary, title)
+    if sections is None:
+        return str(summary)
+    if format == "md":
+        return render_md(sections, title)
+    return render_txt(sections)
+
+
+def _items(sections: Dict[str, List[str]]):
+    for key, heading in SECTIONS:
+        yield heading, [item for item in sections.get(key) or [] if item]
+
+
+def render_txt(sections: Dict[str, List[str]]) -> str:
+    blocks = []
+    for number, (heading, items) in enumerate(_items(sections), start=1):
+        lines = [f"{number}. {heading}"]
+        lines += [f"   - {item}" for item in items] or ["   - Nenhum item"]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) + "\n"
+
+
+def render_md(sections: Dict[str, List[str]], title: Optional[str]) -> str:
+    blocks = [f"# {title}"] if title else []
+    for heading, items in _items(sections):
+        lines = [f"## {heading}", ""]
+        lines += [f"- {item}" for item in items] or ["_Nenhum item_"]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) + "\n"
+
+
+def render_html(sections, summary: str, title: Optional[str]) -> str:
+    title = html.escape(title or "Resumo semanal")
+    if sections is None:
+        body = f"<pre>{html.escape(str(summary))}</pre>"
+    else:
+        blocks = []
+        for heading, items in _items(sections):
+            entries = "".join(
+                f"<li>{html.escape(item)}</li>" for item in items
+            )
+            blocks.append(
+                f"<section><h2>{html.escape(heading)}</h2>"
+                f"<ul>{entries}</ul></section>"
+            )
+        body = "\n".join(blocks)
+
+    return (
+        "<!DOCTYPE html>\n"
+        '<html lang="pt-BR">\n<head><meta charset="utf-8">'
+        f"<title>{title}</title></head>\n"
+        f"<body>\n<h1>{title}</h1>\n{body}\n</body>\n</html>\n"
+    )
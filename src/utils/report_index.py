@@ -0,0 +1,143 @@
+import bisect
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.files import atomic_write
+
+
+REPORT_NAME = re.compile(r"^(\d{4}-\d{2}-\d{2})\.md$")
+
+
+class ReportIndex:
+    """
+    Maps report dates to file paths with a single ``os.scandir`` pass.
+
+    Nested layouts such as ``YYYY/MM/YYYY-MM-DD.md`` are supported. The
+    index is invalidated by the mtime of the scanned directories, so a
+    lookup costs one ``stat`` per directory instead of one per day, and it
+    can be persisted to ``cache_path`` to survive between runs.
+    """
+
+    __slots__ = ["directory", "cache_path", "_dirs", "_dates", "_paths",
+                 "_lock"]
+
+    def __init__(self, directory: str, cache_path: Optional[str] = None):
+        self.directory = directory
+        self.cache_path = cache_path
+        self._dirs: Dict[str, int] = {}
+        self._dates: List[str] = []
+        self._paths: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def lookup(
+        self, start_date: datetime, end_date: datetime
+    ) -> List[Tuple[str, str]]:
+        """
+        Returns ``(filename, path)`` for every report between the two dates,
+        inclusive, in chronological order.
+        """
+        self.refresh()
+
+        start = bisect.bisect_left(
+            self._dates, start_date.strftime("%Y-%m-%d")
+        )
+        end = bisect.bisect_right(self._dates, end_date.strftime("%Y-%m-%d"))
+
+        return [
+            (os.path.basename(self._paths[date]), self._paths[date])
+            for date in self._dates[start:end]
+        ]
+
+    def all(self) -> List[Tuple[str, str]]:
+        """
+        Returns ``(filename, path)`` for every report, in chronological
+        order.
+        """
+        self.refresh()
+        return [
+            (os.path.basename(self._paths[date]), self._paths[date])
+            for date in self._dates
+        ]
+
+    def refresh(self):
+        """
+        Rebuilds the index if any scanned directory changed since the last
+        scan, loading it from ``cache_path`` first when available.
+        """
+        with self._lock:
+            if not self._dirs and self.cache_path:
+                self._load()
+            if self._is_stale():
+                self._scan()
+                self._save()
+
+    def _is_stale(self) -> bool:
+        if not self._dirs:
+            return True
+        for directory, mtime in self._dirs.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _scan(self):
+        dirs = {}
+        paths = {}
+        pending = [self.directory]
+
+        while pending:
+            directory = pending.pop()
+            try:
+                dirs[directory] = os.stat(directory).st_mtime_ns
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir():
+                    pending.append(entry.path)
+                    continue
+                match = REPORT_NAME.match(entry.name)
+                if match and entry.is_file():
+                    # Prefer the shallowest copy when a date appears twice
+                    date = match.group(1)
+                    if date not in paths or len(entry.path) < len(
+                        paths[date]
+                    ):
+                        paths[date] = entry.path
+
+        self._dirs = dirs
+        self._paths = paths
+        self._dates = sorted(paths)
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if data.get("directory") != os.path.abspath(self.directory):
+            return
+
+        self._dirs = data["dirs"]
+        self._paths = data["paths"]
+        self._dates = sorted(self._paths)
+
+    def _save(self):
+        if not self.cache_path:
+            return
+
+        atomic_write(self.cache_path, json.dumps({
+            "directory": os.path.abspath(self.directory),
+            "dirs": self._dirs,
+            "paths": self._paths,
+        }))
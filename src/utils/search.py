@@ -0,0 +1,272 @@
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from src.utils.files import atomic_write
+from src.utils.ingest import IngestLimits, read_report
+from src.utils.metrics import Metrics
+from src.utils.report_index import ReportIndex
+
+
+WORD = re.compile(r"\w{2,}")
+SECTION_BOUNDARY = re.compile(r"\n(?=#)")
+
+# Words too common in the reports to tell passages apart
+STOPWORDS = frozenset("""
+a ao aos as com como da das de do dos e em entre era foi for ha isso ja
+mais mas na nas no nos o os ou para pela pelo por que se sem ser sobre
+tambem um uma uns umas and are for from in is of on or the to was with
+""".split())
+
+# Passages longer than this are split at line boundaries
+MAX_PASSAGE_CHARS = 800
+
+INDEX_VERSION = 1
+
+
+class Passage(NamedTuple):
+    """A piece of a report and its relevance to the query."""
+
+    date: str
+    path: str
+    text: str
+    score: float
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lower-cased words without accents, so "Correção" matches "correcao",
+    minus stopwords.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [word for word in WORD.findall(text) if word not in STOPWORDS]
+
+
+def split_passages(text: str, max_chars: int = MAX_PASSAGE_CHARS) -> List[str]:
+    """
+    Splits a report at markdown section boundaries, and sections longer
+    than ``max_chars`` at line boundaries.
+    """
+    passages = []
+    for section in SECTION_BOUNDARY.split(text):
+        current = ""
+        for line in section.strip().split("\n"):
+            if current and len(current) + len(line) >= max_chars:
+                passages.append(current)
+                current = ""
+            current = f"{current}\n{line}" if current else line
+        if current.strip():
+            passages.append(current)
+    return passages
+
+
+class SearchIndex:
+    """
+    BM25 inverted index over the passages of every report.
+
+    The index is updated incrementally: only reports added, modified or
+    removed since the last refresh are read again, and it can be persisted
+    to ``cache_path`` so that a query over years of history costs a few
+    ``stat`` calls plus the lookup.
+    """
+
+    __slots__ = [
+        "index", "cache_path", "limits", "metrics", "k1", "b", "_docs",
+        "_postings", "_lock",
+    ]
+
+    def __init__(
+        self,
+        index: ReportIndex,
+        cache_path: Optional[str] = None,
+        limits: Optional[IngestLimits] = None,
+        metrics: Optional[Metrics] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.index = index
+        self.cache_path = cache_path
+        self.limits = limits or IngestLimits()
+        self.metrics = metrics or Metrics()
+        self.k1 = k1
+        self.b = b
+        # date -> {"path", "mtime", "size", "passages", "lengths"}
+        self._docs: Dict[str, dict] = {}
+        # term -> {"<date>#<passage>": term frequency}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 20,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Passage]:
+        """
+        Returns the ``top_k`` passages most relevant to ``query`` among the
+        reports between the two dates (inclusive, unbounded when None),
+        best first.
+        """
+        self.refresh()
+        start = start_date.strftime("%Y-%m-%d") if start_date else ""
+        end = end_date.strftime("%Y-%m-%d") if end_date else "9999-99-99"
+
+        with self._lock:
+            scores = self._score(tokenize(query), start, end)
+            best = sorted(scores.items(), key=lambda item: -item[1])
+
+            passages = []
+            for key, score in best[:top_k]:
+                date, number = key.split("#")
+                doc = self._docs[date]
+                passages.append(Passage(
+                    date, doc["path"], doc["passages"][int(number)], score
+                ))
+
+        self.metrics.add("search_passages", len(passages))
+        return passages
+
+    def _score(self, terms: List[str], start: str, end: str):
+        total = sum(len(doc["lengths"]) for doc in self._docs.values())
+        if not total:
+            return {}
+        average = sum(
+            sum(doc["lengths"]) for doc in self._docs.values()
+        ) / total
+
+        scores: Dict[str, float] = {}
+        for term in set(terms):
+            postings = self._postings.get(term, {})
+            idf = math.log(
+                1 + (total - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for key, frequency in postings.items():
+                date, number = key.split("#")
+                if not start <= date <= end:
+                    continue
+                length = self._docs[date]["lengths"][int(number)]
+                scores[key] = scores.get(key, 0.0) + idf * (
+                    frequency * (self.k1 + 1) / (frequency + self.k1 * (
+                        1 - self.b + self.b * length / average
+                    ))
+                )
+        return scores
+
+    def refresh(self):
+        """
+        Indexes the reports created or modified since the last refresh and
+        drops the removed ones, loading the index from ``cache_path``
+        first when available.
+        """
+        reports = self.index.all()
+
+        with self._lock:
+            if not self._docs and self.cache_path:
+                self._load()
+
+            changed = False
+            current = set()
+            for filename, path in reports:
+                date = filename[:10]
+                current.add(date)
+                if self._update(date, path):
+                    changed = True
+
+            for date in set(self._docs) - current:
+                self._remove(date)
+                changed = True
+
+            if changed:
+                self._save()
+
+    def _update(self, date: str, path: str) -> bool:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+
+        doc = self._docs.get(date)
+        if doc is not None and (doc["path"], doc["mtime"], doc["size"]) == (
+            path, stat.st_mtime_ns, stat.st_size
+        ):
+            return False
+
+        try:
+            content = read_report(path, self.limits, self.metrics)
+        except OSError as e:
+            print(f"[-] Erro ao indexar {path}: {e}")
+            return False
+
+        if doc is not None:
+            self._remove(date)
+        self._add(date, path, stat, split_passages(content))
+        self.metrics.add("search_reports_indexed")
+        return True
+
+    def _add(self, date, path, stat, passages):
+        lengths = []
+        for number, passage in enumerate(passages):
+            terms = Counter(tokenize(passage))
+            lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, {})[
+                    f"{date}#{number}"
+                ] = frequency
+
+        self._docs[date] = {
+            "path": path,
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "passages": passages,
+            "lengths": lengths,
+        }
+
+    def _remove(self, date):
+        doc = self._docs.pop(date)
+        for number, passage in enumerate(doc["passages"]):
+            key = f"{date}#{number}"
+            for term in set(tokenize(passage)):
+                postings = self._postings.get(term, {})
+                postings.pop(key, None)
+                if not postings:
+                    self._postings.pop(term, None)
+
+    def _header(self) -> dict:
+        # Anything that changes the indexed content invalidates the file
+        return {
+            "version": INDEX_VERSION,
+            "directory": os.path.abspath(self.index.directory),
+            "limits": list(self.limits),
+            "max_passage_chars": MAX_PASSAGE_CHARS,
+        }
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if data.get("header") != self._header():
+            return
+
+        self._docs = data["docs"]
+        self._postings = data["postings"]
+
+    def _save(self):
+        if not self.cache_path:
+            return
+
+        atomic_write(self.cache_path, json.dumps({
+            "header": self._header(),
+            "docs": self._docs,
+            "postings": self._postings,
+        }))
@@ -0,0 +1,82 @@
+import threading
+from collections import deque
+from typing import Iterable, Optional
+
+
+def percentile(values: Iterable[float], p: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of ``values``, with ``p`` between 0 and 1.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(p * len(ordered)) - 1))
+    return ordered[index]
+
+
+class RollingLatency:
+    """
+    Thread-safe window with the last ``window`` latencies of a backend.
+    """
+
+    __slots__ = ["_samples", "_lock"]
+
+    def __init__(self, window: int = 100):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            samples = list(self._samples)
+        return percentile(samples, p)
+
+
+class LatencyModel:
+    """
+    Learns the latency of a backend as a function of the prompt size,
+    ``seconds = base + per_token * tokens``, by least squares over the
+    last ``window`` calls.
+    """
+
+    __slots__ = ["_samples", "_lock"]
+
+    def __init__(self, window: int = 100):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, tokens: int, seconds: float):
+        with self._lock:
+            self._samples.append((tokens, seconds))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def predict(self, tokens: int) -> Optional[float]:
+        """
+        Expected latency for a prompt of ``tokens`` tokens, or None before
+        any call was observed.
+        """
+        with self._lock:
+            samples = list(self._samples)
+        if not samples:
+            return None
+
+        count = len(samples)
+        mean_tokens = sum(t for t, _ in samples) / count
+        mean_seconds = sum(s for _, s in samples) / count
+        variance = sum((t - mean_tokens) ** 2 for t, _ in samples)
+        if not variance:
+            return mean_seconds
+
+        # Latency never decreases with the prompt size
+        per_token = max(0.0, sum(
+            (t - mean_tokens) * (s - mean_seconds) for t, s in samples
+        ) / variance)
+        return max(0.0, mean_seconds + per_token * (tokens - mean_tokens))
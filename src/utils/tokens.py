@@ -0,0 +1,11 @@
+import math
+
+from src.config.settings import Config
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap pre-flight token estimate, based on the average number of
+    characters per token (``Config.CHARS_PER_TOKEN``).
+    """
+    return math.ceil(len(text) / Config.CHARS_PER_TOKEN)
@@ -0,0 +1,205 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from typing import Dict, Optional, Set, Tuple
+
+from src.utils.report_index import REPORT_NAME
+
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    | IN_DELETE_SELF
+)
+
+# struct inotify_event header: wd, mask, cookie, len (followed by the name)
+EVENT = struct.Struct("iIII")
+
+
+def is_report(path: str) -> bool:
+    return REPORT_NAME.match(os.path.basename(path)) is not None
+
+
+class PollingWatcher:
+    """
+    Portable watcher: rescans the directory tree every ``interval`` seconds
+    and compares the mtime and size of each report.
+    """
+
+    __slots__ = ["directory", "interval", "_files"]
+
+    def __init__(self, directory: str, interval: float = 1.0):
+        self.directory = directory
+        self.interval = interval
+        self._files = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        files = {}
+        stack = [self.directory]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                    elif is_report(entry.name):
+                        stat = entry.stat()
+                        files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    continue
+        return files
+
+    def poll(self, timeout: Optional[float] = None) -> Set[str]:
+        """
+        Returns the reports created, modified or deleted since the last
+        call, waiting up to ``timeout`` seconds (forever if None) for one.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            files = self._scan()
+            changed = {
+                path for path in files.keys() | self._files.keys()
+                if files.get(path) != self._files.get(path)
+            }
+            self._files = files
+            if changed:
+                return changed
+
+            remaining = self.interval
+            if deadline is not None:
+                remaining = min(remaining, deadline - time.monotonic())
+                if remaining <= 0:
+                    return set()
+            time.sleep(remaining)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+    Linux watcher backed by inotify (through ctypes, no dependency). Every
+    directory of the tree is watched, including the ones created later.
+    """
+
+    __slots__ = ["directory", "_libc", "_fd", "_dirs"]
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        library = ctypes.util.find_library("c")
+        if not library or not hasattr(ctypes.CDLL(library), "inotify_init1"):
+            raise OSError("inotify is not available")
+
+        self._libc = ctypes.CDLL(library, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._dirs: Dict[int, str] = {}
+        self._watch_tree(directory)
+        if not self._dirs:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+
+    def _watch_tree(self, directory: str) -> Set[str]:
+        """
+        Watches ``directory`` and its subdirectories, returning the reports
+        already inside them.
+        """
+        reports = set()
+        for root, _, files in os.walk(directory):
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(root), WATCH_MASK
+            )
+            if wd < 0:
+                # Removed meanwhile, or out of watches: skip it
+                continue
+            self._dirs[wd] = root
+            reports.update(
+                os.path.join(root, name) for name in files if is_report(name)
+            )
+        return reports
+
+    def poll(self, timeout: Optional[float] = None) -> Set[str]:
+        """
+        Returns the reports created, modified or deleted since the last
+        call, waiting up to ``timeout`` seconds (forever if None) for one.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0)
+
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            changed = self._read_events() if ready else set()
+            if changed or remaining == 0 or not ready:
+                return changed
+
+    def _read_events(self) -> Set[str]:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_DELETE_SELF:
+                self._dirs.pop(wd, None)
+                continue
+            if wd not in self._dirs or not name:
+                continue
+
+            path = os.path.join(self._dirs[wd], os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed |= self._watch_tree(path)
+            elif is_report(path):
+                changed.add(path)
+
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+def create_watcher(directory: str, interval: float = 1.0):
+    """
+    Returns an inotify watcher where available, otherwise a polling one.
+    """
+    try:
+        return InotifyWatcher(directory)
+    except (OSError, AttributeError):
+        return PollingWatcher(directory, interval)
+
+
+def wait_for_changes(watcher, debounce: float) -> Set[str]:
+    """
+    Blocks until reports change and then until no further change happens
+    for ``debounce`` seconds, returning every report changed meanwhile.
+    """
+    changed = watcher.poll()
+    while True:
+        more = watcher.poll(debounce)
+        if not more:
+            return changed
+        changed |= more
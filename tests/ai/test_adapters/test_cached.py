@@ -0,0 +1,125 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from src.ai.adapters.base import AIAdapter, Context
+from src.ai.adapters.cached import CachedAdapter
+from src.utils.cache import DiskCache
+
+
+class TestCachedAdapter:
+    """Test suite for CachedAdapter class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Setup fixtures for CachedAdapter tests."""
+        self.mock_ai = MagicMock(spec=AIAdapter)
+        self.mock_ai.generate_content.return_value = "Test response"
+        self.mock_ai.agenerate_content = AsyncMock(
+            return_value="Async response"
+        )
+        self.mock_ai.fingerprint.return_value = {"model": "test-model"}
+
+        self.cache = DiskCache(str(tmp_path / "cache"))
+        self.adapter = CachedAdapter(self.mock_ai, self.cache)
+
+    def test_cache_miss_calls_adapter(self):
+        """Test that the first call goes to the wrapped adapter."""
+        assert self.adapter.generate_content("prompt") == "Test response"
+        self.mock_ai.generate_content.assert_called_once_with("prompt")
+
+    def test_cache_hit_skips_adapter(self):
+        """Test that a repeated prompt is served from the cache."""
+        self.adapter.generate_content("prompt")
+        self.adapter.generate_content("prompt")
+
+        self.mock_ai.generate_content.assert_called_once()
+
+    def test_structured_cache_hit_skips_adapter(self):
+        """Test that structured results are cached per schema."""
+        self.mock_ai.generate_structured.return_value = {"a": ["b"]}
+
+        self.adapter.generate_structured("prompt", {"type": "object"})
+        result = self.adapter.generate_structured(
+            "prompt", {"type": "object"}
+        )
+        self.adapter.generate_structured("prompt", {"type": "array"})
+
+        assert result == {"a": ["b"]}
+        assert self.mock_ai.generate_structured.call_count == 2
+
+    def test_different_prompt_is_a_miss(self):
+        """Test that a different prompt is not served from the cache."""
+        self.adapter.generate_content("prompt")
+        self.adapter.generate_content("other prompt")
+
+        assert self.mock_ai.generate_content.call_count == 2
+
+    def test_fingerprint_change_is_a_miss(self):
+        """Test that changing the model invalidates cached responses."""
+        self.adapter.generate_content("prompt")
+        self.mock_ai.fingerprint.return_value = {"model": "other-model"}
+        self.adapter.generate_content("prompt")
+
+        assert self.mock_ai.generate_content.call_count == 2
+
+    def test_async_cache_hit_skips_adapter(self):
+        """Test that the async path reads and fills the same cache."""
+        first = asyncio.run(self.adapter.agenerate_content("prompt"))
+        second = asyncio.run(self.adapter.agenerate_content("prompt"))
+
+        assert first == second == "Async response"
+        self.mock_ai.agenerate_content.assert_awaited_once_with("prompt")
+        assert self.adapter.generate_content("prompt") == "Async response"
+        self.mock_ai.generate_content.assert_not_called()
+
+    def test_stream_miss_then_hit(self):
+        """Test that a fully consumed stream is cached."""
+        self.mock_ai.stream_content.return_value = iter(["Test ", "stream"])
+
+        assert list(self.adapter.stream_content("prompt")) == [
+            "Test ", "stream"
+        ]
+        assert list(self.adapter.stream_content("prompt")) == ["Test stream"]
+        self.mock_ai.stream_content.assert_called_once_with("prompt")
+
+    def test_interrupted_stream_is_not_cached(self):
+        """Test that a partially consumed stream is not stored."""
+        self.mock_ai.stream_content.return_value = iter(["Test ", "stream"])
+
+        stream = self.adapter.stream_content("prompt")
+        next(stream)
+        stream.close()
+
+        assert self.adapter.generate_content("prompt") == "Test response"
+
+    def test_context_is_uploaded_on_the_first_miss(self):
+        """Test that a context is only uploaded when a prompt misses."""
+        self.mock_ai.create_context.return_value = Context("week", "handle")
+        self.mock_ai.generate_with_context.return_value = "Test response"
+
+        context = self.adapter.create_context("week")
+        self.adapter.generate_with_context(context, "prompt")
+        self.adapter.delete_context(context)
+        context = self.adapter.create_context("week")
+        cached = self.adapter.generate_with_context(context, "prompt")
+        self.adapter.delete_context(context)
+
+        assert cached == "Test response"
+        self.mock_ai.create_context.assert_called_once_with("week")
+        self.mock_ai.generate_with_context.assert_called_once_with(
+            Context("week", "handle"), "prompt"
+        )
+        self.mock_ai.delete_context.assert_called_once()
+
+    def test_context_content_is_part_of_the_key(self):
+        """Test that the same prompt over another context is a miss."""
+        self.mock_ai.create_context.side_effect = Context
+        self.mock_ai.generate_with_context.return_value = "Test response"
+
+        for content in ("week 1", "week 2"):
+            self.adapter.generate_with_context(
+                self.adapter.create_context(content), "prompt"
+            )
+
+        assert self.mock_ai.generate_with_context.call_count == 2
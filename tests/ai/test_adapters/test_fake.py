@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import pytest
+
+from src.ai.adapters.base import parse_json_response
+from src.ai.adapters.fake import FakeAdapter
+from src.utils.render import SUMMARY_SCHEMA
+from src.utils.tokens import estimate_tokens
+
+
+class TestFakeAdapter:
+    """Test suite for FakeAdapter class."""
+
+    def test_generate_content(self):
+        """Test the canned response and call accounting."""
+        adapter = FakeAdapter(response="Fake summary")
+
+        assert adapter.generate_content("prompt") == "Fake summary"
+        assert adapter.calls == 1
+        assert adapter.prompt_chars == len("prompt")
+
+    def test_simulated_latency(self):
+        """Test that the latency and throughput are simulated."""
+        adapter = FakeAdapter(
+            latency=0.05, tokens_per_second=1000, response="x" * 200
+        )
+
+        start = time.perf_counter()
+        adapter.generate_content("prompt")
+        # 0.05s latency + 50 tokens at 1000 tokens/s
+        assert time.perf_counter() - start >= 0.1
+
+    def test_stream_content(self):
+        """Test that streaming yields the response in chunks."""
+        adapter = FakeAdapter(response="x" * 200, chunk_tokens=10)
+
+        chunks = list(adapter.stream_content("prompt"))
+
+        assert len(chunks) == 5
+        assert "".join(chunks) == "x" * 200
+
+    def test_agenerate_content(self):
+        """Test the async path."""
+        adapter = FakeAdapter(response="Fake summary", latency=0.01)
+
+        assert asyncio.run(adapter.agenerate_content("p")) == "Fake summary"
+
+    def test_generate_structured(self):
+        """Test that every property of the schema gets the response."""
+        adapter = FakeAdapter(response="Fake summary")
+
+        result = adapter.generate_structured("prompt", SUMMARY_SCHEMA)
+
+        assert result["activities"] == ["Fake summary"]
+        assert set(result) == {"activities", "bug_fixes", "features"}
+
+    def test_parse_json_response(self):
+        """Test parsing JSON answers of adapters without a JSON mode."""
+        assert parse_json_response(
+            'Claro:\n```json\n{"a": [1]}\n```'
+        ) == {"a": [1]}
+        assert parse_json_response('{"a": {"b": 2}} fim') == {
+            "a": {"b": 2}
+        }
+
+    def test_context(self):
+        """Test that a context is counted once and then as cached tokens."""
+        adapter = FakeAdapter(response="Fake summary")
+
+        context = adapter.create_context("x" * 400)
+        adapter.generate_with_context(context, "prompt")
+        asyncio.run(adapter.agenerate_with_context(context, "prompt"))
+        adapter.delete_context(context)
+
+        counters = adapter.metrics.snapshot()["counters"]
+        assert counters["context_uploads"] == 1
+        assert counters["cached_tokens"] == 2 * estimate_tokens("x" * 400)
+        assert adapter.prompt_chars == 2 * len("prompt")
+        with pytest.raises(ValueError):
+            adapter.generate_with_context(context, "prompt")
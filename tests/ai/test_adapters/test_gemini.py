@@ -1,6 +1,10 @@
+import asyncio
+
 import pytest
-from unittest.mock import patch, MagicMock
-from src.ai.adapters.gemini import GeminiAdapter
+from google.api_core import exceptions as google_exceptions
+from unittest.mock import AsyncMock, patch, MagicMock
+from src.ai.adapters.gemini import GeminiAdapter, retry_hint
+from src.config.settings import Config
 
 
 class TestGeminiAdapter:
@@ -9,9 +13,14 @@ class TestGeminiAdapter:
     @pytest.fixture(autouse=True)
     def setup(self):
         """Setup fixtures for GeminiAdapter tests."""
-        with patch("src.ai.adapters.gemini.genai") as mock_genai:
+        with patch("src.ai.adapters.gemini.genai") as mock_genai, patch(
+            "src.ai.adapters.gemini_sdk.genai_client"
+        ) as mock_client:
             mock_genai.GenerativeModel.return_value = MagicMock()
             self.mock_genai = mock_genai
+            self.mock_client = mock_client
+            self.manager = mock_client._ClientManager.return_value
+            self.model = mock_genai.GenerativeModel.return_value
             self.adapter = GeminiAdapter(
                 system_instruction="Test instruction",
                 api_key="test_key",
@@ -23,10 +32,51 @@ class TestGeminiAdapter:
         """Test if GeminiAdapter is properly initialized."""
         assert self.adapter._api_key == "test_key"
 
-        self.mock_genai.configure.assert_called_once_with(api_key="test_key")
+        self.manager.configure.assert_called_once_with(api_key="test_key")
+        self.mock_genai.configure.assert_not_called()
         self.mock_genai.GenerativeModel.assert_called_once_with(
             "test-model", system_instruction="Test instruction"
         )
+        assert self.model._client == (
+            self.manager.get_default_client.return_value
+        )
+
+    def test_custom_endpoint(self):
+        """Test that the transport and endpoint are passed to the SDK."""
+        GeminiAdapter(
+            "Test instruction", api_key="test_key", transport="rest",
+            api_endpoint="http://127.0.0.1:8080",
+        )
+
+        self.manager.configure.assert_called_with(
+            api_key="test_key", transport="rest",
+            client_options={"api_endpoint": "http://127.0.0.1:8080"},
+        )
+
+    def test_one_client_per_key(self):
+        """Test that every key gets its own client and its own limits."""
+        with pytest.MonkeyPatch.context() as mp:
+            # Config caches what it read, so the environment may be stale
+            mp.setattr(Config, "GEMINI_API_KEYS", "key-1,key-2")
+            adapter = GeminiAdapter("Test instruction")
+
+        assert [
+            call.kwargs["api_key"]
+            for call in self.manager.configure.call_args_list[1:]
+        ] == ["key-1", "key-2"]
+        first, second = adapter._pool.slots
+        assert first.resilience.limiter is not second.resilience.limiter
+        assert first.resilience.breaker is not second.resilience.breaker
+
+    def test_requests_are_sharded_across_keys(self):
+        """Test that consecutive requests use different keys."""
+        self.model.generate_content.return_value.text = "Test response"
+        adapter = GeminiAdapter("Test instruction", api_keys="key-1,key-2")
+
+        adapter.generate_content("First")
+        adapter.generate_content("Second")
+
+        assert [s["requests"] for s in adapter.key_stats()] == [1, 1]
 
     def test_generate_content(self):
         """Test if generate_content method works correctly."""
@@ -35,15 +85,151 @@ class TestGeminiAdapter:
 
         mock_response = MagicMock()
         mock_response.text = expected_response
-        self.adapter._model.generate_content.return_value = mock_response
+        self.model.generate_content.return_value = mock_response
 
         result = self.adapter.generate_content(test_message)
 
-        self.adapter._model.generate_content.assert_called_once_with(
+        self.model.generate_content.assert_called_once_with(
             test_message,
             generation_config=(
-                self.adapter._model.generate_content.call_args[1]
+                self.model.generate_content.call_args[1]
                 ["generation_config"]
             ),
         )
         assert result == expected_response
+
+    def test_generate_structured(self):
+        """Test that structured output uses the JSON mode and schema."""
+        mock_response = MagicMock()
+        mock_response.text = '{"activities": ["Deploy"]}'
+        self.model.generate_content.return_value = mock_response
+        schema = {"type": "object"}
+
+        result = self.adapter.generate_structured("Test message", schema)
+
+        assert result == {"activities": ["Deploy"]}
+        self.mock_genai.types.GenerationConfig.assert_called_with(
+            candidate_count=1,
+            response_mime_type="application/json",
+            response_schema=schema,
+        )
+
+    def test_agenerate_content(self):
+        """Test if agenerate_content uses the SDK async call."""
+        mock_response = MagicMock()
+        mock_response.text = "Async response"
+        self.model.generate_content_async = AsyncMock(
+            return_value=mock_response
+        )
+
+        result = asyncio.run(self.adapter.agenerate_content("Test message"))
+
+        self.model.generate_content_async.assert_awaited_once()
+        self.model.generate_content.assert_not_called()
+        assert result == "Async response"
+
+    def test_stream_content(self):
+        """Test if stream_content yields the chunks as they arrive."""
+        chunks = []
+        for text in ["Hello", "", " world"]:
+            chunk = MagicMock()
+            chunk.text = text
+            chunks.append(chunk)
+        self.model.generate_content.return_value = iter(chunks)
+
+        result = list(self.adapter.stream_content("Test message"))
+
+        assert result == ["Hello", " world"]
+        assert self.model.generate_content.call_args[1]["stream"]
+
+    def test_generate_content_records_usage(self):
+        """Test that token usage and timings are recorded."""
+        mock_response = MagicMock()
+        mock_response.text = "Test response"
+        mock_response.usage_metadata.prompt_token_count = 120
+        mock_response.usage_metadata.candidates_token_count = 30
+        self.model.generate_content.return_value = mock_response
+
+        self.adapter.generate_content("Test message")
+
+        snapshot = self.adapter.metrics.snapshot()
+        assert snapshot["counters"] == {
+            "requests": 1, "prompt_tokens": 120, "response_tokens": 30
+        }
+        assert snapshot["stages"]["model_call"]["calls"] == 1
+
+    def test_generate_content_retries_quota_errors(self):
+        """Test that 429/503 errors are retried with backoff."""
+        mock_response = MagicMock()
+        mock_response.text = "Test response"
+        self.model.generate_content.side_effect = [
+            google_exceptions.ResourceExhausted("Please retry in 0s"),
+            google_exceptions.ServiceUnavailable("unavailable"),
+            mock_response,
+        ]
+        self.adapter._pool.slots[0].resilience.retry.max_delay = 0
+
+        assert self.adapter.generate_content("Test message") == (
+            "Test response"
+        )
+        assert self.model.generate_content.call_count == 3
+        assert self.adapter.metrics.counters["retries"] == 2
+
+    def test_generate_content_does_not_retry_bad_requests(self):
+        """Test that client errors are raised right away."""
+        self.model.generate_content.side_effect = (
+            google_exceptions.InvalidArgument("bad request")
+        )
+
+        with pytest.raises(google_exceptions.InvalidArgument):
+            self.adapter.generate_content("Test message")
+        self.model.generate_content.assert_called_once()
+
+    @pytest.mark.parametrize("error, expected", [
+        (google_exceptions.ResourceExhausted("Please retry in 23.5s."), 23.5),
+        (google_exceptions.ServiceUnavailable("unavailable"), None),
+    ])
+    def test_retry_hint(self, error, expected):
+        """Test reading the server retry hint from errors."""
+        assert retry_hint(error) == expected
+
+    def test_retry_hint_from_retry_info(self):
+        """Test reading the retry delay from a RetryInfo detail."""
+        detail = MagicMock()
+        detail.retry_delay.seconds = 4
+        detail.retry_delay.nanos = 500_000_000
+        del detail.retry_delay.total_seconds
+        error = google_exceptions.ResourceExhausted(
+            "quota", details=[detail]
+        )
+
+        assert retry_hint(error) == 4.5
+
+    def test_small_context_is_sent_with_every_prompt(self):
+        """Test that content below the cacheable minimum is not uploaded."""
+        self.model.generate_content.return_value.text = "Test response"
+
+        context = self.adapter.create_context("Relatórios")
+        self.adapter.generate_with_context(context, "Resuma")
+
+        assert context.handle is None
+        self.manager.get_default_client("cache") \
+            .create_cached_content.assert_not_called()
+        assert self.model.generate_content.call_args[0][0] == (
+            "Relatórios\n\nResuma"
+        )
+
+    def test_refused_context_falls_back(self):
+        """Test that a model refusing the cache falls back to the prompt."""
+        cache_client = self.manager.get_default_client.return_value
+        cache_client.create_cached_content.side_effect = (
+            google_exceptions.InvalidArgument("too small")
+        )
+        adapter = GeminiAdapter(
+            "Test instruction", api_key="test_key", context_min_tokens=0
+        )
+
+        context = adapter.create_context("Relatórios")
+
+        assert context.handle is None
+        assert adapter.metrics.counters["context_fallbacks"] == 1
@@ -0,0 +1,47 @@
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+import google.generativeai as genai
+import pytest
+from src.ai.adapters import gemini_sdk
+
+
+class TestGeminiSDK:
+    """Tests the private SDK APIs the Gemini adapter relies on."""
+
+    def test_pinned_sdk_has_the_internals(self):
+        """Test that the pinned SDK still has every private attribute."""
+        requirements = Path(__file__).parents[3] / "requirements.txt"
+        pinned = re.search(
+            r"^google-generativeai==(\S+)", requirements.read_text(), re.M
+        ).group(1)
+
+        assert genai.__version__ == pinned
+        assert pinned.startswith(gemini_sdk.TESTED_VERSION)
+        assert gemini_sdk.missing_internals() == []
+
+    def test_missing_internals_fail_loudly(self):
+        """Test that an SDK without the private client manager is refused."""
+        with patch.object(gemini_sdk, "genai_client", object()):
+            with pytest.raises(gemini_sdk.UnsupportedSDKError) as error:
+                gemini_sdk.check_sdk.__wrapped__()
+
+        assert "_ClientManager" in str(error.value)
+
+    def test_untested_version_warns(self):
+        """Test that another release line is used with a warning."""
+        with patch.object(genai, "__version__", "0.9.0"):
+            with pytest.warns(RuntimeWarning, match="0.9.0"):
+                gemini_sdk.check_sdk.__wrapped__()
+
+    def test_bind(self):
+        """Test that a model is pointed at a private client manager."""
+        manager = gemini_sdk.client_manager("test_key", transport="rest")
+        model = gemini_sdk.bind(
+            genai.GenerativeModel("gemini-test"), manager,
+            cached_content="cachedContents/test",
+        )
+
+        assert model._client is manager.get_default_client("generative")
+        assert model.cached_content == "cachedContents/test"
@@ -0,0 +1,113 @@
+import asyncio
+import subprocess
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.ai.adapters.fake import FakeAdapter
+from src.ai.adapters.hedged import HedgedAdapter, hedged_adapter
+
+
+class TestHedgedAdapter:
+    """Test suite for HedgedAdapter class."""
+
+    def test_fast_primary_is_not_hedged(self):
+        """Test that a backend answering in time is the only one called."""
+        primary = FakeAdapter(response="primary")
+        secondary = FakeAdapter(response="secondary")
+        adapter = HedgedAdapter([primary, secondary], default_delay=1)
+
+        assert adapter.generate_content("prompt") == "primary"
+        assert secondary.calls == 0
+        assert adapter.metrics.counters.get("hedged_requests", 0) == 0
+
+    def test_slow_primary_is_hedged(self):
+        """Test that the next backend wins when the first one is slow."""
+        primary = FakeAdapter(response="primary", latency=1)
+        secondary = FakeAdapter(response="secondary")
+        adapter = HedgedAdapter([primary, secondary], default_delay=0.05)
+
+        start = time.perf_counter()
+        assert adapter.generate_content("prompt") == "secondary"
+        assert time.perf_counter() - start < 0.5
+        assert adapter.metrics.counters["hedged_requests"] == 1
+        assert adapter.metrics.counters["hedge_wins"] == 1
+
+    def test_loser_does_not_delay_exit(self):
+        """Test that an abandoned slow call does not hold the process."""
+        script = (
+            "from src.ai.adapters.fake import FakeAdapter\n"
+            "from src.ai.adapters.hedged import HedgedAdapter\n"
+            "HedgedAdapter([FakeAdapter(latency=5), FakeAdapter()],\n"
+            "              default_delay=0.05).generate_content('prompt')\n"
+        )
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script], check=True)
+        assert time.perf_counter() - start < 4
+
+    def test_failed_backend_falls_back(self):
+        """Test that an error launches the next backend right away."""
+        primary = MagicMock()
+        primary.generate_content.side_effect = RuntimeError("down")
+        secondary = FakeAdapter(response="secondary")
+        adapter = HedgedAdapter([primary, secondary], default_delay=10)
+
+        start = time.perf_counter()
+        assert adapter.generate_content("prompt") == "secondary"
+        assert time.perf_counter() - start < 1
+
+    def test_all_backends_fail(self):
+        """Test that the last error is raised when every backend fails."""
+        backends = [MagicMock(), MagicMock()]
+        backends[0].generate_content.side_effect = RuntimeError("first")
+        backends[1].generate_content.side_effect = RuntimeError("second")
+        adapter = HedgedAdapter(backends, default_delay=10)
+
+        with pytest.raises(RuntimeError, match="second"):
+            adapter.generate_content("prompt")
+
+    def test_hedge_delay_uses_observed_latency(self):
+        """Test that the delay follows the rolling percentile."""
+        adapter = HedgedAdapter(
+            [FakeAdapter()], default_delay=5, min_samples=3
+        )
+        assert adapter.hedge_delay(0) == 5
+
+        for seconds in (0.1, 0.2, 0.3):
+            adapter.latencies[0].add(seconds)
+
+        assert adapter.hedge_delay(0) == 0.3
+
+    def test_agenerate_cancels_loser(self):
+        """Test that the async path cancels the request that lost."""
+        primary = FakeAdapter(response="primary", latency=5)
+        secondary = FakeAdapter(response="secondary")
+        adapter = HedgedAdapter([primary, secondary], default_delay=0.05)
+
+        async def run():
+            result = await adapter.agenerate_content("prompt")
+            tasks = asyncio.all_tasks() - {asyncio.current_task()}
+            await asyncio.sleep(0)
+            return result, [task for task in tasks if not task.done()]
+
+        start = time.perf_counter()
+        result, leftover = asyncio.run(run())
+
+        assert result == "secondary"
+        assert leftover == []
+        assert time.perf_counter() - start < 1
+
+    def test_fingerprint(self):
+        """Test that the fingerprint covers every backend."""
+        adapter = hedged_adapter(backends="fake:a, fake:b")
+
+        assert adapter.fingerprint() == {
+            "adapter": "hedged",
+            "backends": [
+                {"adapter": "fake", "model": "a"},
+                {"adapter": "fake", "model": "b"},
+            ],
+        }
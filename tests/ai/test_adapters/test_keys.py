@@ -0,0 +1,151 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from src.ai.adapters.keys import KeyPool, KeySlot, mask_key, parse_keys
+from src.ai.adapters.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Resilience,
+    RetryPolicy,
+)
+
+
+class RetryableError(Exception):
+    """Error that the tests treat as transient."""
+
+
+class RateLimitError(RetryableError):
+    """Error that the tests treat as a 429."""
+
+
+class TestKeyPool:
+    """Test suite for KeyPool class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup a pool of three keys whose clients are their names."""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("src.ai.adapters.resilience.time.sleep", lambda s: 0)
+            self.pool = KeyPool([
+                KeySlot(key, key, Resilience(
+                    lambda error: isinstance(error, RetryableError),
+                    lambda error: (
+                        30.0 if isinstance(error, RateLimitError) else None
+                    ),
+                    retry=RetryPolicy(max_retries=1, base_delay=0),
+                    breaker=CircuitBreaker(failure_threshold=1),
+                    is_rate_limited=lambda error: isinstance(
+                        error, RateLimitError
+                    ),
+                ))
+                for key in ("key-a", "key-b", "key-c")
+            ])
+            yield
+
+    def test_requests_are_sharded_across_keys(self):
+        """Test that idle keys are used in turns."""
+        used = [self.pool.call(lambda client: client) for _ in range(6)]
+
+        assert used == ["key-a", "key-b", "key-c"] * 2
+        assert [s["requests"] for s in self.pool.stats()] == [2, 2, 2]
+
+    def test_least_busy_key_is_chosen(self):
+        """Test that keys with requests in flight are avoided."""
+        self.pool.slots[0].in_flight = 2
+        self.pool.slots[1].in_flight = 1
+
+        assert self.pool.call(lambda client: client) == "key-c"
+
+    def test_unhealthy_keys_are_skipped(self):
+        """Test that a key whose circuit is open gets no requests."""
+        self.pool.slots[1].resilience.breaker.record_failure()
+
+        used = {self.pool.call(lambda client: client) for _ in range(4)}
+
+        assert used == {"key-a", "key-c"}
+        assert not self.pool.stats()[1]["healthy"]
+
+    def test_fails_over_when_the_circuit_opens(self):
+        """Test that a key failing until its circuit opens hands over."""
+        func = MagicMock(side_effect=[RetryableError(), "ok"])
+
+        assert self.pool.call(func) == "ok"
+        assert [call.args[0] for call in func.call_args_list] == [
+            "key-a", "key-b"
+        ]
+        assert self.pool.metrics.counters["key_failovers"] == 1
+        assert self.pool.stats()[0]["errors"] == 1
+
+    def test_raises_when_every_circuit_is_open(self):
+        """Test that the error surfaces once no key is left."""
+        for slot in self.pool.slots:
+            slot.resilience.breaker.record_failure()
+
+        with pytest.raises(CircuitOpenError):
+            self.pool.call(lambda client: client)
+        assert all(s["in_flight"] == 0 for s in self.pool.stats())
+
+    def test_pinned_call_does_not_fail_over(self):
+        """Test that a call pinned to a client stays on its key."""
+        client = self.pool.slots[1].client
+        self.pool.slots[1].resilience.breaker.record_failure()
+
+        pinned = self.pool.call(
+            lambda c: c, client=self.pool.slots[2].client
+        )
+
+        assert pinned == "key-c"
+        with pytest.raises(CircuitOpenError):
+            self.pool.call(lambda c: c, client=client)
+        assert "key_failovers" not in self.pool.metrics.counters
+
+    def test_rate_limited_request_moves_to_another_key(self):
+        """Test that a 429 is not retried on the key that returned it."""
+        func = MagicMock(side_effect=[RateLimitError(), "ok", "ok"])
+
+        assert self.pool.call(func) == "ok"
+        self.pool.call(func)
+
+        assert [call.args[0] for call in func.call_args_list] == [
+            "key-a", "key-b", "key-c"
+        ]
+        assert self.pool.metrics.counters["key_rotations"] == 1
+        assert [s["throttled"] for s in self.pool.stats()] == [
+            True, False, False
+        ]
+        assert not self.pool.slots[0].resilience.breaker.is_open
+
+    def test_last_key_retries_rate_limits(self):
+        """Test that once every key was tried the last one retries."""
+        func = MagicMock(side_effect=[RateLimitError()] * 3 + ["ok"])
+
+        assert self.pool.call(func) == "ok"
+        assert [call.args[0] for call in func.call_args_list] == [
+            "key-a", "key-b", "key-c", "key-c"
+        ]
+        assert self.pool.metrics.counters["key_rotations"] == 2
+
+    def test_acall(self):
+        """Test the async path shards and fails over as well."""
+        attempts = []
+
+        async def func(client):
+            attempts.append(client)
+            if len(attempts) == 1:
+                raise RetryableError()
+            return client
+
+        assert asyncio.run(self.pool.acall(func)) == "key-b"
+        assert attempts == ["key-a", "key-b"]
+
+    def test_parse_keys(self):
+        """Test reading a comma separated list of keys."""
+        assert parse_keys(" a, b,,a ") == ["a", "b"]
+        assert parse_keys(["a", None, "b"]) == ["a", "b"]
+        assert parse_keys(None) == []
+
+    def test_mask_key(self):
+        """Test that only the end of a key is shown."""
+        assert mask_key("AIzaSyExample1234") == "...1234"
+        assert mask_key("short") == "..."
@@ -0,0 +1,102 @@
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+from src.ai.adapters import registry
+from src.ai.adapters.base import AIAdapter
+from src.ai.adapters.registry import (
+    LazyAdapter,
+    available_adapters,
+    create_adapter,
+    register_adapter,
+)
+
+
+class DummyAdapter(AIAdapter):
+    """Adapter used to exercise the registry."""
+
+    instances = []
+
+    def __init__(self, model=None, api_key=None):
+        self._model_name = model
+        self._api_key = api_key
+        DummyAdapter.instances.append(self)
+
+    def generate_content(self, message):
+        return f"{self._model_name}: {message}"
+
+
+class TestRegistry:
+    """Test suite for the adapter registry."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Register the dummy adapter for the duration of a test."""
+        DummyAdapter.instances = []
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(registry, "_ADAPTERS", dict(registry._ADAPTERS))
+            register_adapter(
+                "dummy",
+                f"{__name__}:DummyAdapter",
+                lambda: {"model": "default-model"},
+            )
+            yield
+
+    def test_available_adapters(self):
+        """Test that registered providers are listed."""
+        assert "gemini" in available_adapters()
+        assert "dummy" in available_adapters()
+
+    def test_create_adapter_fills_defaults(self):
+        """Test that provider defaults are used for missing options."""
+        adapter = create_adapter("dummy", api_key=None)
+        assert adapter.generate_content("hi") == "default-model: hi"
+
+        adapter = create_adapter("dummy", model="other-model")
+        assert adapter.generate_content("hi") == "other-model: hi"
+
+    def test_unknown_provider(self):
+        """Test that an unknown provider raises ValueError."""
+        with pytest.raises(ValueError):
+            create_adapter("unknown")
+
+    def test_lazy_adapter_builds_on_first_call(self):
+        """Test that LazyAdapter only instantiates when generating."""
+        adapter = LazyAdapter("dummy", api_key="secret")
+        fingerprint = adapter.fingerprint()
+
+        assert DummyAdapter.instances == []
+        assert fingerprint == {"adapter": "dummy", "model": "default-model"}
+
+        assert adapter.generate_content("hi") == "default-model: hi"
+        adapter.generate_content("again")
+        assert len(DummyAdapter.instances) == 1
+
+    def test_gemini_is_imported_lazily(self):
+        """Test that the gemini adapter module is only imported on use."""
+        import src.ai.adapters
+        import src.ai.adapters.gemini
+
+        with pytest.MonkeyPatch.context() as mp:
+            # Restored on exit, so other tests keep the original modules
+            for name in ("gemini", "gemini_sdk"):
+                mp.delattr(src.ai.adapters, name)
+                mp.delitem(sys.modules, f"src.ai.adapters.{name}")
+            mp.setitem(sys.modules, "google.generativeai", MagicMock())
+
+            adapter = LazyAdapter("gemini", system_instruction="Test")
+            adapter.fingerprint()
+            assert "src.ai.adapters.gemini" not in sys.modules
+            assert "src.ai.adapters.gemini_sdk" not in sys.modules
+
+            adapter.adapter
+            assert "src.ai.adapters.gemini" in sys.modules
+
+    def test_hedged_provider_is_registered(self):
+        """Test that the hedged factory builds lazy backends."""
+        adapter = create_adapter("hedged", backends="fake,fake:other")
+
+        assert [b.fingerprint()["adapter"] for b in adapter.backends] == [
+            "fake", "fake",
+        ]
+        assert adapter.generate_content("hi")
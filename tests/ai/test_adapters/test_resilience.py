@@ -0,0 +1,211 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from src.ai.adapters.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimiter,
+    Resilience,
+    RetryPolicy,
+    SlidingWindow,
+)
+
+
+class RetryableError(Exception):
+    """Error that the tests treat as transient."""
+
+
+class TestSlidingWindow:
+    """Test suite for SlidingWindow and RateLimiter classes."""
+
+    def test_burst_up_to_limit(self):
+        """Test that an unused window serves a burst without waiting."""
+        window = SlidingWindow(60)
+        assert all(window.reserve() == 0 for _ in range(60))
+
+    def test_no_window_goes_over_the_limit(self):
+        """Test that the quota holds in the first minute too."""
+        window = SlidingWindow(15)
+
+        waits = [window.reserve() for _ in range(30)]
+
+        assert sum(wait < 59 for wait in waits) == 15
+        assert waits[15] == pytest.approx(60, abs=0.01)
+
+    def test_waits_for_the_oldest_units_to_leave(self):
+        """Test that weighted reservations wait for enough room."""
+        window = SlidingWindow(100)
+        window.reserve(60)
+        window.reserve(30)
+
+        assert window.reserve(20) == pytest.approx(60, abs=0.01)
+
+    def test_oversized_request_is_capped(self):
+        """Test that a request bigger than the limit still fits."""
+        window = SlidingWindow(100)
+        assert window.reserve(1000) == 0
+
+    def test_rate_limiter_uses_the_slowest_bucket(self):
+        """Test that requests and tokens are limited together."""
+        limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=60)
+        limiter.reserve(tokens=60)
+
+        assert limiter.reserve(tokens=30) == pytest.approx(60, abs=0.1)
+
+    def test_disabled_rate_limiter(self):
+        """Test that a limiter without limits never waits."""
+        limiter = RateLimiter()
+        assert all(limiter.reserve(10 ** 6) == 0 for _ in range(100))
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker class."""
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_half_open_trial(self):
+        """Test that a single trial call is allowed after the timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        breaker.before_call()
+        assert not breaker.is_open
+
+
+class TestResilience:
+    """Test suite for Resilience class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup fixtures with sleeps recorded instead of waited."""
+        self.sleeps = []
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(
+                "src.ai.adapters.resilience.time.sleep", self.sleeps.append
+            )
+            self.resilience = Resilience(
+                lambda error: isinstance(error, RetryableError),
+                lambda error: 7.0 if "hint" in str(error) else None,
+                retry=RetryPolicy(max_retries=3, base_delay=1, max_delay=4),
+                breaker=CircuitBreaker(failure_threshold=10),
+            )
+            yield
+
+    def test_retries_transient_errors(self):
+        """Test that transient errors are retried with backoff."""
+        func = MagicMock(side_effect=[
+            RetryableError(), RetryableError(), "ok"
+        ])
+
+        assert self.resilience.call(func) == "ok"
+        assert func.call_count == 3
+        assert self.resilience.metrics.counters["retries"] == 2
+        retry_sleeps = [s for s in self.sleeps if s]
+        assert len(retry_sleeps) <= 2
+        assert all(s <= 4 for s in retry_sleeps)
+
+    def test_honors_retry_hint(self):
+        """Test that the server retry hint is the minimum delay."""
+        func = MagicMock(side_effect=[RetryableError("hint"), "ok"])
+
+        self.resilience.call(func)
+
+        assert 7.0 in self.sleeps
+
+    def test_gives_up_after_max_retries(self):
+        """Test that the last error is raised when retries run out."""
+        func = MagicMock(side_effect=RetryableError())
+
+        with pytest.raises(RetryableError):
+            self.resilience.call(func)
+        assert func.call_count == 4
+
+    def test_does_not_retry_other_errors(self):
+        """Test that permanent errors are raised immediately."""
+        func = MagicMock(side_effect=ValueError("bad request"))
+
+        with pytest.raises(ValueError):
+            self.resilience.call(func)
+        func.assert_called_once()
+
+    def test_fails_fast_when_circuit_is_open(self):
+        """Test that an open circuit rejects calls without calling."""
+        self.resilience.breaker = CircuitBreaker(failure_threshold=1)
+        func = MagicMock(side_effect=RetryableError())
+
+        with pytest.raises(CircuitOpenError):
+            self.resilience.call(func)
+        func.assert_called_once()
+
+    def test_acall_retries(self):
+        """Test the async path retries transient errors."""
+        attempts = []
+
+        async def func():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise RetryableError("hint")
+            return "ok"
+
+        self.resilience.retry.max_delay = 0
+        self.resilience.retry_hint = lambda error: 0
+        assert asyncio.run(self.resilience.acall(func)) == "ok"
+        assert len(attempts) == 2
+
+    def test_rate_limits_do_not_open_the_circuit(self):
+        """Test that 429s are retried without tripping the breaker."""
+        self.resilience.breaker = CircuitBreaker(failure_threshold=1)
+        self.resilience.is_rate_limited = (
+            lambda error: "quota" in str(error)
+        )
+        func = MagicMock(side_effect=[
+            RetryableError("quota"), RetryableError("quota"), "ok",
+        ])
+
+        assert self.resilience.call(func) == "ok"
+        assert not self.resilience.breaker.is_open
+
+    def test_cancelled_trial_is_released(self):
+        """Test that a cancelled half-open trial does not block the circuit."""
+        self.resilience.breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=0
+        )
+        self.resilience.breaker.record_failure()
+
+        async def cancelled():
+            raise asyncio.CancelledError()
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(self.resilience.acall(cancelled))
+        with pytest.raises(KeyboardInterrupt):
+            self.resilience.call(MagicMock(side_effect=KeyboardInterrupt))
+
+        assert self.resilience.call(lambda: "ok") == "ok"
+        assert not self.resilience.breaker.is_open
+
+    def test_clone_has_its_own_limiter_and_breaker(self):
+        """Test that a clone shares the settings but not the state."""
+        self.resilience.limiter = RateLimiter(requests_per_minute=1)
+        self.resilience.limiter.reserve()
+        self.resilience.breaker.record_failure()
+
+        clone = self.resilience.clone()
+
+        assert clone.retry is self.resilience.retry
+        assert clone.limiter.reserve() == 0
+        assert clone.breaker.failure_threshold == 10
+        assert clone.breaker._failures == 0
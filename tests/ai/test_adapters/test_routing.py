@@ -0,0 +1,65 @@
+import asyncio
+
+from src.ai.adapters.fake import FakeAdapter
+from src.ai.adapters.routing import RoutingAdapter, Tier, routing_adapter
+from src.utils.metrics import labeled
+
+
+class TestRoutingAdapter:
+    """Test suite for RoutingAdapter class."""
+
+    def tiers(self, small_latency=0.0):
+        self.small = FakeAdapter(response="small", latency=small_latency)
+        self.large = FakeAdapter(response="large")
+        return [
+            Tier("small", self.small, max_tokens=100),
+            Tier("large", self.large),
+        ]
+
+    def test_routes_by_prompt_size(self):
+        """Test that small prompts go to the small tier."""
+        adapter = RoutingAdapter(self.tiers())
+
+        assert adapter.generate_content("x" * 40) == "small"
+        assert adapter.generate_content("x" * 4000) == "large"
+        counters = adapter.metrics.counters
+        assert counters[labeled("routed_requests", tier="small")] == 1
+        assert counters[labeled("routed_requests", tier="large")] == 1
+
+    def test_latency_target_learns_slow_tier(self):
+        """Test that a tier missing the target stops receiving requests."""
+        adapter = RoutingAdapter(
+            self.tiers(small_latency=0.05), latency_target=0.01,
+            min_samples=2,
+        )
+
+        responses = [adapter.generate_content("x" * 40) for _ in range(4)]
+
+        assert responses == ["small", "small", "large", "large"]
+        assert adapter.latencies[0].predict(10) >= 0.05
+
+    def test_fastest_tier_when_none_meets_target(self):
+        """Test that the fastest tier wins when every tier is too slow."""
+        adapter = RoutingAdapter(self.tiers(), latency_target=0.001)
+        adapter.latencies[0].add(10, 1.0)
+        adapter.latencies[1].add(10, 0.5)
+        adapter.min_samples = 1
+
+        assert adapter.route(10) == 1
+
+    def test_async_and_stream(self):
+        """Test that the async and streaming paths are routed too."""
+        adapter = RoutingAdapter(self.tiers())
+
+        assert asyncio.run(adapter.agenerate_content("hi")) == "small"
+        assert "".join(adapter.stream_content("x" * 4000)) == "large"
+        assert len(adapter.latencies[1]) == 1
+
+    def test_routing_adapter_factory(self):
+        """Test parsing of the provider:model@max_tokens tiers."""
+        adapter = routing_adapter(tiers="fake:tiny@500,fake")
+
+        assert [(t.name, t.max_tokens) for t in adapter.tiers] == [
+            ("tiny", 500), ("fake", None),
+        ]
+        assert adapter.generate_content("hi")
@@ -0,0 +1,71 @@
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from src.ai.services.batch import BatchSummarizer
+from src.ai.services.summarizer import WeeklySummarizer
+
+
+class TestBatchSummarizer:
+    """Test suite for BatchSummarizer class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup fixtures for BatchSummarizer tests."""
+        self.mock_summarizer = MagicMock(spec=WeeklySummarizer)
+        self.mock_summarizer.generate_weekly_summary.side_effect = (
+            lambda start, end: f"Summary {start.day}-{end.day}"
+        )
+        self.ranges = [
+            (datetime(2025, 1, 5), datetime(2025, 1, 11)),
+            (datetime(2025, 1, 12), datetime(2025, 1, 18)),
+            (datetime(2025, 1, 19), datetime(2025, 1, 25)),
+        ]
+
+    def test_run_summarizes_every_range(self):
+        """Test that every range produces a result."""
+        batch = BatchSummarizer(self.mock_summarizer, concurrency=2)
+        results = sorted(batch.run(self.ranges))
+
+        assert [r.summary for r in results] == [
+            "Summary 5-11", "Summary 12-18", "Summary 19-25"
+        ]
+        assert all(r.error is None for r in results)
+
+    def test_run_reports_errors_per_range(self):
+        """Test that a failing range does not stop the others."""
+        def generate(start, end):
+            if start.day == 12:
+                raise RuntimeError("quota")
+            return "ok"
+
+        self.mock_summarizer.generate_weekly_summary.side_effect = generate
+        batch = BatchSummarizer(self.mock_summarizer)
+        results = {r.start_date.day: r for r in batch.run(self.ranges)}
+
+        assert isinstance(results[12].error, RuntimeError)
+        assert results[5].summary == "ok"
+        assert results[19].summary == "ok"
+
+    def test_run_respects_concurrency(self):
+        """Test that no more than ``concurrency`` ranges run at once."""
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def generate(start, end):
+            with lock:
+                running.append(start)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(start)
+            return "ok"
+
+        self.mock_summarizer.generate_weekly_summary.side_effect = generate
+        batch = BatchSummarizer(self.mock_summarizer, concurrency=2)
+        list(batch.run(self.ranges))
+
+        assert max(peak) == 2
@@ -0,0 +1,48 @@
+import pytest
+from src.ai.services.chunking import chunk_reports, estimate_tokens
+
+
+class TestChunking:
+    """Test suite for the token estimator and report chunker."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup fixture with a fixed characters-per-token ratio."""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("src.config.settings.Config.CHARS_PER_TOKEN", 4)
+            yield
+
+    def test_estimate_tokens(self):
+        """Test the characters-per-token estimate."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+    def test_small_reports_are_packed_together(self):
+        """Test that whole reports are packed in a single chunk."""
+        chunks = chunk_reports(["day 1", "day 2", "day 3"], 100)
+        assert chunks == ["day 1\n\nday 2\n\nday 3"]
+
+    def test_reports_are_kept_whole_across_chunks(self):
+        """Test that reports are split between chunks, not inside them."""
+        reports = ["a" * 40, "b" * 40, "c" * 40]
+        chunks = chunk_reports(reports, 25)
+
+        assert chunks == ["a" * 40 + "\n\n" + "b" * 40, "c" * 40]
+
+    def test_large_report_is_split_at_sections(self):
+        """Test that an oversized report is split at markdown headings."""
+        report = "# Section A\n" + "a" * 60 + "\n# Section B\n" + "b" * 60
+        chunks = chunk_reports([report], 20)
+
+        assert len(chunks) == 2
+        assert chunks[0].startswith("# Section A")
+        assert chunks[1].startswith("# Section B")
+
+    def test_every_chunk_respects_the_budget(self):
+        """Test that no chunk exceeds the token budget."""
+        report = "\n".join(["line " * 10] * 50) + "x" * 500
+        chunks = chunk_reports([report, "small"], 30)
+
+        assert all(estimate_tokens(chunk) <= 30 for chunk in chunks)
+        assert "".join(chunks).count("x") == 500
@@ -0,0 +1,62 @@
+from src.ai.services.compaction import (
+    NearDuplicateIndex,
+    compact_reports,
+    drop_empty_sections,
+    normalize,
+)
+
+
+class TestCompaction:
+    """Test suite for the prompt compaction stage."""
+
+    def test_normalize(self):
+        """Test bullets, spacing and links are normalized."""
+        text = (
+            "* Reviewed  [PR 42](https://github.com/acme/app/pull/42)\n\n\n"
+            "+ See https://jira.example.com/browse/PROJ-1234?focus=1   \n"
+        )
+
+        assert normalize(text) == (
+            "- Reviewed PR 42\n\n"
+            "- See jira.example.com/.../PROJ-1234"
+        )
+
+    def test_drop_empty_sections(self):
+        """Test that only headings without content are removed."""
+        lines = [
+            "# Day", "## Done", "- task", "## Blockers", "", "## Notes",
+            "### Empty", "## Next", "### Planned", "- more",
+        ]
+
+        assert drop_empty_sections(lines) == [
+            "# Day", "## Done", "- task", "", "## Next", "### Planned",
+            "- more",
+        ]
+
+    def test_exact_and_near_duplicates(self):
+        """Test that repeated lines are kept only where they first appear."""
+        reports = [
+            "2024-03-11.md\n# Daily\n## Done\n"
+            "- Working on the new authentication flow for mobile\n- A\n",
+            "2024-03-12.md\n# Daily\n## Done\n"
+            "- working on the new authentication flow for mobile!\n"
+            "- Still working on the new authentication flow for mobile\n"
+            "- B\n## Blockers\n- N/A\n",
+        ]
+
+        result = compact_reports(reports)
+
+        assert result.reports == [
+            "2024-03-11.md\n# Daily\n## Done\n"
+            "- Working on the new authentication flow for mobile\n- A",
+            "2024-03-12.md\n## Done\n- B",
+        ]
+        assert result.tokens_after < result.tokens_before
+
+    def test_distinct_lines_are_kept(self):
+        """Test that lines below the similarity threshold are kept."""
+        index = NearDuplicateIndex(threshold=0.8)
+
+        assert index.add("fixed the login page layout on mobile devices")
+        assert index.add("started the pdf export for the monthly invoices")
+        assert not index.add("fixed the login page layout on mobile devices")
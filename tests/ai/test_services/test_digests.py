@@ -0,0 +1,82 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from src.ai.services.digests import DigestStore
+from src.utils.cache import DiskCache
+
+
+class TestDigestStore:
+    """Test suite for DigestStore class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Setup fixtures for DigestStore tests."""
+        self.report = tmp_path / "2024-03-11.md"
+        self.report.write_text("Report content")
+
+        self.cache = DiskCache(str(tmp_path / "cache"))
+        self.store = DigestStore(self.cache)
+        self.summarize = MagicMock(return_value="Digest")
+
+    def test_first_call_summarizes(self):
+        """Test that a new report is summarized."""
+        digest = self.store.get_or_create(
+            str(self.report), {}, self.summarize
+        )
+
+        assert digest == "Digest"
+        self.summarize.assert_called_once_with("Report content")
+
+    def test_unchanged_report_is_reused(self):
+        """Test that an unchanged report is not summarized again."""
+        self.store.get_or_create(str(self.report), {}, self.summarize)
+        self.store.get_or_create(str(self.report), {}, self.summarize)
+
+        self.summarize.assert_called_once()
+
+    def test_touched_report_with_same_content_is_reused(self):
+        """Test that a new mtime with the same content reuses the digest."""
+        self.store.get_or_create(str(self.report), {}, self.summarize)
+        os.utime(self.report, (1, 1))
+        self.store.get_or_create(str(self.report), {}, self.summarize)
+
+        self.summarize.assert_called_once()
+
+    def test_changed_report_is_summarized_again(self):
+        """Test that changing the content produces a new digest."""
+        self.store.get_or_create(str(self.report), {}, self.summarize)
+        self.report.write_text("New content, longer than before")
+        self.store.get_or_create(str(self.report), {}, self.summarize)
+
+        assert self.summarize.call_count == 2
+
+    def test_fingerprint_change_is_summarized_again(self):
+        """Test that a different model or prompt invalidates digests."""
+        self.store.get_or_create(str(self.report), {}, self.summarize)
+        self.store.get_or_create(
+            str(self.report), {"model": "other"}, self.summarize
+        )
+
+        assert self.summarize.call_count == 2
+
+    def test_without_cache_always_summarizes(self):
+        """Test that a store without cache never reuses digests."""
+        store = DigestStore()
+        store.get_or_create(str(self.report), {}, self.summarize)
+        store.get_or_create(str(self.report), {}, self.summarize)
+
+        assert self.summarize.call_count == 2
+
+    def test_aget_or_create_shares_digests(self):
+        """Test that the async path reuses digests from the sync path."""
+        self.store.get_or_create(str(self.report), {}, self.summarize)
+        asummarize = AsyncMock(return_value="Async digest")
+
+        digest = asyncio.run(
+            self.store.aget_or_create(str(self.report), {}, asummarize)
+        )
+
+        assert digest == "Digest"
+        asummarize.assert_not_awaited()
@@ -0,0 +1,106 @@
+import os
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.ai.adapters.base import AIAdapter
+from src.ai.services.rollup import RollupSummarizer
+from src.ai.services.summarizer import WeeklySummarizer
+from src.utils.cache import DiskCache
+from src.utils.dates import period_of, previous_period, split_period
+from src.utils.metrics import Metrics
+from src.utils.render import Summary
+
+
+class TestRollupSummarizer:
+    """Test suite for RollupSummarizer class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Setup reports spread over the first quarter of 2025."""
+        self.reports_dir = tmp_path / "reports"
+        self.reports_dir.mkdir()
+        for date in ("2025-01-06", "2025-01-20", "2025-02-11", "2025-03-03"):
+            (self.reports_dir / f"{date}.md").write_text(f"Report {date}")
+
+        self.mock_ai = MagicMock(spec=AIAdapter)
+        self.mock_ai.generate_structured.side_effect = (
+            lambda prompt, schema: {
+                "activities": [f"Summary {len(prompt)}"],
+                "bug_fixes": [], "features": [],
+            }
+        )
+        self.mock_ai.fingerprint.return_value = {"model": "test-model"}
+        self.cache = DiskCache(str(tmp_path / "rollups"))
+
+    def rollup(self):
+        metrics = Metrics()
+        rollup = RollupSummarizer(
+            WeeklySummarizer(
+                str(self.reports_dir), self.mock_ai, structured=True
+            ),
+            self.mock_ai, cache=self.cache, metrics=metrics,
+        )
+        return rollup, metrics
+
+    def test_split_period(self):
+        """Test the period boundaries and their sub periods."""
+        assert period_of("quarter", datetime(2025, 5, 3)) == (
+            datetime(2025, 4, 1), datetime(2025, 6, 30)
+        )
+        assert previous_period("year", datetime(2025, 5, 3)) == (
+            datetime(2024, 1, 1), datetime(2024, 12, 31)
+        )
+
+        weeks = split_period("month", datetime(2025, 3, 1))
+        assert weeks[0] == (datetime(2025, 3, 1), datetime(2025, 3, 1))
+        assert weeks[1] == (datetime(2025, 3, 2), datetime(2025, 3, 8))
+        assert weeks[-1] == (datetime(2025, 3, 30), datetime(2025, 3, 31))
+
+    def test_quarter_is_built_from_weeks_and_months(self):
+        """Test that only weeks with reports reach the model."""
+        rollup, metrics = self.rollup()
+
+        root = rollup.generate_rollup("quarter", datetime(2025, 2, 15))
+
+        assert (root.start_date, root.end_date) == (
+            datetime(2025, 1, 1), datetime(2025, 3, 31)
+        )
+        assert root.summary.sections["activities"][0].startswith("Summary")
+        # 4 weeks + 3 months + the quarter
+        assert self.mock_ai.generate_structured.call_count == 8
+        assert metrics.counters["rollup_nodes_generated"] == 8
+
+        prompt = self.mock_ai.generate_structured.call_args_list[-1][0][0]
+        assert "resumos mensais" in prompt
+        assert "2025-02-01 a 2025-02-28" in prompt
+
+    def test_stored_nodes_are_reused(self):
+        """Test that a change only regenerates the nodes above it."""
+        self.rollup()[0].generate_rollup("quarter", datetime(2025, 2, 15))
+        self.mock_ai.generate_structured.reset_mock()
+
+        report = self.reports_dir / "2025-02-11.md"
+        report.write_text("Changed report")
+        os.utime(report, ns=(1, 1))
+        rollup, metrics = self.rollup()
+        rollup.generate_rollup("quarter", datetime(2025, 2, 15))
+
+        # The week, February and the quarter
+        assert self.mock_ai.generate_structured.call_count == 3
+        assert metrics.counters["rollup_nodes_reused"] == 2
+
+        self.mock_ai.generate_structured.reset_mock()
+        root = rollup.generate_rollup("quarter", datetime(2025, 2, 15))
+        self.mock_ai.generate_structured.assert_not_called()
+        assert isinstance(root.summary, Summary)
+
+    def test_empty_period(self):
+        """Test that a period without reports makes no model call."""
+        rollup, _ = self.rollup()
+
+        root = rollup.generate_rollup("month", datetime(2025, 6, 1))
+
+        assert root.summary is None
+        self.mock_ai.generate_structured.assert_not_called()
@@ -1,10 +1,15 @@
+import asyncio
 from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 
 from freezegun import freeze_time
 import pytest
-from src.ai.services.summarizer import WeeklySummarizer
-from src.ai.adapters.base import AIAdapter
+from src.ai.services.summarizer import VARIANTS, Variant, WeeklySummarizer
+from src.ai.adapters.base import AIAdapter, Context
+from src.ai.adapters.fake import FakeAdapter
+from src.ai.services.digests import DigestStore
+from src.utils.cache import DiskCache
+from src.utils.render import SUMMARY_SCHEMA
 
 
 class TestWeeklySummarizer:
@@ -20,6 +25,11 @@ class TestWeeklySummarizer:
         # Create mock AI adapter
         self.mock_ai = MagicMock(spec=AIAdapter)
         self.mock_ai.generate_content.return_value = "Test summary"
+        self.mock_ai.agenerate_content = AsyncMock(
+            return_value="Async summary"
+        )
+        self.mock_ai.fingerprint.return_value = {"model": "test-model"}
+        self.cache_dir = tmp_path / "cache"
 
         # Create summarizer instance
         self.summarizer = WeeklySummarizer(
@@ -130,6 +140,55 @@ class TestWeeklySummarizer:
         assert "Relatórios:" in call_args
         assert "Test summary" == summary
 
+    def test_generate_weekly_summary_structured(self):
+        """Test that a structured summary is requested with the schema."""
+        (self.reports_dir / "2024-03-11.md").write_text("Deploy")
+        self.mock_ai.generate_structured.return_value = {
+            "activities": ["Deploy"], "bug_fixes": [], "features": [],
+        }
+        summarizer = WeeklySummarizer(
+            reports_directory=str(self.reports_dir),
+            ai=self.mock_ai,
+            structured=True,
+        )
+
+        summary = summarizer.generate_weekly_summary(
+            datetime(2024, 3, 10), datetime(2024, 3, 16)
+        )
+
+        prompt, schema = self.mock_ai.generate_structured.call_args[0]
+        assert "Deploy" in prompt
+        assert schema == SUMMARY_SCHEMA
+        assert summary.sections["activities"] == ["Deploy"]
+        assert "   - Deploy" in summary
+        self.mock_ai.generate_content.assert_not_called()
+
+    def test_generate_topic_summary(self):
+        """Test that only the passages about the topic reach the prompt."""
+        (self.reports_dir / "2023-05-02.md").write_text(
+            "# Bugs\n- Corrigido o checkout\n# Outros\n- Reunião geral"
+        )
+        (self.reports_dir / "2024-03-11.md").write_text(
+            "# Features\n- Checkout com PIX"
+        )
+        (self.reports_dir / "2024-03-12.md").write_text("- Férias")
+
+        summary = self.summarizer.generate_topic_summary("checkout")
+
+        prompt = self.mock_ai.generate_content.call_args[0][0]
+        assert 'tema "checkout"' in prompt
+        assert prompt.index("2023-05-02") < prompt.index("2024-03-11")
+        assert "Reunião geral" not in prompt
+        assert "Férias" not in prompt
+        assert summary == "Test summary"
+
+    def test_generate_topic_summary_without_matches(self):
+        """Test that no model call is made when nothing matches."""
+        (self.reports_dir / "2024-03-11.md").write_text("- Férias")
+
+        assert self.summarizer.generate_topic_summary("checkout") is None
+        self.mock_ai.generate_content.assert_not_called()
+
     @patch("src.config.settings.Config.DEBUG", True)
     def test_generate_weekly_summary_with_debug(self):
         """Test generate_weekly_summary with debug mode enabled."""
@@ -143,3 +202,256 @@ class TestWeeklySummarizer:
             self.summarizer.generate_weekly_summary(end_date)
             mock_print.assert_called_once()
             assert "[DEBUG] PROMPT:" in mock_print.call_args[0][0]
+
+    def test_generate_weekly_summary_map_reduce(self):
+        """Test that map-reduce builds the summary from daily digests."""
+        start_date = datetime(2024, 3, 10)
+        end_date = datetime(2024, 3, 16)
+        for i in range(3):
+            date = start_date + timedelta(days=i)
+            report_file = self.reports_dir / f"{date.strftime('%Y-%m-%d')}.md"
+            report_file.write_text(f"Report for {date.strftime('%Y-%m-%d')}")
+
+        self.mock_ai.generate_content.side_effect = (
+            lambda prompt: "Weekly" if "Relatórios:" in prompt else "Digest"
+        )
+        summarizer = WeeklySummarizer(
+            str(self.reports_dir), self.mock_ai,
+            digests=DigestStore(DiskCache(str(self.cache_dir))),
+        )
+
+        assert summarizer.generate_weekly_summary(
+            start_date, end_date) == "Weekly"
+        # 3 daily digests + 1 reduce call
+        assert self.mock_ai.generate_content.call_count == 4
+        reduce_prompt = self.mock_ai.generate_content.call_args[0][0]
+        assert "Report for" not in reduce_prompt
+        assert reduce_prompt.count("Digest") == 3
+
+    def test_map_reduce_reuses_digests_across_ranges(self):
+        """Test that overlapping ranges only summarize new days."""
+        for day in range(10, 18):
+            report_file = self.reports_dir / f"2024-03-{day}.md"
+            report_file.write_text(f"Report for 2024-03-{day}")
+
+        summarizer = WeeklySummarizer(
+            str(self.reports_dir), self.mock_ai,
+            digests=DigestStore(DiskCache(str(self.cache_dir))),
+        )
+
+        summarizer.generate_weekly_summary(
+            datetime(2024, 3, 10), datetime(2024, 3, 16))
+        assert self.mock_ai.generate_content.call_count == 8
+
+        summarizer.generate_weekly_summary(
+            datetime(2024, 3, 11), datetime(2024, 3, 17))
+        # Only 2024-03-17 is new, plus the reduce call
+        assert self.mock_ai.generate_content.call_count == 10
+
+    def test_agenerate_weekly_summary(self):
+        """Test the async summary reads every report in the range."""
+        start_date = datetime(2024, 3, 10)
+        end_date = datetime(2024, 3, 16)
+        for i in range(5):
+            date = start_date + timedelta(days=i)
+            report_file = self.reports_dir / f"{date.strftime('%Y-%m-%d')}.md"
+            report_file.write_text(f"Report for {date.strftime('%Y-%m-%d')}")
+
+        summary = asyncio.run(
+            self.summarizer.agenerate_weekly_summary(start_date, end_date)
+        )
+
+        assert summary == "Async summary"
+        self.mock_ai.generate_content.assert_not_called()
+        prompt = self.mock_ai.agenerate_content.call_args[0][0]
+        assert prompt.count("Report for") == 5
+        assert prompt.index("2024-03-10") < prompt.index("2024-03-14")
+
+    def test_agenerate_weekly_summary_map_reduce(self):
+        """Test the async summary with per-day digests."""
+        for day in range(10, 13):
+            report_file = self.reports_dir / f"2024-03-{day}.md"
+            report_file.write_text(f"Report for 2024-03-{day}")
+
+        self.mock_ai.agenerate_content.side_effect = (
+            lambda prompt: "Weekly" if "Relatórios:" in prompt else "Digest"
+        )
+        summarizer = WeeklySummarizer(
+            str(self.reports_dir), self.mock_ai,
+            digests=DigestStore(DiskCache(str(self.cache_dir))),
+        )
+
+        summary = asyncio.run(summarizer.agenerate_weekly_summary(
+            datetime(2024, 3, 10), datetime(2024, 3, 16)))
+
+        assert summary == "Weekly"
+        assert self.mock_ai.agenerate_content.await_count == 4
+
+    def test_stream_weekly_summary(self):
+        """Test that the summary is streamed from the adapter."""
+        end_date = datetime(2024, 3, 15)
+        report_file = self.reports_dir / f"{end_date.strftime('%Y-%m-%d')}.md"
+        report_file.write_text("Test report content")
+        self.mock_ai.stream_content.return_value = iter(["Test ", "summary"])
+
+        chunks = list(self.summarizer.stream_weekly_summary(
+            end_date - timedelta(days=6), end_date))
+
+        assert chunks == ["Test ", "summary"]
+        prompt = self.mock_ai.stream_content.call_args[0][0]
+        assert "Test report content" in prompt
+
+    def test_oversized_range_is_summarized_in_chunks(self):
+        """Test hierarchical summarization when over the token budget."""
+        for day in range(10, 17):
+            report_file = self.reports_dir / f"2024-03-{day}.md"
+            report_file.write_text(f"Report for 2024-03-{day}\n" + "x" * 400)
+
+        self.mock_ai.generate_content.side_effect = (
+            lambda prompt: "Partial" if "parte de um" in prompt else "Weekly"
+        )
+        summarizer = WeeklySummarizer(
+            str(self.reports_dir), self.mock_ai, max_prompt_tokens=300
+        )
+
+        summary = summarizer.generate_weekly_summary(
+            datetime(2024, 3, 10), datetime(2024, 3, 16))
+
+        assert summary == "Weekly"
+        prompts = [
+            c[0][0] for c in self.mock_ai.generate_content.call_args_list
+        ]
+        partial_prompts = prompts[:-1]
+        assert len(partial_prompts) > 1
+        assert sum(p.count("Report for") for p in partial_prompts) == 7
+        assert "x" * 400 not in prompts[-1]
+        assert "Parte 1\nPartial" in prompts[-1]
+
+    def test_async_oversized_range_is_summarized_in_chunks(self):
+        """Test the async hierarchical summarization."""
+        for day in range(10, 17):
+            report_file = self.reports_dir / f"2024-03-{day}.md"
+            report_file.write_text("x" * 400)
+
+        self.mock_ai.agenerate_content.side_effect = (
+            lambda prompt: "Partial" if "parte de um" in prompt else "Weekly"
+        )
+        summarizer = WeeklySummarizer(
+            str(self.reports_dir), self.mock_ai, max_prompt_tokens=300
+        )
+
+        summary = asyncio.run(summarizer.agenerate_weekly_summary(
+            datetime(2024, 3, 10), datetime(2024, 3, 16)))
+
+        assert summary == "Weekly"
+        assert self.mock_ai.agenerate_content.await_count > 2
+
+    def test_generate_weekly_summary_records_metrics(self):
+        """Test that stages and bytes read are recorded."""
+        end_date = datetime(2024, 3, 15)
+        report_file = self.reports_dir / f"{end_date.strftime('%Y-%m-%d')}.md"
+        report_file.write_text("Test report content")
+
+        self.summarizer.generate_weekly_summary(
+            end_date - timedelta(days=6), end_date)
+
+        snapshot = self.summarizer.metrics.snapshot()
+        assert {"collect_reports", "build_prompt", "generate"} <= set(
+            snapshot["stages"]
+        )
+        assert snapshot["counters"]["bytes_read"] == len("Test report content")
+        assert snapshot["counters"]["reports_read"] == 1
+
+    def test_compact_removes_repeated_lines(self):
+        """Test that --compact drops lines repeated across days."""
+        for day in (11, 12):
+            (self.reports_dir / f"2024-03-{day}.md").write_text(
+                "# Daily\n\n## Atividades\n"
+                "- Working on the authentication flow\n"
+                f"- Task of day {day}\n\n## Bloqueios\n- N/A\n"
+            )
+        self.summarizer.compact = True
+
+        self.summarizer.generate_weekly_summary(
+            datetime(2024, 3, 10), datetime(2024, 3, 16))
+
+        prompt = self.mock_ai.generate_content.call_args[0][0]
+        assert prompt.count("authentication flow") == 1
+        assert "Task of day 12" in prompt
+        assert "Bloqueios" not in prompt
+        counters = self.summarizer.metrics.snapshot()["counters"]
+        assert (
+            counters["compaction_tokens_after"]
+            < counters["compaction_tokens_before"]
+        )
+
+    def test_generate_variants_upload_the_reports_once(self):
+        """Test that every variant reuses a single uploaded context."""
+        (self.reports_dir / "2024-03-11.md").write_text("Corrigi o bug X")
+        ai = FakeAdapter(response="Variante")
+        summarizer = WeeklySummarizer(str(self.reports_dir), ai)
+
+        result = summarizer.generate_variants(
+            ["resumo", "management", "bugs"],
+            datetime(2024, 3, 10), datetime(2024, 3, 16),
+        )
+
+        assert result.summaries == {
+            "resumo": "Variante", "management": "Variante",
+            "bugs": "Variante",
+        }
+        assert result.errors == {}
+        counters = ai.metrics.snapshot()["counters"]
+        assert counters["context_uploads"] == 1
+        assert counters["cached_tokens"] > 0
+        assert ai.calls == 3
+        # Only the instructions of each variant are sent with the prompts
+        assert ai.prompt_chars < 3 * len("Corrigi o bug X") + sum(
+            len(VARIANTS[name].prompt) for name in VARIANTS
+        )
+        assert ai.contexts == {}
+
+    def test_generate_variants_without_context_caching(self):
+        """Test that adapters without caching send the reports each time."""
+        (self.reports_dir / "2024-03-11.md").write_text("Corrigi o bug X")
+        self.mock_ai.create_context.side_effect = Context
+        self.mock_ai.generate_with_context.side_effect = (
+            lambda context, message: context.content + message
+        )
+
+        result = self.summarizer.generate_variants(
+            ["bugs", Variant("custom", "Instruções")],
+            datetime(2024, 3, 10), datetime(2024, 3, 16),
+        )
+
+        assert "Corrigi o bug X" in result.summaries["bugs"]
+        assert result.summaries["custom"].endswith("Instruções")
+        self.mock_ai.delete_context.assert_called_once()
+
+    def test_generate_variants_reports_errors(self):
+        """Test that a failed variant does not lose the others."""
+        (self.reports_dir / "2024-03-11.md").write_text("Relatório")
+
+        def generate(context, message):
+            if message != VARIANTS["bugs"].prompt:
+                raise RuntimeError("quota")
+            return "ok"
+        self.mock_ai.generate_with_context.side_effect = generate
+
+        result = self.summarizer.generate_variants(
+            ["bugs", "management"],
+            datetime(2024, 3, 10), datetime(2024, 3, 16),
+        )
+
+        assert result.summaries == {"bugs": "ok"}
+        assert isinstance(result.errors["management"], RuntimeError)
+        self.mock_ai.delete_context.assert_called_once()
+
+    def test_generate_variants_without_reports(self):
+        """Test that nothing is uploaded for an empty range."""
+        result = self.summarizer.generate_variants(
+            ["resumo"], datetime(2024, 3, 10), datetime(2024, 3, 16)
+        )
+
+        assert result.summaries == {} and result.errors == {}
+        self.mock_ai.create_context.assert_not_called()
@@ -0,0 +1,116 @@
+import os
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.ai.adapters.base import AIAdapter
+from src.ai.services.team import TeamSummarizer
+
+
+START, END = datetime(2025, 1, 5), datetime(2025, 1, 11)
+
+
+def summarize_author(reports_dir, start_date, end_date):
+    """Module-level so it can be pickled for the process executor."""
+    time.sleep(0.2)
+    return f"Summary of {reports_dir.rsplit('/', 1)[-1]}"
+
+
+def set_prefix():
+    """Initializer of the process executor test."""
+    os.environ["TEAM_TEST_PREFIX"] = "Initialized"
+
+
+def prefixed_summary(reports_dir, start_date, end_date):
+    """Reads what set_prefix left in the worker process."""
+    return os.environ.get("TEAM_TEST_PREFIX", "Missing")
+
+
+class TestTeamSummarizer:
+    """Test suite for TeamSummarizer class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup a mocked AI adapter for the team summary."""
+        self.mock_ai = MagicMock(spec=AIAdapter)
+        self.mock_ai.generate_structured.return_value = {
+            "activities": ["Team summary"], "bug_fixes": [], "features": [],
+        }
+        self.dirs = [f"/team/{name}" for name in ("carol", "alice", "bob")]
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_authors_run_in_parallel(self, executor):
+        """Test that the wall time is close to a single author's."""
+        team = TeamSummarizer(
+            summarize_author, self.mock_ai, workers=3, executor=executor
+        )
+
+        start = time.perf_counter()
+        result = team.generate_team_summary(self.dirs, START, END)
+
+        assert time.perf_counter() - start < 0.5
+        assert result.authors == {
+            "alice": "Summary of alice",
+            "bob": "Summary of bob",
+            "carol": "Summary of carol",
+        }
+        assert result.summary.sections["activities"] == ["Team summary"]
+
+    def test_team_prompt_keeps_the_given_order(self):
+        """Test that the authors appear in the prompt in the given order."""
+        team = TeamSummarizer(
+            lambda d, s, e: f"Summary of {d}", self.mock_ai
+        )
+
+        team.generate_team_summary(self.dirs, START, END)
+
+        prompt = self.mock_ai.generate_structured.call_args[0][0]
+        assert prompt.index("## carol") < prompt.index("## alice") < (
+            prompt.index("## bob")
+        )
+
+    def test_failing_author_is_left_out(self):
+        """Test that an author error does not stop the team summary."""
+        def summarize(reports_dir, start_date, end_date):
+            if reports_dir.endswith("bob"):
+                raise RuntimeError("quota")
+            return "ok"
+
+        result = TeamSummarizer(summarize, self.mock_ai).generate_team_summary(
+            self.dirs, START, END
+        )
+
+        assert set(result.authors) == {"alice", "carol"}
+        assert isinstance(result.errors["bob"], RuntimeError)
+        assert "## bob" not in self.mock_ai.generate_structured.call_args[0][0]
+
+    def test_duplicate_names_are_disambiguated(self):
+        """Test that authors sharing a directory name keep both summaries."""
+        dirs = ["/teamA/joao", "/teamB/joao", "/teamB/maria"]
+
+        assert TeamSummarizer.author_names(dirs) == {
+            "/teamA/joao": "teamA_joao",
+            "/teamB/joao": "teamB_joao",
+            "/teamB/maria": "maria",
+        }
+
+        result = TeamSummarizer(
+            lambda d, s, e: f"Summary of {d}", self.mock_ai
+        ).generate_team_summary(dirs, START, END)
+
+        assert result.authors["teamA_joao"] == "Summary of /teamA/joao"
+        assert result.authors["teamB_joao"] == "Summary of /teamB/joao"
+
+    def test_process_workers_are_initialized(self):
+        """Test that the initializer runs in every worker process."""
+        team = TeamSummarizer(
+            prefixed_summary, self.mock_ai, workers=2, executor="process",
+            initializer=set_prefix,
+        )
+
+        result = team.generate_team_summary(self.dirs, START, END)
+
+        assert set(result.authors.values()) == {"Initialized"}
+        assert "TEAM_TEST_PREFIX" not in os.environ
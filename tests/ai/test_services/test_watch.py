@@ -0,0 +1,50 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.ai.services.summarizer import WeeklySummarizer
+from src.ai.services.watch import WeekRefresher
+
+
+class TestWeekRefresher:
+    """Test suite for WeekRefresher class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup a refresher with a mocked summarizer and watcher."""
+        self.summarizer = MagicMock(spec=WeeklySummarizer)
+        self.summarizer.generate_weekly_summary.side_effect = (
+            lambda start, end: f"Summary {start.day}"
+        )
+        self.watcher = MagicMock()
+        self.results = []
+        self.refresher = WeekRefresher(
+            self.summarizer, self.watcher, self.results.append,
+            debounce=0.01,
+        )
+
+    def test_affected_weeks(self):
+        """Test that changed reports map to their Sunday-Saturday week."""
+        weeks = WeekRefresher.affected_weeks([
+            "/r/2025-01-06.md", "/r/2025/01/2025-01-11.md", "/r/2025-01-12.md",
+        ])
+
+        assert weeks == [
+            (datetime(2025, 1, 5), datetime(2025, 1, 11)),
+            (datetime(2025, 1, 12), datetime(2025, 1, 18)),
+        ]
+
+    def test_run_once_refreshes_only_affected_week(self):
+        """Test that a burst of changes refreshes its week once."""
+        self.watcher.poll.side_effect = [
+            {"/r/2025-01-06.md"}, {"/r/2025-01-07.md"}, set(),
+        ]
+
+        assert self.refresher.run_once() == [
+            (datetime(2025, 1, 5), datetime(2025, 1, 11)),
+        ]
+        self.summarizer.generate_weekly_summary.assert_called_once_with(
+            datetime(2025, 1, 5), datetime(2025, 1, 11)
+        )
+        assert [result.summary for result in self.results] == ["Summary 5"]
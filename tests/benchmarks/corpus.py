@@ -0,0 +1,48 @@
+import os
+import random
+from datetime import datetime, timedelta
+
+
+WORDS = (
+    "implementação correção bug feature reunião deploy revisão código "
+    "testes documentação autenticação relatório cliente api banco dados "
+    "refatoração pipeline integração performance cache"
+).split()
+
+
+def generate_report(size_bytes: int, rng: random.Random) -> str:
+    """
+    Builds a markdown daily report of roughly ``size_bytes`` bytes.
+    """
+    lines = ["# Relatório Diário", "", "## Atividades Realizadas"]
+    size = sum(len(line) + 1 for line in lines)
+
+    while size < size_bytes:
+        line = "- " + " ".join(rng.choice(WORDS) for _ in range(10))
+        lines.append(line)
+        size += len(line.encode("utf-8")) + 1
+
+    return "\n".join(lines)
+
+
+def generate_corpus(
+    directory: str,
+    days: int,
+    report_bytes: int,
+    start_date: datetime = datetime(2024, 1, 7),
+    seed: int = 42,
+) -> datetime:
+    """
+    Writes ``days`` consecutive daily reports to ``directory`` and returns
+    the date of the last one.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    for day in range(days):
+        date = start_date + timedelta(days=day)
+        path = os.path.join(directory, f"{date.strftime('%Y-%m-%d')}.md")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(generate_report(report_bytes, rng))
+
+    return start_date + timedelta(days=days - 1)
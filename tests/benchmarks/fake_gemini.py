@@ -0,0 +1,425 @@
+"""
+A local stand-in for the Gemini REST API, for load tests that must not
+use real quota.
+
+Point ``GeminiAdapter`` at it with ``transport="rest"`` and
+``api_endpoint="http://127.0.0.1:<port>"``.
+"""
+import itertools
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, Optional, Tuple
+
+from src.utils.tokens import estimate_tokens
+
+
+ROUTE = re.compile(
+    r"^/v1beta/models/(?P<model>[^/:]+):"
+    r"(?P<method>generateContent|streamGenerateContent)(\?.*)?$"
+)
+
+CACHES = re.compile(r"^/v1beta/cachedContents(\?.*)?$")
+CACHE = re.compile(r"^/v1beta/(?P<name>cachedContents/[^/?]+)(\?.*)?$")
+
+DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+ERROR_STATUS = {429: "RESOURCE_EXHAUSTED", 503: "UNAVAILABLE"}
+
+RESPONSE_TEXT = (
+    "1. Atividades na semana\n"
+    "   - Revisão de código e reuniões com o cliente\n\n"
+    "2. Resolução de bugs\n"
+    "   - Correção na autenticação da api\n\n"
+    "3. Trabalhando em features\n"
+    "   - Integração do pipeline de relatórios\n"
+)
+
+STRUCTURED_RESPONSE = {
+    "activities": ["Revisão de código e reuniões com o cliente"],
+    "bug_fixes": ["Correção na autenticação da api"],
+    "features": ["Integração do pipeline de relatórios"],
+}
+
+
+class Latency:
+    """
+    Time to the first token, drawn from a ``fixed``, ``uniform`` (between
+    ``mean / 2`` and ``mean * 1.5``) or ``lognormal`` distribution with
+    the given ``mean`` in seconds.
+    """
+
+    __slots__ = ["distribution", "mean", "sigma", "_rng", "_lock"]
+
+    def __init__(
+        self,
+        distribution: str = "fixed",
+        mean: float = 0.0,
+        sigma: float = 0.5,
+        seed: int = 42,
+    ):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution: {distribution}")
+
+        self.distribution = distribution
+        self.mean = mean
+        self.sigma = sigma
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        if self.mean <= 0:
+            return 0.0
+
+        with self._lock:
+            if self.distribution == "uniform":
+                return self._rng.uniform(self.mean / 2, self.mean * 1.5)
+            if self.distribution == "lognormal":
+                # mu chosen so the distribution mean is ``mean``
+                mu = math.log(self.mean) - self.sigma ** 2 / 2
+                return self._rng.lognormvariate(mu, self.sigma)
+        return self.mean
+
+
+class ErrorBursts:
+    """
+    Starts a burst of ``length`` consecutive errors with probability
+    ``rate`` per request, answered with one of ``codes`` (429 or 503) and
+    a ``Retry-After`` of ``retry_after`` seconds.
+    """
+
+    __slots__ = ["rate", "length", "codes", "retry_after", "_left", "_code",
+                 "_rng", "_lock"]
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        length: int = 1,
+        codes: Tuple[int, ...] = (429, 503),
+        retry_after: Optional[float] = None,
+        seed: int = 42,
+    ):
+        unknown = set(codes) - set(ERROR_STATUS)
+        if unknown:
+            raise ValueError(f"Unsupported error codes: {sorted(unknown)}")
+
+        self.rate = rate
+        self.length = length
+        self.codes = codes
+        self.retry_after = retry_after
+        self._left = 0
+        self._code = None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def start(self, code: Optional[int] = None):
+        """
+        Starts a burst right away, e.g. to script a scenario.
+        """
+        with self._lock:
+            self._left = self.length
+            self._code = code or self._rng.choice(self.codes)
+
+    def next(self) -> Optional[int]:
+        """
+        Returns the error code for the next request, or None to serve it.
+        """
+        with self._lock:
+            if self._left == 0 and self._rng.random() < self.rate:
+                self._left = self.length
+                self._code = self._rng.choice(self.codes)
+            if self._left == 0:
+                return None
+            self._left -= 1
+            return self._code
+
+
+class KeyQuota:
+    """
+    Allows each API key ``requests_per_minute`` requests in any 60 second
+    window, like the per-key quota of the real API. 0 disables it.
+    """
+
+    __slots__ = ["requests_per_minute", "requests", "_sent", "_lock"]
+
+    def __init__(self, requests_per_minute: int = 0):
+        self.requests_per_minute = requests_per_minute
+        self.requests: Dict[str, int] = {}
+        self._sent: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: Optional[str]) -> float:
+        """
+        Counts a request for ``key`` and returns 0 when it is within the
+        quota, or the seconds until it would be.
+        """
+        key = key or ""
+        now = time.monotonic()
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if not self.requests_per_minute:
+                return 0.0
+            sent = self._sent.setdefault(key, deque())
+            while sent and sent[0] <= now - 60:
+                sent.popleft()
+            if len(sent) >= self.requests_per_minute:
+                return sent[0] + 60 - now
+            sent.append(now)
+            return 0.0
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    """
+    Serves ``POST /v1beta/models/{model}:generateContent`` and
+    ``:streamGenerateContent``, plus creating and deleting
+    ``cachedContents``. Streams are sent as the JSON array the REST
+    transport reads, one candidate chunk at a time.
+    """
+
+    server: "FakeGeminiServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        match = ROUTE.match(self.path)
+        if match is None and not CACHES.match(self.path):
+            self._send_json(404, _error(404, "NOT_FOUND", "Not found"))
+            return
+        if not self._admit():
+            return
+
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            self._send_json(400, _error(400, "INVALID_ARGUMENT", "Bad JSON"))
+            return
+        if match is None:
+            self._send_json(200, self.server.create_cache(request))
+            return
+
+        cached_tokens = self.server.cached_tokens(request.get("cachedContent"))
+        if cached_tokens is None:
+            self._send_json(
+                404, _error(404, "NOT_FOUND", "Unknown cached content")
+            )
+            return
+
+        time.sleep(self.server.latency.sample())
+        text = _response_text(request)
+        usage = _usage(request, text, cached_tokens)
+        if match.group("method") == "streamGenerateContent":
+            self._stream(text, usage)
+        else:
+            self._send_json(200, _candidate(text, usage))
+
+    def do_DELETE(self):
+        match = CACHE.match(self.path)
+        if match is None or not self.server.delete_cache(match.group("name")):
+            self._send_json(404, _error(404, "NOT_FOUND", "Not found"))
+        else:
+            self._send_json(200, {})
+
+    def _admit(self) -> bool:
+        """
+        Answers with a simulated error or a quota 429 when the request
+        must not be served.
+        """
+        server = self.server
+        server.count("requests")
+        code = server.errors.next()
+        if code is not None:
+            server.count("errors")
+            self._send_error(code, server.errors.retry_after)
+            return False
+
+        wait = server.key_quota.take(self.headers.get("x-goog-api-key"))
+        if wait:
+            server.count("throttled")
+            self._send_error(429, wait)
+            return False
+        return True
+
+    def _stream(self, text: str, usage: dict):
+        chunks = [text[i:i + 32] for i in range(0, len(text), 32)]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        delay = self.server.chunk_delay(chunks[0] if chunks else "")
+        for index, chunk in enumerate(chunks):
+            if index:
+                time.sleep(delay)
+            last = index == len(chunks) - 1
+            payload = _candidate(chunk, usage if last else None)
+            prefix = "[" if index == 0 else ",\r\n"
+            suffix = "]" if last else ""
+            self._write_chunk(f"{prefix}{json.dumps(payload)}{suffix}")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii"))
+        self.wfile.write(data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_error(self, code: int, retry_after: Optional[float]):
+        status = ERROR_STATUS[code]
+        payload = _error(code, status, "Simulated error from the fake server")
+        headers = {}
+        if retry_after is not None:
+            headers["Retry-After"] = f"{retry_after:g}"
+        self._send_json(code, payload, headers)
+
+    def _send_json(self, code: int, payload: dict, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeGeminiServer(ThreadingHTTPServer):
+    """
+    The fake Gemini endpoint. ``tokens_per_second`` paces the chunks of a
+    stream (0 sends them right away) and ``key_quota`` throttles each API
+    key with 429s. Use it as a context manager to serve
+    from a background thread.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        latency: Optional[Latency] = None,
+        errors: Optional[ErrorBursts] = None,
+        tokens_per_second: float = 0.0,
+        key_quota: Optional[KeyQuota] = None,
+    ):
+        super().__init__(address, FakeGeminiHandler)
+        self.latency = latency or Latency()
+        self.errors = errors or ErrorBursts()
+        self.tokens_per_second = tokens_per_second
+        self.key_quota = key_quota or KeyQuota()
+        self.counters = {"requests": 0, "errors": 0, "throttled": 0}
+        self.caches: Dict[str, int] = {}
+        self._cache_ids = itertools.count(1)
+        self._counters_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str):
+        with self._counters_lock:
+            self.counters[name] += 1
+
+    def create_cache(self, request: dict) -> dict:
+        """
+        Stores the token count of a cached content and returns it as the
+        API does.
+        """
+        tokens = _usage(request, "")["promptTokenCount"]
+        with self._counters_lock:
+            name = f"cachedContents/fake-{next(self._cache_ids)}"
+            self.caches[name] = tokens
+        return {
+            "name": name,
+            "model": request.get("model"),
+            "usageMetadata": {"totalTokenCount": tokens},
+        }
+
+    def cached_tokens(self, name: Optional[str]) -> Optional[int]:
+        """
+        Tokens of the cached content ``name``: 0 without one, None when it
+        does not exist.
+        """
+        if not name:
+            return 0
+        with self._counters_lock:
+            return self.caches.get(name)
+
+    def delete_cache(self, name: str) -> bool:
+        with self._counters_lock:
+            return self.caches.pop(name, None) is not None
+
+    def chunk_delay(self, chunk: str) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        return estimate_tokens(chunk) / self.tokens_per_second
+
+    def __enter__(self):
+        # A short poll interval keeps ``shutdown`` quick
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}
+        )
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+
+def _response_text(request: dict) -> str:
+    config = request.get("generationConfig") or {}
+    if config.get("responseMimeType") == "application/json":
+        return json.dumps(STRUCTURED_RESPONSE, ensure_ascii=False)
+    return RESPONSE_TEXT
+
+
+def _usage(request: dict, text: str, cached_tokens: int = 0) -> dict:
+    prompt = "".join(
+        part.get("text", "")
+        for content in request.get("contents") or []
+        for part in content.get("parts") or []
+    )
+    system = request.get("systemInstruction") or {}
+    prompt += "".join(
+        part.get("text", "") for part in system.get("parts") or []
+    )
+    # As in the API, the prompt count includes the cached tokens
+    prompt_tokens = estimate_tokens(prompt) + cached_tokens
+    response_tokens = estimate_tokens(text)
+    usage = {
+        "promptTokenCount": prompt_tokens,
+        "candidatesTokenCount": response_tokens,
+        "totalTokenCount": prompt_tokens + response_tokens,
+    }
+    if cached_tokens:
+        usage["cachedContentTokenCount"] = cached_tokens
+    return usage
+
+
+def _candidate(text: str, usage: Optional[dict]) -> dict:
+    payload = {
+        "candidates": [{
+            "content": {"parts": [{"text": text}], "role": "model"},
+            "finishReason": "STOP",
+            "index": 0,
+        }],
+    }
+    if usage is not None:
+        payload["usageMetadata"] = usage
+    return payload
+
+
+def _error(code: int, status: str, message: str) -> dict:
+    return {"error": {"code": code, "message": message, "status": status}}
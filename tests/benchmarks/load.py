@@ -0,0 +1,234 @@
+"""
+Load generator for the Gemini adapter against the fake Gemini server.
+
+Usage:
+    python -m tests.benchmarks.load --concurrency 8 --requests 200
+    python -m tests.benchmarks.load --mode summarizer --error-rate 0.05
+"""
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from src.ai.adapters.gemini import (
+    GeminiAdapter,
+    is_rate_limited,
+    is_retryable,
+    retry_hint,
+)
+from src.ai.adapters.resilience import (
+    CircuitBreaker,
+    RateLimiter,
+    Resilience,
+    RetryPolicy,
+)
+from src.ai.services.summarizer import WeeklySummarizer
+from src.utils.stats import percentile
+from tests.benchmarks.corpus import generate_corpus
+from tests.benchmarks.fake_gemini import (
+    DISTRIBUTIONS,
+    ErrorBursts,
+    FakeGeminiServer,
+    KeyQuota,
+    Latency,
+)
+
+
+START_DATE = datetime(2024, 1, 7)
+
+PROMPT = "Resuma as atividades da semana: revisão de código e deploy."
+
+
+def build_adapter(endpoint: str, args) -> GeminiAdapter:
+    resilience = Resilience(
+        is_retryable,
+        retry_hint,
+        retry=RetryPolicy(args.max_retries, args.retry_base_delay,
+                          args.retry_max_delay),
+        limiter=RateLimiter(args.rpm, args.tpm),
+        breaker=CircuitBreaker(args.breaker_threshold, args.breaker_reset),
+        is_rate_limited=is_rate_limited,
+    )
+    return GeminiAdapter(
+        "Você é um assistente que resume relatórios.",
+        api_keys=[f"fake-key-{index:04d}" for index in range(args.keys)],
+        model="gemini-fake",
+        resilience=resilience,
+        transport="rest",
+        api_endpoint=endpoint,
+    )
+
+
+def build_call(ai: GeminiAdapter, directory: str, args):
+    """
+    Returns the function timed by each request of the run.
+    """
+    if args.mode == "summarizer":
+        end_date = generate_corpus(
+            directory, args.days, args.report_kb * 1024, START_DATE
+        )
+        summarizer = WeeklySummarizer(
+            directory, ai, structured=not args.stream
+        )
+        if args.stream:
+            return lambda: "".join(
+                summarizer.stream_weekly_summary(START_DATE, end_date)
+            )
+        return lambda: summarizer.generate_weekly_summary(
+            START_DATE, end_date
+        )
+
+    if args.stream:
+        return lambda: "".join(ai.stream_content(PROMPT))
+    return lambda: ai.generate_content(PROMPT)
+
+
+def run_load(call, requests: int, concurrency: int) -> dict:
+    """
+    Sends ``requests`` calls from ``concurrency`` threads and returns
+    throughput and latency statistics in seconds.
+    """
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+
+    def timed(_):
+        start = time.perf_counter()
+        try:
+            call()
+        except Exception as e:
+            with lock:
+                failures.append(type(e).__name__)
+            return
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "failures": len(failures),
+        "failure_types": sorted(set(failures)),
+    }
+
+
+def run(args) -> dict:
+    server = FakeGeminiServer(
+        latency=Latency(args.latency_distribution, args.latency,
+                        args.latency_sigma, args.seed),
+        errors=ErrorBursts(args.error_rate, args.error_burst,
+                           tuple(args.error_codes), args.retry_after,
+                           args.seed),
+        tokens_per_second=args.tokens_per_second,
+        key_quota=KeyQuota(args.key_rpm),
+    )
+    with server, tempfile.TemporaryDirectory() as directory:
+        ai = build_adapter(server.endpoint, args)
+        call = build_call(ai, directory, args)
+        result = run_load(call, args.requests, args.concurrency)
+        counters = ai.metrics.snapshot()["counters"]
+
+    result.update({
+        "mode": args.mode,
+        "stream": args.stream,
+        "retries": counters.get("retries", 0),
+        "server_requests": server.counters["requests"],
+        "server_errors": server.counters["errors"],
+        "server_throttled": server.counters["throttled"],
+        "keys": ai.key_stats(),
+    })
+    return result
+
+
+def parse_args(argv=None):
+    def codes(value):
+        return [int(code) for code in value.split(",")]
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=["adapter", "summarizer"],
+                        default="adapter")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--days", type=int, default=7,
+                        help="Reports in the summarizer corpus")
+    parser.add_argument("--report-kb", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="Mean time to the first token, in seconds")
+    parser.add_argument("--latency-distribution", choices=DISTRIBUTIONS,
+                        default="lognormal")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0,
+                        help="Pace of the streamed chunks (0 disables)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Chance of starting an error burst")
+    parser.add_argument("--error-burst", type=int, default=3,
+                        help="Consecutive errors in a burst")
+    parser.add_argument("--error-codes", type=codes, default=[429, 503])
+    parser.add_argument("--retry-after", type=float, default=None,
+                        help="Retry-After sent with the errors, in seconds")
+    parser.add_argument("--keys", type=int, default=1,
+                        help="API keys to shard the requests across")
+    parser.add_argument("--key-rpm", type=int, default=0,
+                        help="Server quota per key per minute (0 disables)")
+    parser.add_argument("--rpm", type=float, default=0,
+                        help="Client requests per minute per key "
+                             "(0 disables)")
+    parser.add_argument("--tpm", type=float, default=0,
+                        help="Client tokens per minute per key (0 disables)")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--retry-base-delay", type=float, default=0.1)
+    parser.add_argument("--retry-max-delay", type=float, default=5.0)
+    parser.add_argument("--breaker-threshold", type=int, default=20)
+    parser.add_argument("--breaker-reset", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    result = run(args)
+
+    def ms(value):
+        return "-" if value is None else f"{value * 1000:.1f}ms"
+
+    print(
+        f"{result['mode']} concurrency={result['concurrency']} "
+        f"requests={result['requests']} "
+        f"throughput={result['throughput']:.2f}/s "
+        f"p50={ms(result['p50'])} p95={ms(result['p95'])} "
+        f"p99={ms(result['p99'])}"
+    )
+    print(
+        f"failures={result['failures']} retries={result['retries']} "
+        f"server_errors={result['server_errors']} "
+        f"throttled={result['server_throttled']}"
+    )
+    for key in result["keys"]:
+        print(
+            f"  key {key['key']}: requests={key['requests']} "
+            f"errors={key['errors']} healthy={key['healthy']}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Offline benchmarks for the summarization pipeline.
+
+Usage:
+    python -m tests.benchmarks.run --output results.json
+    python -m tests.benchmarks.run --compare baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from src.ai.adapters.fake import FakeAdapter
+from src.ai.services.compaction import compact_reports
+from src.ai.services.summarizer import WeeklySummarizer
+from tests.benchmarks.corpus import generate_corpus
+
+
+START_DATE = datetime(2024, 1, 7)
+
+
+def measure(func, repeat: int) -> dict:
+    """
+    Calls ``func`` ``repeat`` times and returns timing statistics in
+    seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "runs": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+    }
+
+
+def bench_case(directory: str, days: int, report_kb: int, args) -> list:
+    end_date = generate_corpus(directory, days, report_kb * 1024, START_DATE)
+    ai = FakeAdapter(
+        latency=args.latency, tokens_per_second=args.tokens_per_second
+    )
+    summarizer = WeeklySummarizer(directory, ai, max_prompt_tokens=0)
+    reports = summarizer._collect_reports(START_DATE, end_date)
+
+    cases = {
+        "get_weekly_reports": lambda: summarizer._get_weekly_reports(
+            START_DATE, end_date
+        ),
+        "compact_reports": lambda: compact_reports(reports),
+        "prepare_prompt": lambda: summarizer._prepare_prompt(
+            START_DATE, end_date
+        ),
+        "generate_weekly_summary": lambda: (
+            summarizer.generate_weekly_summary(START_DATE, end_date)
+        ),
+    }
+
+    results = []
+    for name, func in cases.items():
+        results.append({
+            "name": name,
+            "days": days,
+            "report_kb": report_kb,
+            **measure(func, args.repeat),
+        })
+    return results
+
+
+def run(args) -> dict:
+    results = []
+    for days in args.days:
+        for report_kb in args.report_kb:
+            with tempfile.TemporaryDirectory() as directory:
+                results.extend(bench_case(directory, days, report_kb, args))
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "results": results,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Returns the cases whose median got slower than ``threshold`` times the
+    baseline.
+    """
+    def key(result):
+        return result["name"], result["days"], result["report_kb"]
+
+    previous = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get(key(result))
+        if old and result["median"] > old["median"] * threshold:
+            regressions.append((result, old))
+    return regressions
+
+
+def parse_args(argv=None):
+    def int_list(value):
+        return [int(item) for item in value.split(",")]
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int_list, default=[7, 30, 365],
+                        help="Comma separated corpus sizes, in days")
+    parser.add_argument("--report-kb", type=int_list, default=[1, 16],
+                        help="Comma separated report sizes, in KB")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulated model latency, in seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=None,
+                        help="Simulated model output throughput")
+    parser.add_argument("--output", help="Write the results to this file")
+    parser.add_argument("--compare", help="Baseline results to compare to")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Slowdown ratio reported as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    current = run(args)
+
+    for result in current["results"]:
+        print(
+            f"{result['name']:<26} days={result['days']:<5} "
+            f"report_kb={result['report_kb']:<4} "
+            f"median={result['median'] * 1000:.2f}ms"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare, "r", encoding="utf-8") as file:
+        regressions = compare(current, json.load(file), args.threshold)
+
+    for result, old in regressions:
+        print(
+            f"[-] Regressão em {result['name']} (days={result['days']}, "
+            f"report_kb={result['report_kb']}): "
+            f"{old['median'] * 1000:.2f}ms -> {result['median'] * 1000:.2f}ms"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import json
+
+from tests.benchmarks import run
+from tests.benchmarks.corpus import generate_corpus
+
+
+class TestBenchmarks:
+    """Smoke tests that keep the benchmark runner working."""
+
+    def test_generate_corpus(self, tmp_path):
+        """Test that the corpus has one report per day of the given size."""
+        generate_corpus(str(tmp_path), days=3, report_bytes=2048)
+
+        reports = sorted(tmp_path.iterdir())
+        assert [r.name for r in reports] == [
+            "2024-01-07.md", "2024-01-08.md", "2024-01-09.md"
+        ]
+        assert all(2048 <= r.stat().st_size < 2200 for r in reports)
+
+    def test_runner_writes_results(self, tmp_path):
+        """Test a tiny benchmark run and its JSON output."""
+        output = tmp_path / "results.json"
+
+        assert run.main([
+            "--days", "2", "--report-kb", "1", "--repeat", "1",
+            "--output", str(output),
+        ]) == 0
+
+        results = json.loads(output.read_text())["results"]
+        assert {r["name"] for r in results} == {
+            "get_weekly_reports", "compact_reports", "prepare_prompt",
+            "generate_weekly_summary",
+        }
+
+    def test_compare_reports_regressions(self):
+        """Test that slower medians are reported as regressions."""
+        def results(median):
+            return {"results": [{
+                "name": "prepare_prompt", "days": 7, "report_kb": 1,
+                "median": median,
+            }]}
+
+        assert run.compare(results(1.0), results(1.0), 1.2) == []
+        assert len(run.compare(results(2.0), results(1.0), 1.2)) == 1
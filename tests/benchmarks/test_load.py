@@ -0,0 +1,169 @@
+import json
+
+import pytest
+from google.api_core.exceptions import TooManyRequests
+
+from src.ai.adapters.gemini import (
+    GeminiAdapter,
+    is_rate_limited,
+    is_retryable,
+    retry_hint,
+)
+from src.ai.adapters.resilience import Resilience, RetryPolicy
+from tests.benchmarks import load
+from tests.benchmarks.fake_gemini import (
+    ErrorBursts,
+    FakeGeminiServer,
+    KeyQuota,
+    Latency,
+)
+
+
+def adapter(server, max_retries=3, **options):
+    return GeminiAdapter(
+        "Sistema",
+        api_key="fake",
+        model="gemini-fake",
+        resilience=Resilience(
+            is_retryable, retry_hint,
+            retry=RetryPolicy(max_retries, base_delay=0.01, max_delay=0.05),
+            is_rate_limited=is_rate_limited,
+        ),
+        transport="rest",
+        api_endpoint=server.endpoint,
+        **options,
+    )
+
+
+class TestFakeGemini:
+    """Tests the Gemini adapter against the fake Gemini server."""
+
+    def test_generate_content_records_usage(self):
+        """Test a plain call and the usage metadata it reports."""
+        with FakeGeminiServer() as server:
+            ai = adapter(server)
+            text = ai.generate_content("Relatórios da semana")
+
+        counters = ai.metrics.snapshot()["counters"]
+        assert text.startswith("1. Atividades na semana")
+        assert counters["requests"] == 1
+        assert counters["prompt_tokens"] > 0
+        assert counters["response_tokens"] > 0
+
+    def test_stream_content(self):
+        """Test that a stream arrives in several chunks."""
+        with FakeGeminiServer() as server:
+            chunks = list(adapter(server).stream_content("Relatórios"))
+
+        assert len(chunks) > 1
+        assert "".join(chunks).startswith("1. Atividades na semana")
+
+    def test_structured_output(self):
+        """Test that JSON mode is answered with the summary sections."""
+        schema = {
+            "type": "object",
+            "properties": {"features": {
+                "type": "array", "items": {"type": "string"},
+            }},
+        }
+        with FakeGeminiServer() as server:
+            result = adapter(server).generate_structured("Relatórios", schema)
+
+        assert result["features"] == ["Integração do pipeline de relatórios"]
+
+    def test_error_bursts_are_retried(self):
+        """Test that a burst of 429s is retried until it ends."""
+        errors = ErrorBursts(length=2, codes=(429,))
+        errors.start()
+        with FakeGeminiServer(errors=errors) as server:
+            ai = adapter(server)
+            ai.generate_content("Relatórios")
+
+        assert server.counters == {
+            "requests": 3, "errors": 2, "throttled": 0,
+        }
+        assert ai.metrics.snapshot()["counters"]["retries"] == 2
+
+    def test_retry_after_is_sent(self):
+        """Test that the Retry-After header is read as the retry hint."""
+        errors = ErrorBursts(rate=1.0, length=1, codes=(429,),
+                             retry_after=0.2)
+        with FakeGeminiServer(errors=errors) as server:
+            ai = adapter(server, max_retries=0)
+            with pytest.raises(TooManyRequests) as error:
+                ai.generate_content("Relatórios")
+
+        assert retry_hint(error.value) == 0.2
+
+    def test_key_quota(self):
+        """Test that each key is throttled on its own quota."""
+        with FakeGeminiServer(key_quota=KeyQuota(1)) as server:
+            ai = adapter(server, max_retries=0)
+            ai.generate_content("Relatórios")
+            with pytest.raises(TooManyRequests) as error:
+                ai.generate_content("Relatórios")
+            other = GeminiAdapter(
+                "Sistema", api_key="other", transport="rest",
+                api_endpoint=server.endpoint,
+            )
+            other.generate_content("Relatórios")
+
+        assert 59 < retry_hint(error.value) <= 60
+        assert server.key_quota.requests == {"fake": 2, "other": 1}
+
+    def test_latency_distributions(self):
+        """Test that sampled latencies follow the requested mean."""
+        for distribution in ("fixed", "uniform", "lognormal"):
+            latency = Latency(distribution, mean=0.1, seed=1)
+            samples = [latency.sample() for _ in range(2000)]
+            mean = sum(samples) / len(samples)
+            assert abs(mean - 0.1) < 0.01, distribution
+
+
+class TestLoad:
+    """Smoke tests that keep the load generator working."""
+
+    def test_adapter_run(self, tmp_path):
+        """Test a tiny adapter run and its JSON output."""
+        output = tmp_path / "load.json"
+
+        assert load.main([
+            "--requests", "6", "--concurrency", "3", "--latency", "0",
+            "--keys", "2", "--output", str(output),
+        ]) == 0
+
+        result = json.loads(output.read_text())
+        assert result["failures"] == 0
+        assert result["server_requests"] == 6
+        assert sum(key["requests"] for key in result["keys"]) == 6
+        assert result["p50"] <= result["p95"] <= result["p99"]
+        assert result["throughput"] > 0
+
+    def test_summarizer_stream_run(self, tmp_path):
+        """Test a tiny streamed summarizer run."""
+        output = tmp_path / "load.json"
+
+        assert load.main([
+            "--mode", "summarizer", "--stream", "--requests", "2",
+            "--days", "2", "--report-kb", "1", "--latency", "0",
+            "--output", str(output),
+        ]) == 0
+
+        result = json.loads(output.read_text())
+        assert result["mode"] == "summarizer"
+        assert result["failures"] == 0
+
+    def test_context_caching(self):
+        """Test that prompts on a cached context only send themselves."""
+        with FakeGeminiServer() as server:
+            ai = adapter(server, context_min_tokens=0)
+            context = ai.create_context("Relatórios da semana " * 50)
+            ai.generate_with_context(context, "Liste os bugs")
+            ai.generate_with_context(context, "Resuma em inglês")
+            ai.delete_context(context)
+
+            assert server.caches == {}
+
+        counters = ai.metrics.snapshot()["counters"]
+        assert counters["context_uploads"] == 1
+        assert counters["cached_tokens"] > counters["prompt_tokens"] / 2
@@ -0,0 +1,177 @@
+import threading
+import time
+
+import pytest
+
+from src.jobs import JobQueue, JobSpec, run_workers, work
+
+
+def spec(name):
+    return JobSpec(
+        "/reports", f"2025-01-{name}", f"2025-01-{name}", "txt", "/out", name
+    )
+
+
+def make_runner(calls, fail=()):
+    """Runner that records the jobs it ran and fails the given names."""
+    def runner():
+        def run(job):
+            calls.append(job.name)
+            if job.name in fail:
+                raise RuntimeError("quota")
+            return [f"/out/{job.name}.txt"]
+        return run
+    return runner
+
+
+def noop_runner():
+    """Module-level so it can be pickled for the worker processes."""
+    return lambda job: [job.name]
+
+
+class TestJobQueue:
+    """Test suite for JobQueue and the workers."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Setup a queue with three jobs."""
+        self.queue = JobQueue(
+            str(tmp_path / "jobs.sqlite3"), max_attempts=2, retry_delay=0.5
+        )
+        self.added = self.queue.enqueue([spec("01"), spec("02"), spec("03")])
+
+    def test_enqueue_is_idempotent(self):
+        """Test that queuing the same jobs again adds nothing."""
+        assert self.added == 3
+        assert self.queue.enqueue([spec("01"), spec("04")]) == 1
+        assert self.queue.stats().counts["pending"] == 4
+
+    def test_claim_is_exclusive(self):
+        """Test that a claimed job is not handed out again."""
+        first = self.queue.claim("a")
+        second = self.queue.claim("b")
+
+        assert first.spec.name == "01"
+        assert second.spec.name == "02"
+        assert first.attempts == 1
+
+    def test_expired_lease_is_reclaimed(self):
+        """Test that the job of a dead worker is claimed again."""
+        self.queue.lease = 0.01
+        job = self.queue.claim("dead")
+        time.sleep(0.02)
+
+        assert self.queue.claim("alive").id == job.id
+
+    def test_job_killing_its_workers_gives_up(self):
+        """Test that an expired lease on the last attempt fails the job."""
+        self.queue.lease = 0.01
+        for worker in ("first", "second"):
+            job = self.queue.claim(worker)
+            assert job.spec.name == "01"
+            time.sleep(0.02)
+
+        assert self.queue.claim("third").spec.name == "02"
+        stats = self.queue.stats()
+        assert stats.counts["failed"] == 1
+        assert stats.errors[0].startswith("01: LeaseExpired")
+
+    def test_renewed_lease_is_kept(self):
+        """Test that a renewed job is not claimed by another worker."""
+        self.queue.lease = 0.5
+        job = self.queue.claim("slow")
+        time.sleep(0.3)
+        assert self.queue.renew(job)
+        time.sleep(0.3)
+
+        assert self.queue.claim("other").id != job.id
+
+    def test_stale_worker_cannot_overwrite(self):
+        """Test that only the worker holding the lease finishes a job."""
+        self.queue.lease = 0.01
+        stale = self.queue.claim("stale")
+        time.sleep(0.02)
+        owner = self.queue.claim("owner")
+
+        assert not self.queue.fail(stale, RuntimeError("late"))
+        assert not self.queue.complete(stale, ["/out/stale.txt"])
+        assert not self.queue.renew(stale)
+        assert self.queue.complete(owner, ["/out/01.txt"])
+        assert self.queue.stats().errors == []
+
+    def test_heartbeat_keeps_long_jobs(self):
+        """Test that a job outliving its lease is not run twice."""
+        self.queue.lease = 0.3
+        calls = []
+        stolen = []
+
+        def runner():
+            def run(job):
+                calls.append(job.name)
+                if job.name == "01":
+                    time.sleep(0.8)
+                return [job.name]
+            return run
+
+        thief = threading.Thread(target=lambda: (
+            time.sleep(0.5), stolen.append(self.queue.claim("thief"))
+        ))
+        thief.start()
+        work(self.queue, runner, "a", poll=0.05)
+        thief.join()
+
+        assert stolen[0].spec.name == "02"
+        assert sorted(calls) == ["01", "02", "03"]
+
+    def test_same_window_for_another_output(self):
+        """Test that the output directory and name are part of a job."""
+        other = spec("01")._replace(output_dir="/elsewhere")
+
+        assert self.queue.enqueue([other]) == 1
+
+    def test_checkpointed_jobs_are_not_run_again(self):
+        """Test that a resumed backfill only runs the unfinished jobs."""
+        self.queue.complete(self.queue.claim("a"), ["/out/01.txt"])
+        calls = []
+
+        work(self.queue, make_runner(calls), "b")
+
+        assert calls == ["02", "03"]
+        stats = self.queue.stats()
+        assert stats.counts["done"] == 3
+        assert stats.throughput > 0
+
+    def test_failed_jobs_are_retried_later(self):
+        """Test the retry with backoff and the final failure."""
+        calls = []
+
+        work(self.queue, make_runner(calls, fail={"02"}), "a", poll=0.01)
+
+        assert calls == ["01", "02", "03", "02"]
+        stats = self.queue.stats()
+        assert stats.counts == {
+            "pending": 0, "running": 0, "done": 2, "failed": 1,
+        }
+        assert stats.errors == ["02: RuntimeError: quota"]
+
+        assert self.queue.retry_failed() == 1
+        assert self.queue.claim("a").spec.name == "02"
+
+    def test_interrupted_job_is_released(self):
+        """Test that an interrupted job goes back without an attempt."""
+        def runner():
+            def run(job):
+                raise KeyboardInterrupt
+            return run
+
+        with pytest.raises(KeyboardInterrupt):
+            work(self.queue, runner, "a")
+
+        job = self.queue.claim("b")
+        assert (job.spec.name, job.attempts) == ("01", 1)
+
+    def test_worker_processes_drain_the_queue(self):
+        """Test that several processes share the queue."""
+        run_workers(self.queue, noop_runner, workers=2, poll=0.05)
+
+        assert self.queue.stats().counts["done"] == 3
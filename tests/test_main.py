@@ -0,0 +1,154 @@
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from src.ai.adapters.fake import FakeAdapter
+from src.ai.services import WeeklySummarizer
+from src.config.settings import Config
+from src.main import (
+    job_runner,
+    run_rollup,
+    share_rate_limits,
+    stream_summary,
+    summarize_variants,
+    write_summary,
+)
+from src.utils.args_handler import Args
+from src.utils.metrics import Metrics
+from src.utils.render import Summary
+
+
+class TestMain:
+    """Test suite for the output helpers in main."""
+
+    def test_write_summary(self, tmp_path):
+        """Test that the summary is written to the output directory."""
+        args = Args(reports_dir="reports", output_dir=str(tmp_path))
+
+        output_files = write_summary(args, "Summary", "2024-03-15")
+
+        assert output_files == [
+            str(tmp_path / "resumo_semanal_2024-03-15.txt")
+        ]
+        assert (tmp_path / "resumo_semanal_2024-03-15.txt").read_text() == (
+            "Summary"
+        )
+
+    def test_write_summary_every_format(self, tmp_path):
+        """Test that one summary is rendered to each requested format."""
+        args = Args(
+            reports_dir="reports", output_dir=str(tmp_path),
+            formats=["txt", "md", "json", "html"],
+        )
+        summary = Summary({"activities": ["Deploy"], "features": []})
+
+        output_files = write_summary(args, summary, "week")
+
+        assert [os.path.basename(path) for path in output_files] == [
+            "resumo_semanal_week.txt", "resumo_semanal_week.md",
+            "resumo_semanal_week.json", "resumo_semanal_week.html",
+        ]
+        payload = json.loads(
+            (tmp_path / "resumo_semanal_week.json").read_text()
+        )
+        assert payload["sections"]["activities"] == ["Deploy"]
+        assert "# Resumo semanal week" in (
+            tmp_path / "resumo_semanal_week.md"
+        ).read_text()
+
+    def test_stream_summary(self, tmp_path, capsys):
+        """Test that chunks are written to stdout and the output file."""
+        args = Args(
+            reports_dir="reports", output_dir=str(tmp_path), format="md"
+        )
+
+        output_file = stream_summary(args, iter(["Sum", "mary"]), "week")
+
+        assert capsys.readouterr().out == "Summary\n"
+        with open(output_file, encoding="utf-8") as f:
+            assert f.read() == "Summary"
+
+    def test_interrupted_stream_keeps_the_previous_summary(self, tmp_path):
+        """Test that a broken stream never leaves a truncated summary."""
+        args = Args(reports_dir="reports", output_dir=str(tmp_path))
+        output = tmp_path / "resumo_semanal_week.txt"
+        output.write_text("Previous summary")
+
+        def chunks():
+            yield "Sum"
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            stream_summary(args, chunks(), "week")
+
+        assert output.read_text() == "Previous summary"
+        assert os.listdir(tmp_path) == ["resumo_semanal_week.txt"]
+
+    def test_summarize_variants(self, tmp_path):
+        """Test that every variant is written to its own file."""
+        (tmp_path / "2024-03-11.md").write_text("Corrigi o bug X")
+        args = Args(
+            reports_dir=str(tmp_path), output_dir=str(tmp_path),
+            start_date=datetime(2024, 3, 10), end_date=datetime(2024, 3, 16),
+            variants=["bugs", "management"],
+        )
+        summarizer = WeeklySummarizer(
+            str(tmp_path), FakeAdapter(response="Variante")
+        )
+
+        summarize_variants(args, summarizer)
+
+        date = datetime.now().strftime("%Y-%m-%d")
+        for variant in args.variants:
+            assert (
+                tmp_path / f"resumo_semanal_{variant}_{date}.txt"
+            ).read_text() == "Variante"
+
+    def test_rollup_nodes_are_stored_without_the_cache(self, tmp_path):
+        """Test that --no-cache still keeps the rollup nodes."""
+        reports = tmp_path / "reports"
+        reports.mkdir()
+        (reports / "2025-01-06.md").write_text("Corrigi o bug X")
+        args = Args(
+            reports_dir=str(reports), output_dir=str(tmp_path),
+            end_date=datetime(2025, 1, 15), period="month", cache=False,
+            cache_dir=str(tmp_path / "cache"), format="json",
+        )
+
+        run_rollup(args, FakeAdapter(response="Entrega"), Metrics())
+
+        # The week and the month
+        assert len(os.listdir(tmp_path / "cache" / "rollups")) == 2
+        payload = json.loads(
+            (tmp_path / "resumo_semanal_month_2025-01-01_2025-01-31.json")
+            .read_text()
+        )
+        assert payload["sections"]["activities"] == ["Entrega"]
+
+    def test_share_rate_limits(self):
+        """Test that each worker process gets its share of the limits."""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(Config, "GEMINI_RPM", 15)
+            mp.setattr(Config, "GEMINI_TPM", 1000000)
+
+            share_rate_limits(4)
+
+            assert Config.GEMINI_RPM == 3.75
+            assert Config.GEMINI_TPM == 250000
+
+    def test_backfill_workers_share_the_rate_limits(self, tmp_path):
+        """Test that a backfill worker process takes its share too."""
+        args = Args(
+            reports_dir=str(tmp_path), workers=3, cache=False,
+            provider="fake",
+        )
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(Config, "GEMINI_RPM", 15)
+            mp.setattr(Config, "GEMINI_TPM", 900000)
+
+            job_runner(args)
+
+            assert Config.GEMINI_RPM == 5
+            assert Config.GEMINI_TPM == 300000
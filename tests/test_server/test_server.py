@@ -0,0 +1,166 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.ai.services import WeeklySummarizer
+from src.server import SummaryServer, SummaryService
+
+
+class TestSummaryService:
+    """Test suite for SummaryService class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup a service backed by a slow mocked summarizer."""
+        self.summarizer = MagicMock(spec=WeeklySummarizer)
+
+        def generate(start_date, end_date):
+            time.sleep(0.1)
+            return f"Summary {start_date.day}"
+
+        self.summarizer.generate_weekly_summary.side_effect = generate
+        self.build = MagicMock(return_value=self.summarizer)
+        self.service = SummaryService(self.build, max_concurrency=1)
+
+    def _run_concurrently(self, days):
+        results = {}
+
+        def run(day):
+            results[day] = self.service.summarize(
+                "reports", datetime(2025, 1, day)
+            )
+
+        threads = [
+            threading.Thread(target=run, args=(day,)) for day in days
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_identical_requests_are_coalesced(self):
+        """Test that concurrent identical requests share one generation."""
+        results = [None] * 4
+
+        def run(i):
+            results[i] = self.service.summarize(
+                "reports", datetime(2025, 1, 5)
+            )
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert self.summarizer.generate_weekly_summary.call_count == 1
+        assert sum(result.shared for result in results) == 3
+        assert self.service.metrics.counters["server_coalesced"] == 3
+
+    def test_summarizers_are_reused(self):
+        """Test that the summarizer of a directory is built only once."""
+        self.service.summarize("reports", datetime(2025, 1, 5))
+        self.service.summarize("reports", datetime(2025, 1, 12))
+
+        self.build.assert_called_once()
+
+    def test_queue_depth(self):
+        """Test that requests over the concurrency limit are queued."""
+        thread = threading.Thread(
+            target=self._run_concurrently, args=([5, 12, 19],)
+        )
+        thread.start()
+        time.sleep(0.05)
+        stats = self.service.stats()
+        thread.join()
+
+        assert stats["in_flight"] == 1
+        assert stats["queue_depth"] == 2
+        assert self.service.stats()["queue_depth"] == 0
+
+    def test_latency_excludes_queue_time(self):
+        """Test that the reported seconds only cover the generation."""
+        results = self._run_concurrently([5, 12])
+        slowest = max(results.values(), key=lambda r: r.queued_seconds)
+
+        assert slowest.seconds < 0.2
+        assert slowest.queued_seconds >= 0.05
+
+
+class TestSummaryServer:
+    """Test suite for the HTTP server."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Start a server on a free port."""
+        (tmp_path / "alice").mkdir()
+        self.service = MagicMock(spec=SummaryService)
+        self.service.metrics = MagicMock()
+        self.service.summarize.return_value = MagicMock(
+            _asdict=lambda: {"summary": "Resumo", "shared": False}
+        )
+        self.service.stats.return_value = {"queue_depth": 0, "in_flight": 0}
+
+        self.server = SummaryServer(
+            ("127.0.0.1", 0), self.service, reports_root=str(tmp_path)
+        )
+        self.root = tmp_path
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        yield
+        self.server.shutdown()
+        self.server.server_close()
+        thread.join()
+
+    def _request(self, path, body=None):
+        url = f"http://127.0.0.1:{self.server.server_port}{path}"
+        data = None if body is None else json.dumps(body).encode("utf-8")
+        try:
+            with urllib.request.urlopen(url, data=data) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_post_summary(self):
+        """Test that a summary request is answered with the result."""
+        status, body = self._request("/summaries", {
+            "reports_dir": "alice",
+            "start_date": "2025-01-05",
+            "end_date": "2025-01-11",
+        })
+
+        assert status == 200
+        assert body["summary"] == "Resumo"
+        self.service.summarize.assert_called_once_with(
+            str((self.root / "alice").resolve()),
+            datetime(2025, 1, 5), datetime(2025, 1, 11),
+        )
+
+    def test_invalid_date(self):
+        """Test that a malformed date is rejected with 400."""
+        status, body = self._request(
+            "/summaries", {"start_date": "05/01/2025"}
+        )
+
+        assert status == 400
+        assert "start_date" in body["error"]
+
+    def test_reports_dir_outside_root(self):
+        """Test that directories outside the reports root are rejected."""
+        status, _ = self._request("/summaries", {"reports_dir": "../.."})
+
+        assert status == 400
+        self.service.summarize.assert_not_called()
+
+    def test_stats(self):
+        """Test that the stats endpoint exposes the service stats."""
+        assert self._request("/stats") == (
+            200, {"queue_depth": 0, "in_flight": 0}
+        )
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budget for the CLI entry point, in microseconds
+STARTUP_BUDGET_US = 100_000
+
+HEAVY_MODULES = ("google.generativeai", "grpc", "dotenv")
+
+
+def import_times(*args):
+    """
+    Runs ``python -X importtime -m src <args>`` and returns the cumulative
+    import time of every module, in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src", *args],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    """Test suite for the CLI startup cost."""
+
+    @pytest.mark.parametrize("args", [["--help"], []])
+    def test_cli_does_not_import_heavy_modules(self, args):
+        """Test that --help and argument errors skip the SDK imports."""
+        times = import_times(*args)
+
+        assert "src.main" in times
+        for module in HEAVY_MODULES:
+            assert module not in times
+
+    def test_cli_import_time_budget(self):
+        """Test that importing the CLI stays under the startup budget."""
+        # Best of three, to be robust against a busy machine
+        best = min(import_times("--help")["src.main"] for _ in range(3))
+        assert best < STARTUP_BUDGET_US
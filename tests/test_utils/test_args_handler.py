@@ -24,6 +24,81 @@ class TestArgumentParser:
             assert args.end_date is None
             assert args.format == "txt"
             assert args.verbose is False
+            assert args.cache is True
+            assert args.cache_dir is None
+            assert args.cache_max_mb is None
+
+    def test_parse_cache_args(self):
+        """Test parsing of response cache arguments."""
+        test_args = [
+            "--reports-dir", "test_dir",
+            "--no-cache",
+            "--cache-dir", "cache_dir",
+            "--cache-max-mb", "12.5",
+        ]
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("sys.argv", ["script.py"] + test_args)
+            args = self.parser.parse()
+
+            assert args.cache is False
+            assert args.cache_dir == "cache_dir"
+            assert args.cache_max_mb == 12.5
+
+    def test_parse_weeks(self):
+        """Test that --weeks is split into consecutive weekly ranges."""
+        test_args = [
+            "--reports-dir", "test_dir",
+            "--weeks", "2025-01-05:2025-01-21",
+            "--concurrency", "8",
+        ]
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("sys.argv", ["script.py"] + test_args)
+            args = self.parser.parse()
+
+            assert args.ranges == [
+                (datetime(2025, 1, 5), datetime(2025, 1, 11)),
+                (datetime(2025, 1, 12), datetime(2025, 1, 18)),
+                (datetime(2025, 1, 19), datetime(2025, 1, 21)),
+            ]
+            assert args.concurrency == 8
+
+    def test_parse_ranges_file(self, tmp_path):
+        """Test reading batch ranges from a file."""
+        ranges_file = tmp_path / "ranges.txt"
+        ranges_file.write_text(
+            "# backfill\n2025-01-05:2025-01-11\n\n2025-02-01:2025-02-28\n"
+        )
+        test_args = [
+            "--reports-dir", "test_dir",
+            "--ranges-file", str(ranges_file),
+        ]
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("sys.argv", ["script.py"] + test_args)
+            args = self.parser.parse()
+
+            assert args.ranges == [
+                (datetime(2025, 1, 5), datetime(2025, 1, 11)),
+                (datetime(2025, 2, 1), datetime(2025, 2, 28)),
+            ]
+
+    @pytest.mark.parametrize("test_args", [
+        ["--weeks", "2025-01-05"],
+        ["--weeks", "2025-01-11:2025-01-05"],
+        ["--weeks", "2025-01-05:2025-01-11", "--end-date", "2025-01-11"],
+        ["--weeks", "2025-01-05:2025-01-11", "--concurrency", "0"],
+    ])
+    def test_invalid_batch_args(self, test_args):
+        """Test handling of invalid batch mode arguments."""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(
+                "sys.argv",
+                ["script.py", "--reports-dir", "test_dir"] + test_args
+            )
+            with pytest.raises(SystemExit):
+                self.parser.parse()
 
     def test_parse_all_args(self):
         """Test parsing of all arguments."""
@@ -69,6 +144,155 @@ class TestArgumentParser:
             with pytest.raises(SystemExit):
                 self.parser.parse()
 
+    def test_multiple_formats(self):
+        """Test that a comma separated list of formats is accepted."""
+        test_args = [
+            "--reports-dir", "test_dir",
+            "--format", "md,json,html,md"
+        ]
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("sys.argv", ["script.py"] + test_args)
+            args = self.parser.parse()
+
+        assert args.format == "md"
+        assert args.formats == ["md", "json", "html"]
+
+    def test_stream_rejects_structured_formats(self):
+        """Test that --stream only writes a single text format."""
+        test_args = [
+            "--reports-dir", "test_dir",
+            "--stream",
+            "--format", "json"
+        ]
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("sys.argv", ["script.py"] + test_args)
+            with pytest.raises(SystemExit):
+                self.parser.parse()
+
+    def test_topic(self):
+        """Test the topic mode options."""
+        test_args = [
+            "--reports-dir", "test_dir",
+            "--topic", "checkout",
+            "--top-k", "5"
+        ]
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("sys.argv", ["script.py"] + test_args)
+            args = self.parser.parse()
+
+        assert args.topic == "checkout"
+        assert args.top_k == 5
+
+    def test_topic_rejects_batch_mode(self):
+        """Test that --topic cannot be combined with --weeks."""
+        test_args = [
+            "--reports-dir", "test_dir",
+            "--topic", "checkout",
+            "--weeks", "2024-01-07:2024-01-20"
+        ]
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("sys.argv", ["script.py"] + test_args)
+            with pytest.raises(SystemExit):
+                self.parser.parse()
+
+    def test_period(self):
+        """Test the rollup mode options."""
+        test_args = [
+            "--reports-dir", "test_dir",
+            "--period", "quarter",
+            "--end-date", "2025-02-15"
+        ]
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("sys.argv", ["script.py"] + test_args)
+            args = self.parser.parse()
+
+        assert args.period == "quarter"
+        assert args.end_date == datetime(2025, 2, 15)
+
+    def test_period_rejects_start_date(self):
+        """Test that --period is anchored on --end-date only."""
+        test_args = [
+            "--reports-dir", "test_dir",
+            "--period", "month",
+            "--start-date", "2025-02-01"
+        ]
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("sys.argv", ["script.py"] + test_args)
+            with pytest.raises(SystemExit):
+                self.parser.parse()
+
+    def test_variants(self):
+        """Test the variants option and its duplicates."""
+        test_args = [
+            "--reports-dir", "test_dir",
+            "--variants", "resumo, Bugs,resumo"
+        ]
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("sys.argv", ["script.py"] + test_args)
+            args = self.parser.parse()
+
+        assert args.variants == ["resumo", "bugs"]
+
+    @pytest.mark.parametrize("extra", [
+        ["--variants", "unknown"],
+        ["--variants", "bugs", "--stream"],
+        ["--variants", "bugs", "--period", "month"],
+    ])
+    def test_variants_rejects(self, extra):
+        """Test unknown variants and modes that do not mix with them."""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(
+                "sys.argv", ["script.py", "--reports-dir", "test_dir"] + extra
+            )
+            with pytest.raises(SystemExit):
+                self.parser.parse()
+
+    def test_latency_target_implies_routing(self):
+        """Test that --latency-target selects the routing provider."""
+        test_args = [
+            "--reports-dir", "test_dir",
+            "--latency-target", "2.5"
+        ]
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("sys.argv", ["script.py"] + test_args)
+            args = self.parser.parse()
+
+        assert args.latency_target == 2.5
+        assert args.provider == "routing"
+
+    def test_backfill_accepts_several_authors(self):
+        """Test that backfill queues several directories and ranges."""
+        args = ArgumentParser("backfill").parse([
+            "-r", "team/alice", "team/bob",
+            "--weeks", "2025-01-05:2025-01-18",
+            "--queue", "jobs.sqlite3",
+        ])
+
+        assert args.command == "backfill"
+        assert args.reports_dirs == ["team/alice", "team/bob"]
+        assert len(args.ranges) == 2
+        assert args.queue == "jobs.sqlite3"
+
+    def test_backfill_requires_ranges(self):
+        """Test that backfill needs --weeks or --ranges-file."""
+        with pytest.raises(SystemExit):
+            ArgumentParser("backfill").parse(["-r", "test_dir"])
+
+    def test_status(self):
+        """Test that status needs no reports directory."""
+        args = ArgumentParser("status").parse(["--retry-failed"])
+
+        assert args.command == "status"
+        assert args.retry_failed
+
     def test_missing_required_args(self):
         """Test handling of missing required arguments."""
         test_args = []
@@ -77,3 +301,44 @@ class TestArgumentParser:
             mp.setattr("sys.argv", ["script.py"] + test_args)
             with pytest.raises(SystemExit):
                 self.parser.parse()
+
+    def test_parse_serve_args(self):
+        """Test that the serve command makes the reports dir optional."""
+        args = ArgumentParser("serve").parse(
+            ["--port", "9000", "--concurrency", "2"]
+        )
+
+        assert args.command == "serve"
+        assert args.reports_dir is None
+        assert args.port == 9000
+        assert args.concurrency == 2
+
+    def test_serve_rejects_batch_args(self):
+        """Test that batch options cannot be used with serve."""
+        with pytest.raises(SystemExit):
+            ArgumentParser("serve").parse(
+                ["--weeks", "2025-01-05:2025-01-18"]
+            )
+
+    def test_parse_several_reports_dirs(self, tmp_path):
+        """Test that directories and globs are expanded in order."""
+        for name in ("alice", "bob", "carol"):
+            (tmp_path / "team" / name).mkdir(parents=True)
+
+        args = ArgumentParser().parse([
+            "-r", str(tmp_path / "team" / "carol"),
+            str(tmp_path / "team" / "*"),
+            str(tmp_path / "team" / "bob") + "/",
+        ])
+
+        assert args.reports_dirs == [
+            str(tmp_path / "team" / name)
+            for name in ("carol", "alice", "bob")
+        ]
+        assert args.reports_dir == str(tmp_path / "team" / "carol")
+        assert args.output_dir == str(tmp_path / "team")
+
+    def test_unmatched_glob(self, tmp_path):
+        """Test that a glob matching no directory is an error."""
+        with pytest.raises(SystemExit):
+            ArgumentParser().parse(["-r", str(tmp_path / "missing-*")])
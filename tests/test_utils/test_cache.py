@@ -0,0 +1,108 @@
+import os
+import time
+
+import pytest
+from src.utils.cache import DiskCache, make_key
+
+
+class TestDiskCache:
+    """Test suite for DiskCache class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Setup fixture that provides a DiskCache instance."""
+        self.cache_dir = tmp_path / "cache"
+        self.cache = DiskCache(str(self.cache_dir))
+
+    def test_make_key_is_stable(self):
+        """Test that keys only depend on the parts content."""
+        assert make_key({"a": 1, "b": 2}, "x") == make_key(
+            {"b": 2, "a": 1}, "x"
+        )
+        assert make_key("x") != make_key("y")
+
+    def test_get_missing_key(self):
+        """Test that a missing key returns None."""
+        assert self.cache.get("missing") is None
+
+    def test_set_and_get(self):
+        """Test that stored values are returned."""
+        self.cache.set("key", "value")
+        assert self.cache.get("key") == "value"
+
+    def test_expired_entries_are_misses(self):
+        """Test that entries older than max_age are dropped."""
+        cache = DiskCache(str(self.cache_dir), max_age=10)
+        cache.set("key", "value")
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(time, "time", lambda: 10 ** 12)
+            assert cache.get("key") is None
+
+        assert not os.listdir(self.cache_dir)
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest used entries go first when over size."""
+        cache = DiskCache(str(self.cache_dir), max_bytes=10 ** 6)
+        cache.set("old", "a" * 100)
+        cache.set("new", "b" * 100)
+
+        old_path = self.cache_dir / "old.json"
+        os.utime(old_path, (1, 1))
+
+        cache.max_bytes = (self.cache_dir / "new.json").stat().st_size
+        cache.evict()
+
+        assert cache.get("old") is None
+        assert cache.get("new") == "b" * 100
+
+    def test_expiry_follows_the_last_use(self):
+        """Test that reads and eviction agree on what expired."""
+        cache = DiskCache(str(self.cache_dir), max_age=100)
+        cache.set("used", "a")
+        cache.set("unused", "b")
+        os.utime(self.cache_dir / "unused.json", (1, 1))
+
+        assert cache.get("used") == "a"
+        cache.evict()
+
+        assert os.listdir(self.cache_dir) == ["used.json"]
+        assert cache.get("unused") is None
+
+    def test_writes_do_not_scan_the_directory(self):
+        """Test that only the first write and periodic sweeps scan."""
+        scans = []
+        scandir = os.scandir
+        cache = DiskCache(
+            str(self.cache_dir), max_bytes=10 ** 6, sweep_every=10
+        )
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(os, "scandir", lambda path: (
+                scans.append(path), scandir(path)
+            )[1])
+            for index in range(20):
+                cache.set(f"key-{index}", "value")
+
+        assert len(scans) == 3
+
+    def test_running_size_triggers_eviction(self):
+        """Test that going over the size limit evicts without a sweep."""
+        cache = DiskCache(str(self.cache_dir), sweep_every=10 ** 6)
+        cache.set("first", "a" * 100)
+        size = (self.cache_dir / "first.json").stat().st_size
+        cache.max_bytes = 2 * size
+        os.utime(self.cache_dir / "first.json", (1, 1))
+
+        cache.set("second", "b" * 100)
+        cache.set("third", "c" * 100)
+
+        assert sorted(os.listdir(self.cache_dir)) == [
+            "second.json", "third.json"
+        ]
+
+    def test_clear(self):
+        """Test that clear removes every entry."""
+        self.cache.set("key", "value")
+        self.cache.clear()
+        assert self.cache.get("key") is None
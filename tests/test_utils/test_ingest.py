@@ -0,0 +1,111 @@
+import tracemalloc
+
+import pytest
+
+from src.utils import ingest
+from src.utils.ingest import (
+    IngestLimits,
+    fair_shares,
+    iter_file_chunks,
+    iter_reports,
+    read_report,
+)
+from src.utils.metrics import Metrics
+
+
+class TestIngest:
+    """Test suite for the streaming report ingestion."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Create a report of 100 known bytes."""
+        self.tmp_path = tmp_path
+        self.report = tmp_path / "2025-01-06.md"
+        self.report.write_text("a" * 40 + "b" * 20 + "c" * 40)
+        self.metrics = Metrics()
+
+    def _read(self, max_bytes, policy):
+        return "".join(iter_file_chunks(
+            str(self.report), max_bytes, policy, chunk_size=16,
+            metrics=self.metrics,
+        ))
+
+    def test_uncapped_report_is_read_whole(self):
+        """Test that a report under the cap is read unchanged."""
+        assert self._read(None, "head") == self.report.read_text()
+        assert self.metrics.counters["bytes_read"] == 100
+
+    @pytest.mark.parametrize("policy, expected", [
+        ("head", "a" * 40 + "\n[... 60 bytes omitidos ...]\n"),
+        ("tail", "\n[... 60 bytes omitidos ...]\n" + "c" * 40),
+        (
+            "head_tail",
+            "a" * 20 + "\n[... 60 bytes omitidos ...]\n" + "c" * 20,
+        ),
+    ])
+    def test_truncation_policies(self, policy, expected):
+        """Test which part of an oversized report is kept."""
+        assert self._read(40, policy) == expected
+        assert self.metrics.counters["bytes_read"] == 40
+        assert self.metrics.counters["reports_truncated"] == 1
+
+    def test_truncation_keeps_characters_whole(self):
+        """Test that cuts never split a multi-byte character."""
+        self.report.write_text("é" * 50)
+
+        text = self._read(11, "head")
+
+        assert text.startswith("é" * 6)
+        assert "�" not in text
+
+    def test_invalid_bytes_are_replaced_and_counted(self, capsys):
+        """Test that decode errors keep the report and are reported."""
+        self.report.write_bytes(b"ok \xff\xfe ok")
+
+        assert self._read(None, "head") == "ok �� ok"
+        assert self.metrics.counters["decode_errors"] == 2
+        assert "inválidos" in capsys.readouterr().out
+
+    def test_large_files_are_memory_mapped(self):
+        """Test the mmap path reads the same content."""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(ingest, "MMAP_THRESHOLD", 1)
+            assert self._read(40, "tail").endswith("c" * 40)
+
+    def test_fair_shares(self):
+        """Test that small files stay whole and large ones share the rest."""
+        assert fair_shares([10, 1000, 500], 300) == [10, 145, 145]
+        assert fair_shares([10, 20], 300) == [10, 20]
+
+    def test_range_cap(self):
+        """Test that the range cap is split between the reports."""
+        other = self.tmp_path / "2025-01-07.md"
+        other.write_text("x" * 10)
+        limits = IngestLimits(max_range_bytes=50, policy="head")
+
+        reports = list(iter_reports(
+            [("2025-01-06.md", str(self.report)),
+             ("2025-01-07.md", str(other))],
+            limits,
+        ))
+
+        assert [r.date for r in reports] == ["2025-01-06", "2025-01-07"]
+        assert "".join(reports[0].chunks).startswith("a" * 40)
+        assert "".join(reports[1].chunks) == "x" * 10
+
+    def test_memory_is_bounded_by_the_cap(self):
+        """Test that a huge report is never loaded whole."""
+        big = self.tmp_path / "2025-01-08.md"
+        with open(big, "w", encoding="utf-8") as f:
+            for _ in range(128):
+                f.write("linha de log " * 5000 + "\n")
+
+        tracemalloc.start()
+        text = read_report(
+            str(big), IngestLimits(max_file_bytes=64 * 1024)
+        )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert len(text) < 70 * 1024
+        assert peak < 1024 * 1024
@@ -0,0 +1,98 @@
+import json
+import threading
+
+import pytest
+from src.utils.metrics import Metrics
+
+
+class TestMetrics:
+    """Test suite for Metrics class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup fixture that provides a Metrics instance."""
+        self.metrics = Metrics()
+
+    def test_stage_accumulates_time_and_calls(self):
+        """Test that every stage entry is timed and counted."""
+        with self.metrics.stage("collect_reports"):
+            pass
+        self.metrics.record("collect_reports", 0.5)
+
+        stage = self.metrics.snapshot()["stages"]["collect_reports"]
+        assert stage["calls"] == 2
+        assert stage["seconds"] >= 0.5
+
+    def test_stage_is_recorded_on_error(self):
+        """Test that a failing stage still records its time."""
+        with pytest.raises(RuntimeError):
+            with self.metrics.stage("model_call"):
+                raise RuntimeError("boom")
+
+        assert self.metrics.snapshot()["stages"]["model_call"]["calls"] == 1
+
+    def test_counters_are_thread_safe(self):
+        """Test concurrent counter updates."""
+        def work():
+            for _ in range(1000):
+                self.metrics.add("bytes_read", 2)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert self.metrics.counters["bytes_read"] == 8000
+
+    def test_to_prometheus(self):
+        """Test the Prometheus text exposition format."""
+        self.metrics.record("generate", 1.5)
+        self.metrics.add("retries", 2)
+
+        text = self.metrics.to_prometheus()
+
+        assert 'weekly_summarizer_stage_seconds{stage="generate"} 1.5' in text
+        assert 'weekly_summarizer_stage_calls{stage="generate"} 1' in text
+        assert "weekly_summarizer_retries 2" in text
+        assert text.endswith("\n")
+
+    def test_labeled_counters_to_prometheus(self):
+        """Test that labels keep model names out of the metric names."""
+        self.metrics.add("routed_requests", tier="gemini:gemini-1.5-flash")
+        self.metrics.add("routed_requests", tier='a"b')
+        self.metrics.add("routed_requests_total")
+        self.metrics.add("cache-hits")
+
+        lines = self.metrics.to_prometheus().splitlines()
+
+        assert lines[-7:] == [
+            "# TYPE weekly_summarizer_cache_hits gauge",
+            "weekly_summarizer_cache_hits 1",
+            "# TYPE weekly_summarizer_routed_requests gauge",
+            'weekly_summarizer_routed_requests{tier="a\\"b"} 1',
+            "weekly_summarizer_routed_requests"
+            '{tier="gemini:gemini-1.5-flash"} 1',
+            "# TYPE weekly_summarizer_routed_requests_total gauge",
+            "weekly_summarizer_routed_requests_total 1",
+        ]
+
+    def test_write_json_lines(self, tmp_path):
+        """Test that non .prom files get one JSON line per run."""
+        path = tmp_path / "metrics.jsonl"
+        self.metrics.add("prompt_tokens", 100)
+        self.metrics.write(str(path))
+        self.metrics.write(str(path))
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0])["counters"] == {"prompt_tokens": 100}
+
+    def test_write_prometheus_textfile(self, tmp_path):
+        """Test that .prom files are replaced with the textfile format."""
+        path = tmp_path / "metrics.prom"
+        self.metrics.add("prompt_tokens", 100)
+        self.metrics.write(str(path))
+        self.metrics.write(str(path))
+
+        assert path.read_text().count("weekly_summarizer_prompt_tokens") == 2
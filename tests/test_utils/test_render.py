@@ -0,0 +1,60 @@
+import json
+import pickle
+
+import pytest
+from src.utils.render import Summary, render
+
+
+class TestRender:
+    """Test suite for the summary renderers."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup a structured summary."""
+        self.summary = Summary({
+            "activities": ["Revisão de PRs"],
+            "bug_fixes": ["Corrigido <login>"],
+            "features": [],
+        })
+
+    def test_summary_is_its_text_rendering(self):
+        """Test that a structured summary behaves as its plain text."""
+        assert self.summary.startswith("1. Atividades na semana")
+        assert "   - Revisão de PRs" in self.summary
+        assert "3. Trabalhando em features\n   - Nenhum item" in self.summary
+
+    def test_render_md(self):
+        """Test that markdown has the title and one heading per section."""
+        markdown = render(self.summary, "md", "Resumo semanal")
+
+        assert markdown.startswith("# Resumo semanal\n\n## Atividades")
+        assert "- Corrigido <login>" in markdown
+
+    def test_render_json(self):
+        """Test that json keeps the sections as they were generated."""
+        payload = json.loads(render(self.summary, "json", "Resumo"))
+
+        assert payload["title"] == "Resumo"
+        assert payload["sections"] == self.summary.sections
+
+    def test_render_html_escapes_items(self):
+        """Test that html output escapes the summary text."""
+        page = render(self.summary, "html", "Resumo")
+
+        assert "<li>Corrigido &lt;login&gt;</li>" in page
+        assert "<title>Resumo</title>" in page
+
+    def test_render_plain_string(self):
+        """Test that summaries without sections are embedded as they are."""
+        assert render("Texto livre", "md") == "Texto livre"
+        assert json.loads(render("Texto livre", "json"))["summary"] == (
+            "Texto livre"
+        )
+        assert "<pre>Texto livre</pre>" in render("Texto livre", "html")
+
+    def test_summary_pickles(self):
+        """Test that the sections survive pickling (process executor)."""
+        restored = pickle.loads(pickle.dumps(self.summary))
+
+        assert restored == self.summary
+        assert restored.sections == self.summary.sections
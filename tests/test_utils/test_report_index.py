@@ -0,0 +1,82 @@
+import os
+from datetime import datetime
+
+import pytest
+from src.utils.report_index import ReportIndex
+
+
+class TestReportIndex:
+    """Test suite for ReportIndex class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Setup fixture with flat and nested reports."""
+        self.reports_dir = tmp_path / "reports"
+        self.reports_dir.mkdir()
+        (self.reports_dir / "2024-03-10.md").write_text("flat")
+        (self.reports_dir / "notes.md").write_text("not a report")
+
+        nested = self.reports_dir / "2024" / "03"
+        nested.mkdir(parents=True)
+        (nested / "2024-03-12.md").write_text("nested")
+        (nested / "2024-03-20.md").write_text("nested")
+
+        self.cache_path = str(tmp_path / "index.json")
+        self.index = ReportIndex(str(self.reports_dir), self.cache_path)
+
+    def test_lookup_flat_and_nested(self):
+        """Test that reports are found in any sub directory, in order."""
+        reports = self.index.lookup(
+            datetime(2024, 3, 1), datetime(2024, 3, 31)
+        )
+
+        assert [name for name, _ in reports] == [
+            "2024-03-10.md", "2024-03-12.md", "2024-03-20.md"
+        ]
+        assert reports[1][1] == str(
+            self.reports_dir / "2024" / "03" / "2024-03-12.md"
+        )
+
+    def test_lookup_range_is_inclusive(self):
+        """Test that both range ends are included, ignoring the time."""
+        reports = self.index.lookup(
+            datetime(2024, 3, 10, 18), datetime(2024, 3, 12, 6)
+        )
+        assert [name for name, _ in reports] == [
+            "2024-03-10.md", "2024-03-12.md"
+        ]
+
+    def test_new_report_invalidates_index(self):
+        """Test that adding a report is picked up on the next lookup."""
+        self.index.lookup(datetime(2024, 3, 1), datetime(2024, 3, 31))
+
+        new_report = self.reports_dir / "2024" / "03" / "2024-03-15.md"
+        new_report.write_text("new")
+        os.utime(new_report.parent, ns=(1, 1))
+
+        reports = self.index.lookup(
+            datetime(2024, 3, 15), datetime(2024, 3, 15)
+        )
+        assert [name for name, _ in reports] == ["2024-03-15.md"]
+
+    def test_index_is_loaded_from_cache(self):
+        """Test that a fresh index reuses the persisted scan."""
+        self.index.lookup(datetime(2024, 3, 1), datetime(2024, 3, 31))
+        assert os.path.exists(self.cache_path)
+
+        index = ReportIndex(str(self.reports_dir), self.cache_path)
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(
+                "src.utils.report_index.os.scandir",
+                lambda path: pytest.fail("index should not be rescanned"),
+            )
+            reports = index.lookup(
+                datetime(2024, 3, 1), datetime(2024, 3, 31)
+            )
+
+        assert len(reports) == 3
+
+    def test_missing_directory(self, tmp_path):
+        """Test that a missing directory has no reports."""
+        index = ReportIndex(str(tmp_path / "missing"))
+        assert index.lookup(datetime(2024, 3, 1), datetime(2024, 3, 31)) == []
@@ -0,0 +1,99 @@
+import os
+from datetime import datetime
+
+import pytest
+from src.utils.metrics import Metrics
+from src.utils.report_index import ReportIndex
+from src.utils.search import SearchIndex, split_passages, tokenize
+
+
+class TestSearchIndex:
+    """Test suite for SearchIndex class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Setup fixture with reports about different topics."""
+        self.reports_dir = tmp_path / "reports"
+        self.reports_dir.mkdir()
+        (self.reports_dir / "2024-01-10.md").write_text(
+            "# Atividades\n- Migração do checkout para o novo gateway\n\n"
+            "# Reuniões\n- Planejamento da sprint"
+        )
+        (self.reports_dir / "2024-03-12.md").write_text(
+            "# Bugs\n- Corrigido timeout no checkout"
+        )
+        (self.reports_dir / "2024-06-01.md").write_text(
+            "# Atividades\n- Ajustes no relatório financeiro"
+        )
+
+        self.cache_path = str(tmp_path / "search.json")
+        self.metrics = Metrics()
+        self.search = SearchIndex(
+            ReportIndex(str(self.reports_dir)),
+            cache_path=self.cache_path,
+            metrics=self.metrics,
+        )
+
+    def test_tokenize(self):
+        """Test that accents, case and stopwords are ignored."""
+        assert tokenize("Migração do Checkout") == ["migracao", "checkout"]
+
+    def test_split_passages(self):
+        """Test that reports are split at headings and long sections."""
+        text = "# A\nlinha um\n# B\n" + "\n".join(["x" * 30] * 4)
+
+        assert split_passages(text, max_chars=70) == [
+            "# A\nlinha um", "# B\n" + "x" * 30 + "\n" + "x" * 30,
+            "x" * 30 + "\n" + "x" * 30,
+        ]
+
+    def test_search_ranks_relevant_passages(self):
+        """Test that only passages mentioning the topic are returned."""
+        passages = self.search.search("checkout")
+
+        assert sorted(p.date for p in passages) == [
+            "2024-01-10", "2024-03-12"
+        ]
+        assert all("checkout" in p.text for p in passages)
+        assert passages[0].score >= passages[1].score
+
+    def test_search_top_k_and_dates(self):
+        """Test that the result is limited by top_k and the date range."""
+        assert len(self.search.search("checkout", top_k=1)) == 1
+
+        passages = self.search.search(
+            "checkout", start_date=datetime(2024, 2, 1),
+            end_date=datetime(2024, 12, 31),
+        )
+        assert [p.date for p in passages] == ["2024-03-12"]
+
+    def test_incremental_refresh(self):
+        """Test that only changed reports are indexed again."""
+        self.search.search("checkout")
+        assert self.metrics.counters["search_reports_indexed"] == 3
+
+        report = self.reports_dir / "2024-06-01.md"
+        report.write_text("# Bugs\n- Checkout duplicado no relatório")
+        os.utime(report, ns=(1, 1))
+        (self.reports_dir / "2024-03-12.md").unlink()
+
+        passages = self.search.search("checkout")
+
+        assert self.metrics.counters["search_reports_indexed"] == 4
+        assert sorted(p.date for p in passages) == [
+            "2024-01-10", "2024-06-01"
+        ]
+
+    def test_persisted_index_is_reused(self):
+        """Test that a new instance loads the index instead of reading."""
+        self.search.search("checkout")
+
+        metrics = Metrics()
+        search = SearchIndex(
+            ReportIndex(str(self.reports_dir)),
+            cache_path=self.cache_path,
+            metrics=metrics,
+        )
+
+        assert len(search.search("gateway")) == 1
+        assert "search_reports_indexed" not in metrics.counters
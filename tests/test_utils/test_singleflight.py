@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+from src.utils.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test suite for SingleFlight class."""
+
+    def test_concurrent_calls_are_coalesced(self):
+        """Test that identical concurrent calls run the function once."""
+        flights = SingleFlight()
+        calls = []
+        results = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.1)
+            return "summary"
+
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(flights.do("key", work))
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert sorted(shared for _, shared in results) == [
+            False, True, True, True, True,
+        ]
+        assert {result for result, _ in results} == {"summary"}
+        assert len(flights) == 0
+
+    def test_errors_are_shared_and_not_cached(self):
+        """Test that waiters get the error and the next call runs again."""
+        flights = SingleFlight()
+
+        with pytest.raises(RuntimeError):
+            flights.do("key", lambda: (_ for _ in ()).throw(RuntimeError()))
+
+        assert flights.do("key", lambda: "ok") == ("ok", False)
@@ -0,0 +1,33 @@
+from src.utils.stats import LatencyModel, RollingLatency, percentile
+
+
+class TestStats:
+    """Test suite for the latency statistics helpers."""
+
+    def test_percentile(self):
+        """Test the nearest-rank percentile."""
+        values = list(range(1, 101))
+
+        assert percentile(values, 0.5) == 50
+        assert percentile(values, 0.95) == 95
+        assert percentile(values, 1) == 100
+        assert percentile([], 0.5) is None
+
+    def test_rolling_window(self):
+        """Test that only the last samples are kept."""
+        latencies = RollingLatency(window=3)
+        for seconds in (10, 1, 2, 3):
+            latencies.add(seconds)
+
+        assert len(latencies) == 3
+        assert latencies.percentile(1) == 3
+
+    def test_latency_model(self):
+        """Test that latency is learnt as a function of the prompt size."""
+        model = LatencyModel()
+        assert model.predict(100) is None
+
+        for tokens in (100, 200, 300):
+            model.add(tokens, 0.5 + tokens / 100)
+
+        assert abs(model.predict(1000) - 10.5) < 1e-9
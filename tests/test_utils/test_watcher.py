@@ -0,0 +1,78 @@
+import os
+import sys
+
+import pytest
+
+from src.utils.watcher import (
+    InotifyWatcher,
+    PollingWatcher,
+    create_watcher,
+    wait_for_changes,
+)
+
+
+class TestWatchers:
+    """Test suite for the report watchers."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Create a reports directory with one report."""
+        self.reports_dir = tmp_path
+        self.report = tmp_path / "2025-01-06.md"
+        self.report.write_text("day 1")
+
+    def _watchers(self):
+        """Yields each available watcher, created only when its turn comes."""
+        yield PollingWatcher(str(self.reports_dir), interval=0.01)
+        if sys.platform.startswith("linux"):
+            yield InotifyWatcher(str(self.reports_dir))
+
+    def test_detects_created_modified_and_deleted_reports(self):
+        """Test that every kind of change to a report is reported."""
+        for watcher in self._watchers():
+            new = self.reports_dir / "2025-01-07.md"
+            new.write_text("day 2")
+            assert watcher.poll(1) == {str(new)}
+
+            self.report.write_text(self.report.read_text() + ", edited")
+            assert watcher.poll(1) == {str(self.report)}
+
+            new.unlink()
+            assert watcher.poll(1) == {str(new)}
+            watcher.close()
+
+    def test_ignores_other_files(self):
+        """Test that files not named after a date are ignored."""
+        for watcher in self._watchers():
+            (self.reports_dir / "notes.txt").write_text("x")
+            assert watcher.poll(0.05) == set()
+            watcher.close()
+
+    @pytest.mark.skipif(
+        not sys.platform.startswith("linux"), reason="inotify is Linux only"
+    )
+    def test_inotify_watches_new_directories(self):
+        """Test that reports in directories created later are seen."""
+        watcher = InotifyWatcher(str(self.reports_dir))
+        month = self.reports_dir / "2025" / "01"
+        month.mkdir(parents=True)
+        watcher.poll(0.05)
+
+        report = month / "2025-01-08.md"
+        report.write_text("day 3")
+
+        assert str(report) in watcher.poll(1)
+        watcher.close()
+
+    def test_wait_for_changes_debounces(self):
+        """Test that a burst of changes is returned at once."""
+        watcher = create_watcher(str(self.reports_dir), interval=0.01)
+        for day in (7, 8, 9):
+            (self.reports_dir / f"2025-01-0{day}.md").write_text("x")
+
+        changed = wait_for_changes(watcher, debounce=0.1)
+
+        assert {os.path.basename(path) for path in changed} == {
+            "2025-01-07.md", "2025-01-08.md", "2025-01-09.md",
+        }
+        watcher.close()